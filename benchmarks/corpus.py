@@ -0,0 +1,140 @@
+# coding=utf-8
+#
+"""Deterministic synthetic Amharic and Tigrigna corpora for the benchmarks.
+
+The same seed always gives the same texts, on every platform and Python version,
+so results of different runs and different versions of etnltk can be compared.
+"""
+# Standard libraries
+import random
+from typing import List
+
+# Common words, the head of the word frequency distribution
+COMMON_WORDS = {
+    "am": (
+        "እና ነው ላይ ወደ ውስጥ ጋር ግን ደግሞ ይህ ያ እንደ ሁሉ ብቻ አንድ ሁለት ሀገር መንግስት ህዝብ ከተማ "
+        "ዛሬ ትናንት ዓመት ቀን ሰዓት ስራ ትምህርት ቤት ልጅ ሰው ሴት ወንድ ውሃ ምግብ ገበያ ዋጋ ብር "
+        "ኢትዮጵያ አዲስ አበባ ሚኒስቴር ፕሬዚዳንት ምክር ቤቱ ፓርላማ ምርጫ ፓርቲ ልማት ኢኮኖሚ ጤና ሆስፒታል "
+        "ገለጹ አስታወቁ ተናገሩ ይገኛል ነበር ሆኗል ተደርጓል ይሆናል አለ አሉ ሞልቱዋል ሁኗል"
+    ).split(),
+    "tg": (
+        "እዩ ኣብ ናብ ምስ ግን ከኣ እዚ እቲ ከም ኩሉ ጥራይ ሓደ ክልተ ሃገር መንግስቲ ህዝቢ ከተማ "
+        "ሎሚ ትማሊ ዓመት መዓልቲ ሰዓት ስራሕ ትምህርቲ ቤት ቆልዓ ሰብ ሰበይቲ ሰብኣይ ማይ መግቢ ዕዳጋ ዋጋ "
+        "ኤርትራ ትግራይ መቐለ ኣስመራ ሚኒስትሪ ፕሬዝዳንት ባይቶ ምርጫ ሰልፊ ልምዓት ቁጠባ ጥዕና ሆስፒታል "
+        "ገሊጹ ሓቢሩ ተዛሪቡ ይርከብ ነይሩ ኮይኑ ተገይሩ ክኸውን ኣሎ ኣለዉ ደኣ'ምበር እንተ'ኳ"
+    ).split(),
+}
+
+# Short forms expanded by the normalizers
+SHORT_FORMS = {
+    "am": ["ጠ/ሚ", "ዓ.ም", "ም/ቤቱ", "ት/ቤት", "ዶ/ር", "አ.አ"],
+    "tg": ["ዓ.ም", "ቤ/ት", "ዶ/ር", "ሚ/ሪ"],
+}
+
+SENTENCE_ENDS = ["።", "።", "።", "::", "፡፡", "?", "!"]
+COMMAS = ["፣", "፣", "፤", ",", "፥"]
+LATIN_WORDS = ["COVID-19", "Ethiopia", "UN", "GDP", "online", "Facebook"]
+EMOJIS = ["😀", "👍", "🙏", "🇪🇹", "❤️"]
+
+# Consonants of the Ethiopic syllabary, the 7 vowel orders of a consonant follow it
+_CONSONANTS = [0x1200 + 8 * i for i in range(43) if 0x1200 + 8 * i not in (0x1248, 0x1258, 0x1288, 0x12B0, 0x12C0, 0x1310)]
+
+# The sizes of the generated texts: number of words per text, from min to max
+SIZES = {
+    "tweet": (8, 40),
+    "news": (400, 900),
+    "book": (150_000, 150_000),
+}
+
+
+def _make_vocabulary(rng: random.Random, size: int) -> List[str]:
+    """Random words of 2 to 5 syllables, the tail of the word frequency distribution."""
+    words = []
+    for _ in range(size):
+        syllables = [chr(rng.choice(_CONSONANTS) + rng.randrange(7)) for _ in range(rng.randint(2, 5))]
+        words.append("".join(syllables))
+    return words
+
+
+class CorpusGenerator(object):
+    """Generates texts of a language with Zipf distributed words, punctuation, short forms,
+    numbers, latin words, links and emojis.
+    """
+    def __init__(self, lang: str = "am", seed: int = 0, vocabulary_size: int = 20_000):
+        if lang not in COMMON_WORDS:
+            raise ValueError(f"CorpusGenerator: `lang` must be one of {tuple(COMMON_WORDS)}, not {lang!r}")
+        self.lang = lang
+        self.seed = seed
+        self._rng = random.Random(f"{lang}:{seed}")
+        self._words = COMMON_WORDS[lang] + _make_vocabulary(self._rng, vocabulary_size)
+        # Zipf weights, cumulated for `random.choices`
+        weights = [1.0 / (rank + 1) for rank in range(len(self._words))]
+        self._cum_weights = []
+        total = 0.0
+        for weight in weights:
+            total += weight
+            self._cum_weights.append(total)
+
+    def _token(self) -> str:
+        rng = self._rng
+        draw = rng.random()
+        if draw < 0.02:
+            return rng.choice(SHORT_FORMS[self.lang])
+        if draw < 0.03:
+            return str(rng.randint(1, 2030))
+        if draw < 0.035:
+            return rng.choice(LATIN_WORDS)
+        return rng.choices(self._words, cum_weights=self._cum_weights)[0]
+
+    def _sentence(self, num_words: int) -> str:
+        rng = self._rng
+        tokens = []
+        for index in range(num_words):
+            tokens.append(self._token())
+            if index < num_words - 1 and rng.random() < 0.08:
+                tokens[-1] += rng.choice(COMMAS)
+        return " ".join(tokens) + rng.choice(SENTENCE_ENDS)
+
+    def text(self, num_words: int, social: bool = False) -> str:
+        """ Returns a text of about `num_words` words, in sentences and paragraphs.
+        With `social`, it also has links, mentions, hashtags and emojis, like a tweet.
+        """
+        rng = self._rng
+        sentences = []
+        remaining = num_words
+        while remaining > 0:
+            length = min(remaining, rng.randint(5, 25))
+            sentences.append(self._sentence(length))
+            remaining -= length
+            if rng.random() < 0.15:
+                sentences.append("\n\n")
+
+        if social:
+            if rng.random() < 0.5:
+                sentences.append(f"https://t.co/{rng.randrange(16 ** 8):08x}")
+            if rng.random() < 0.3:
+                sentences.insert(0, f"@user{rng.randrange(1000)}")
+            if rng.random() < 0.5:
+                sentences.append("#" + rng.choice(COMMON_WORDS[self.lang]))
+            if rng.random() < 0.6:
+                sentences.append(rng.choice(EMOJIS))
+        return " ".join(sentences).replace(" \n\n ", "\n\n")
+
+    def texts(self, size: str, count: int) -> List[str]:
+        """ Returns `count` texts of a size: ``tweet``, ``news`` or ``book``.
+        """
+        if size not in SIZES:
+            raise ValueError(f"CorpusGenerator: `size` must be one of {tuple(SIZES)}, not {size!r}")
+        min_words, max_words = SIZES[size]
+        return [self.text(self._rng.randint(min_words, max_words), social=size == "tweet") for _ in range(count)]
+
+
+def generate(lang: str, size: str, count: int, seed: int = 0) -> List[str]:
+    """ Returns `count` synthetic texts of a language and size, the same for the same arguments.
+    """
+    return CorpusGenerator(lang, seed).texts(size, count)
+
+
+if __name__ == "__main__":
+    import sys
+    print(generate(sys.argv[1] if len(sys.argv) > 1 else "am", sys.argv[2] if len(sys.argv) > 2 else "tweet", 1)[0])
@@ -0,0 +1,232 @@
+# coding=utf-8
+#
+"""Measures the throughput, latency and peak memory of the etnltk functions on synthetic corpora.
+
+Usage::
+
+    python benchmarks/run.py                          # every benchmark, every size
+    python benchmarks/run.py -k tokenize -s tweet news
+    python benchmarks/run.py --save baseline.json     # on the reference version
+    python benchmarks/run.py --compare baseline.json  # on the new version, exits with 1 on a regression
+"""
+# Standard libraries
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+# Run from a checkout without installing etnltk
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+
+# etnltk libraries
+import etnltk
+from etnltk.lang import am, tg
+from etnltk.tokenize import am as am_tokenize, tg as tg_tokenize
+
+from corpus import SIZES, generate
+
+# Number of texts generated for every size
+CORPUS_COUNTS = {
+    "tweet": 1000,
+    "news": 50,
+    "book": 1,
+}
+
+
+class Benchmark(NamedTuple):
+    name: str
+    lang: str
+    func: Callable[[str], object]
+
+
+def _document(cls: type) -> Callable[[str], object]:
+    """Builds a document and reads all its attributes, like a typical user of `Amharic` or `Tigrigna`."""
+    def analyze(text: str):
+        doc = cls(text)
+        doc.tokens
+        doc.words
+        doc.cleaned
+        return [sentence.dict for sentence in doc.sentences]
+    analyze.__name__ = cls.__name__
+    return analyze
+
+
+def _benchmarks() -> List[Benchmark]:
+    benchmarks = []
+    for lang, module, tokenizer, clean in (
+        ("am", am, am_tokenize, am.clean_amharic),
+        ("tg", tg, tg_tokenize, tg.clean_tigrigna),
+    ):
+        benchmarks += [
+            Benchmark(clean.__name__, lang, clean),
+            Benchmark("word_tokenize", lang, tokenizer.word_tokenize),
+            Benchmark("sent_tokenize", lang, tokenizer.sent_tokenize),
+            Benchmark("normalize", lang, module.normalize),
+            Benchmark("normalize_char", lang, module.normalize_char),
+            Benchmark("normalize_punct", lang, module.normalize_punct),
+            Benchmark("normalize_labialized", lang, module.normalize_labialized),
+            Benchmark("normalize_shortened", lang, module.normalize_shortened),
+            Benchmark("remove_stopwords", lang, module.remove_stopwords),
+        ]
+    benchmarks += [
+        Benchmark("Amharic", "am", _document(am.Amharic)),
+        Benchmark("Tigrigna", "tg", _document(tg.Tigrigna)),
+    ]
+    return benchmarks
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percent / 100))]
+
+
+def measure(func: Callable[[str], object], texts: List[str], min_time: float, max_calls: int) -> Dict:
+    """ Calls `func` on the texts in turn, for at least `min_time` seconds and one pass over the texts
+    (or `max_calls` calls), then measures the peak memory of a call on the largest text.
+    """
+    # Warm-up: loads the language packs and fills the lazy caches
+    func(texts[0])
+
+    latencies = []
+    num_chars = num_bytes = 0
+    gc.collect()
+    total_start = time.perf_counter()
+    index = 0
+    while len(latencies) < max_calls:
+        text = texts[index % len(texts)]
+        start = time.perf_counter()
+        func(text)
+        latencies.append(time.perf_counter() - start)
+        num_chars += len(text)
+        num_bytes += len(text.encode("utf-8"))
+        index += 1
+        if index >= len(texts) and time.perf_counter() - total_start >= min_time:
+            break
+    total = sum(latencies)
+
+    largest = max(texts, key=len)
+    gc.collect()
+    tracemalloc.start()
+    func(largest)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "calls": len(latencies),
+        "mb_per_s": num_bytes / total / 1e6,
+        "chars_per_s": num_chars / total,
+        "docs_per_s": len(latencies) / total,
+        "latency_ms": {
+            "mean": total / len(latencies) * 1e3,
+            "p50": statistics.median(latencies) * 1e3,
+            "p95": _percentile(latencies, 95) * 1e3,
+            "max": max(latencies) * 1e3,
+        },
+        "peak_memory_kb": peak / 1024,
+    }
+
+
+def run(names: Optional[List[str]], sizes: List[str], langs: List[str], min_time: float, max_calls: int,
+        seed: int) -> Dict:
+    benchmarks = [
+        benchmark for benchmark in _benchmarks()
+        if benchmark.lang in langs and (not names or any(name in benchmark.name for name in names))
+    ]
+    results = {}
+    for lang in langs:
+        for size in sizes:
+            texts = generate(lang, size, CORPUS_COUNTS[size], seed=seed)
+            for benchmark in benchmarks:
+                if benchmark.lang != lang:
+                    continue
+                key = f"{lang}/{benchmark.name}/{size}"
+                results[key] = measure(benchmark.func, texts, min_time, max_calls)
+                _print_result(key, results[key])
+    return {
+        "meta": {
+            "etnltk": etnltk.__version__,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "seed": seed,
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        },
+        "results": results,
+    }
+
+
+def _print_result(key: str, result: Dict):
+    latency = result["latency_ms"]
+    print(
+        f"{key:<40} {result['mb_per_s']:8.2f} MB/s {result['docs_per_s']:10.1f} docs/s "
+        f"p50 {latency['p50']:9.3f} ms  p95 {latency['p95']:9.3f} ms  peak {result['peak_memory_kb']:10.1f} KiB",
+        flush=True,
+    )
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> int:
+    """ Prints the change of every benchmark against the baseline.
+
+    Returns:
+        int: the number of regressions, benchmarks slower or using more memory by more than `threshold`.
+    """
+    regressions = 0
+    print(f"\nCompared with the baseline of etnltk {baseline['meta']['etnltk']} ({baseline['meta']['date']}):")
+    for key, result in current["results"].items():
+        if key not in baseline["results"]:
+            continue
+        previous = baseline["results"][key]
+        speedup = result["docs_per_s"] / previous["docs_per_s"]
+        memory = result["peak_memory_kb"] / max(previous["peak_memory_kb"], 1e-9)
+        flags = []
+        if speedup < 1 - threshold:
+            flags.append("SLOWER")
+        if memory > 1 + threshold:
+            flags.append("MORE MEMORY")
+        regressions += bool(flags)
+        print(f"{key:<40} speed x{speedup:6.2f}  memory x{memory:6.2f}  {' '.join(flags)}")
+    print(f"{regressions} regression(s) over {threshold:.0%}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", "--filter", nargs="+", help="run the benchmarks whose name contains one of these")
+    parser.add_argument("-s", "--sizes", nargs="+", choices=tuple(SIZES), default=list(SIZES),
+                        help="input sizes (default: all)")
+    parser.add_argument("-l", "--langs", nargs="+", choices=("am", "tg"), default=["am", "tg"],
+                        help="languages (default: all)")
+    parser.add_argument("-t", "--min-time", type=float, default=1.0,
+                        help="minimum time of a benchmark in seconds (default: 1.0)")
+    parser.add_argument("--max-calls", type=int, default=100_000,
+                        help="maximum number of calls of a benchmark (default: 100000)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the synthetic corpus (default: 0)")
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="compare the results with a JSON file written by --save")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="relative change reported as a regression (default: 0.1)")
+    args = parser.parse_args(argv)
+
+    results = run(args.filter, args.sizes, args.langs, args.min_time, args.max_calls, args.seed)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+        if baseline["meta"]["seed"] != args.seed:
+            print(f"warning: the baseline corpus has seed {baseline['meta']['seed']}, not {args.seed}", file=sys.stderr)
+        return 1 if compare(results, baseline, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,226 @@
+# coding=utf-8
+#
+"""Stress test of etnltk under threads: the cleaners, tokenizers, documents and pipelines are run
+from many threads at a time, from a cold start, and their output is compared with the output of a
+fresh process using one thread. Also prints the throughput of `pipe` with worker threads.
+
+Usage::
+
+    python benchmarks/threads.py                      # 8 threads, 3 rounds
+    python benchmarks/threads.py -n 16 -r 10 -s tweet news
+    python benchmarks/threads.py --switch-interval 1e-6   # more thread switches, slower
+
+Exits with 1 if any output differs.
+"""
+# Standard libraries
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from multiprocessing import get_context
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+# Run from a checkout without installing etnltk
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+
+# etnltk libraries
+import etnltk
+from etnltk.common.parallel import pipe
+from etnltk.common.vocab import get_vocab
+from etnltk.lang import am, tg
+from etnltk.lang.pack import load_pack
+from etnltk.tokenize import am as am_tokenize, tg as tg_tokenize
+
+from corpus import SIZES, generate
+
+# Number of texts generated for every size
+CORPUS_COUNTS = {
+    "tweet": 300,
+    "news": 20,
+    "book": 1,
+}
+
+
+class Operation(NamedTuple):
+    name: str
+    lang: str
+    func: Callable[[str], object]
+
+
+def _analyze(doc) -> Tuple:
+    """Reads the annotations of a document, the normalized forms read the vocabulary shared by the threads."""
+    return (
+        list(doc.tokens),
+        list(doc.words),
+        [sentence.dict for sentence in doc.sentences],
+        doc.content_words,
+        [token.norm for token in doc.tokens.iter_tokens()],
+        doc.cleaned,
+    )
+
+
+def _document(cls: type, text: str) -> Tuple:
+    return _analyze(cls(text))
+
+
+def _pipeline(lang: str, text: str) -> Tuple:
+    return _analyze(etnltk.load(lang)(text))
+
+
+def _operations() -> List[Operation]:
+    operations = []
+    for lang, module, tokenizer, clean, cls in (
+        ("am", am, am_tokenize, am.clean_amharic, am.Amharic),
+        ("tg", tg, tg_tokenize, tg.clean_tigrigna, tg.Tigrigna),
+    ):
+        operations += [
+            Operation(clean.__name__, lang, clean),
+            Operation("word_tokenize", lang, tokenizer.word_tokenize),
+            Operation("sent_tokenize", lang, tokenizer.sent_tokenize),
+            Operation("normalize", lang, module.normalize),
+            Operation("remove_stopwords", lang, module.remove_stopwords),
+            Operation(cls.__name__, lang, partial(_document, cls)),
+            Operation("Language", lang, partial(_pipeline, lang)),
+        ]
+    return operations
+
+
+def _corpus(sizes: List[str], seed: int) -> Dict[str, List[str]]:
+    return {
+        lang: [text for size in sizes for text in generate(lang, size, CORPUS_COUNTS[size], seed=seed)]
+        for lang in ("am", "tg")
+    }
+
+
+def _run_all(corpus: Dict[str, List[str]], order: Optional[List[Tuple[int, int]]] = None) -> Dict[Tuple, object]:
+    """Runs every operation on every text of its language, in the given order of (operation, text) indexes."""
+    operations = _operations()
+    if order is None:
+        order = [(i, j) for i, operation in enumerate(operations) for j in range(len(corpus[operation.lang]))]
+    outputs = {}
+    for i, j in order:
+        operation = operations[i]
+        outputs[i, j] = operation.func(corpus[operation.lang][j])
+    return outputs
+
+
+def reference_outputs(corpus: Dict[str, List[str]]) -> Dict[Tuple, object]:
+    """The outputs computed with one thread, in a fresh process."""
+    with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as executor:
+        return executor.submit(_run_all, corpus).result()
+
+
+def stress(corpus: Dict[str, List[str]], n_threads: int, seed: int) -> Tuple[Dict[Tuple, object], List[Dict]]:
+    """Runs every operation on every text in each of `n_threads` threads, each in its own random order.
+    The threads start together, so the first ones load the language data while the others already use it.
+
+    Returns:
+        the outputs of every thread, and the shared objects every thread saw.
+    """
+    operations = _operations()
+    tasks = [(i, j) for i, operation in enumerate(operations) for j in range(len(corpus[operation.lang]))]
+    barrier = threading.Barrier(n_threads)
+    outputs: List[Optional[Dict]] = [None] * n_threads
+    shared: List[Optional[Dict]] = [None] * n_threads
+    errors: List[BaseException] = []
+
+    def work(index: int):
+        order = list(tasks)
+        random.Random(seed + index).shuffle(order)
+        try:
+            barrier.wait()
+            outputs[index] = _run_all(corpus, order)
+            shared[index] = {lang: (id(load_pack(lang)), id(get_vocab(lang))) for lang in ("am", "tg")}
+        except BaseException as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=work, args=(index,), name=f"stress-{index}") for index in range(n_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+    return outputs, shared
+
+
+def compare(reference: Dict[Tuple, object], outputs: Dict[Tuple, object], label: str) -> int:
+    """Prints the differing outputs, returns their number."""
+    operations = _operations()
+    differences = 0
+    for key, expected in reference.items():
+        if outputs.get(key) != expected:
+            differences += 1
+            if differences <= 5:
+                operation = operations[key[0]]
+                print(f"{label}: {operation.lang}/{operation.name} differs on text {key[1]}", file=sys.stderr)
+    return differences
+
+
+def throughput(corpus: Dict[str, List[str]], thread_counts: List[int], batch_size: int) -> None:
+    """Prints the documents per second of `pipe` with every number of worker threads."""
+    for operation in _operations():
+        texts = corpus[operation.lang]
+        line = f"{operation.lang + '/' + operation.name:<28}"
+        for n_threads in thread_counts:
+            start = time.perf_counter()
+            for _ in pipe(operation.func, texts, batch_size=batch_size, n_threads=n_threads):
+                pass
+            line += f" {n_threads:>3} threads {len(texts) / (time.perf_counter() - start):10.1f} docs/s"
+        print(line, flush=True)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", "--n-threads", type=int, default=8, help="number of threads (default: 8)")
+    parser.add_argument("-r", "--rounds", type=int, default=3,
+                        help="number of stress rounds, the first one starts cold (default: 3)")
+    parser.add_argument("-s", "--sizes", nargs="+", choices=tuple(SIZES), default=["tweet", "news"],
+                        help="input sizes (default: tweet news)")
+    parser.add_argument("--switch-interval", type=float, default=1e-5,
+                        help="seconds between thread switches, see `sys.setswitchinterval` (default: 1e-5)")
+    parser.add_argument("-b", "--batch-size", type=int, default=16,
+                        help="batch size of the `pipe` runs (default: 16)")
+    parser.add_argument("--no-throughput", action="store_true", help="only run the stress test")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the synthetic corpus (default: 0)")
+    args = parser.parse_args(argv)
+
+    corpus = _corpus(args.sizes, args.seed)
+    print(f"etnltk {etnltk.__version__}, {sum(map(len, corpus.values()))} texts, "
+          f"{len(_operations())} operations, {args.n_threads} threads", flush=True)
+    reference = reference_outputs(corpus)
+
+    differences = 0
+    sys.setswitchinterval(args.switch_interval)
+    for round_index in range(args.rounds):
+        start = time.perf_counter()
+        outputs, shared = stress(corpus, args.n_threads, args.seed + round_index * args.n_threads)
+        for index, thread_outputs in enumerate(outputs):
+            differences += compare(reference, thread_outputs, f"round {round_index} thread {index}")
+        if any(objects != shared[0] for objects in shared):
+            differences += 1
+            print(f"round {round_index}: the threads got different language packs or vocabularies", file=sys.stderr)
+        print(f"round {round_index}: {len(reference) * args.n_threads} outputs in "
+              f"{time.perf_counter() - start:.2f} s", flush=True)
+
+    for n_threads in (1, args.n_threads):
+        outputs = {}
+        for i, operation in enumerate(_operations()):
+            results = pipe(operation.func, corpus[operation.lang], batch_size=args.batch_size, n_threads=n_threads)
+            outputs.update({(i, j): result for j, result in enumerate(results)})
+        differences += compare(reference, outputs, f"pipe with {n_threads} threads")
+    sys.setswitchinterval(0.005)
+
+    if not args.no_throughput:
+        throughput(corpus, sorted({1, 2, args.n_threads}), args.batch_size)
+
+    print(f"{differences} difference(s)")
+    return 1 if differences else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
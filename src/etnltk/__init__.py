@@ -1,9 +1,6 @@
 # Standard libraries
 import os
-
-# etnltk libraries
-from .lang.am import Amharic, AmharicWord
-from .lang.tg import Tigrigna, TigrignaWord
+from importlib import import_module
 
 __version__ = '0.0.26'
 __license__ = 'MIT'
@@ -15,5 +12,46 @@ __all__ = [
     'Amharic',
     'AmharicWord',
     'Tigrigna',
-    'TigrignaWord'
+    'TigrignaWord',
+    'load'
 ]
+
+# The language modules are only imported when one of their classes is first used,
+# so `import etnltk` stays cheap and each language loads only its own data.
+_LAZY_ATTRIBUTES = {
+    'Amharic': 'etnltk.lang.am',
+    'AmharicWord': 'etnltk.lang.am',
+    'Tigrigna': 'etnltk.lang.tg',
+    'TigrignaWord': 'etnltk.lang.tg',
+}
+
+# The module of every language, it defines its `make_pipeline`
+_LANGUAGES = {
+    'am': 'etnltk.lang.am',
+    'tg': 'etnltk.lang.tg',
+}
+
+
+def load(lang: str, **kwargs):
+    """ Returns a new processing pipeline of a language, see `etnltk.common.language.Language`.
+
+    Args:
+        lang (str): language code, ``am`` or ``tg``.
+        **kwargs: passed to the `make_pipeline` of the language, e.g. ``keep_abbrev=True``.
+    """
+    if lang not in _LANGUAGES:
+        raise ValueError(f"load: `lang` must be one of {tuple(_LANGUAGES)}, not {lang!r}")
+    return import_module(_LANGUAGES[lang]).make_pipeline(**kwargs)
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(import_module(_LAZY_ATTRIBUTES[name]), name)
+        # Cache it, later accesses are plain module attribute lookups
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
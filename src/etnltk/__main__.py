@@ -0,0 +1,10 @@
+# coding=utf-8
+#
+# Standard libraries
+import sys
+
+# etnltk libraries
+from etnltk.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
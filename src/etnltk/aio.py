@@ -0,0 +1,331 @@
+# coding=utf-8
+#
+# Standard libraries
+import asyncio
+import importlib
+import os
+import threading
+import weakref
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+# etnltk libraries
+from .cli import get_operation
+from .common.doc import make_document
+from .common.parallel import handle_results, process_batch
+
+# Maximum number of queued calls of a `MicroBatcher`, callers wait when it is reached
+DEFAULT_MAX_PENDING = 1024
+DEFAULT_MAX_BATCH_SIZE = 64
+
+# The document class of every language
+_DOCUMENTS = {
+    "am": ("etnltk.lang.am", "Amharic"),
+    "tg": ("etnltk.lang.tg", "Tigrigna"),
+}
+
+# The executor running the CPU work of the async functions, created on first use
+_executor: Optional[Executor] = None
+_executor_lock = threading.Lock()
+
+# The batchers of the module functions, per event loop and operation
+_batchers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple, MicroBatcher]]" = \
+    weakref.WeakKeyDictionary()
+
+
+def get_executor() -> Executor:
+    """ Returns the executor of the async functions, by default a thread pool with a thread per CPU.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="etnltk")
+        return _executor
+
+
+def set_executor(executor: Optional[Executor]) -> None:
+    """ Sets the executor of the async functions, e.g. a ``ProcessPoolExecutor`` to use several CPUs.
+    The previous executor is not shut down. None goes back to the default thread pool.
+    """
+    global _executor
+    with _executor_lock:
+        _executor = executor
+
+
+def shutdown(wait: bool = True) -> None:
+    """ Shuts the executor of the async functions down, a new one is created on next use.
+    """
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
+
+
+def _default_concurrency() -> int:
+    return os.cpu_count() or 1
+
+
+class MicroBatcher(object):
+    """Runs a function in an executor for calls made concurrently from coroutines,
+    coalescing them into batches.
+
+    Calls are queued. A batch is sent to the executor as soon as it has a free worker: it takes the
+    calls queued while the previous batches were running, at most `max_batch_size` of them. An idle
+    service runs every call at once, a busy one runs fewer and larger batches instead of queueing
+    one executor job per call. At most `max_pending` calls are queued, further callers wait
+    until there is room, so the queue, and the waiting time in it, stays bounded under load.
+
+    Example::
+
+        clean = MicroBatcher(clean_amharic)
+        texts = await asyncio.gather(*[clean(text) for text in texts])
+    """
+    def __init__(
+        self,
+        func: Callable,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_delay: float = 0.0,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        max_concurrency: Optional[int] = None,
+        executor: Optional[Executor] = None
+    ):
+        """
+        Args:
+            func (Callable): function applied to every item, must be picklable with a process executor.
+            max_batch_size (int, optional): maximum number of items of a batch. Defaults to 64.
+            max_delay (float, optional): seconds a batch waits for more calls before it is sent. Defaults to 0.
+            max_pending (int, optional): maximum number of queued calls. Defaults to 1024.
+            max_concurrency (Optional[int], optional): maximum number of batches running at a time,
+                by default the number of CPUs.
+            executor (Optional[Executor], optional): by default the one of :func:`get_executor`.
+        """
+        if max_batch_size < 1:
+            raise ValueError(f"MicroBatcher: `max_batch_size` must be positive, not {max_batch_size}")
+        if max_pending < 1:
+            raise ValueError(f"MicroBatcher: `max_pending` must be positive, not {max_pending}")
+        self.func = func
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.max_pending = max_pending
+        self.max_concurrency = max_concurrency
+        self.executor = executor
+        # Created in the event loop of the first call and dropped when its worker ends, e.g. when the
+        # loop is shut down, the batcher only keeps a weak reference to the loop
+        self._loop: Optional["weakref.ref[asyncio.AbstractEventLoop]"] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def __repr__(self):
+        func_name = getattr(self.func, "__name__", repr(self.func))
+        pending = self._queue.qsize() if self._queue is not None else 0
+        return f"{self.__class__.__name__}({func_name}, pending={pending})"
+
+    async def __call__(self, item) -> Any:
+        """ Returns ``func(item)``, computed in the executor with other queued items.
+        """
+        loop = asyncio.get_running_loop()
+        current = self._loop() if self._loop is not None else None
+        if current is not loop:
+            if current is not None and not current.is_closed():
+                raise RuntimeError("MicroBatcher: a batcher can only be used in one event loop at a time")
+            self._loop = weakref.ref(loop)
+            self._queue = asyncio.Queue(self.max_pending)
+            self._worker = loop.create_task(self._run(self._queue))
+            self._worker.add_done_callback(self._worker_done)
+
+        future = loop.create_future()
+        # Waits while the queue is full
+        await self._queue.put((item, future))
+        ok, result = await future
+        if ok:
+            return result
+        raise result
+
+    async def _run(self, queue: asyncio.Queue):
+        loop = asyncio.get_running_loop()
+        executor = self.executor or get_executor()
+        running = asyncio.Semaphore(self.max_concurrency or _default_concurrency())
+        while True:
+            calls = [await queue.get()]
+            # The calls queued while waiting for a free worker join the batch
+            await running.acquire()
+            if self.max_delay > 0 and queue.qsize() < self.max_batch_size - 1:
+                await asyncio.sleep(self.max_delay)
+            while len(calls) < self.max_batch_size and not queue.empty():
+                calls.append(queue.get_nowait())
+
+            # Calls cancelled by their caller are not computed
+            calls = [(item, future) for item, future in calls if not future.done()]
+            if not calls:
+                running.release()
+                continue
+            batch = [item for item, _ in calls]
+            try:
+                task = loop.run_in_executor(executor, process_batch, self.func, batch)
+            except Exception as error:
+                # E.g. the executor was shut down
+                task = loop.create_future()
+                task.set_exception(error)
+            task.add_done_callback(partial(self._set_results, calls, running))
+
+    @staticmethod
+    def _set_results(calls: List[Tuple[Any, asyncio.Future]], running: asyncio.Semaphore, task: asyncio.Future):
+        running.release()
+        if task.cancelled():
+            results = [(False, asyncio.CancelledError())] * len(calls)
+        elif task.exception() is not None:
+            # The batch failed as a whole, e.g. it could not be sent to a worker process
+            results = [(False, task.exception())] * len(calls)
+        else:
+            results = task.result()
+        for (_, future), result in zip(calls, results):
+            if not future.done():
+                future.set_result(result)
+
+    def _worker_done(self, worker: asyncio.Task):
+        if worker is not self._worker:
+            return
+        # Forgets the loop, the batcher can be used again in another one
+        queue = self._queue
+        self._loop = self._queue = self._worker = None
+        while not queue.empty():
+            _, future = queue.get_nowait()
+            future.cancel()
+
+    def close(self) -> None:
+        """ Stops the batcher, the calls still queued are cancelled.
+        """
+        if self._worker is not None:
+            self._worker.cancel()
+
+
+def _get_batcher(key: Tuple, make_func: Callable[[], Callable]) -> MicroBatcher:
+    """Returns the batcher of an operation in the running event loop."""
+    loop = asyncio.get_running_loop()
+    batchers = _batchers.get(loop)
+    if batchers is None:
+        batchers = _batchers[loop] = {}
+        # Dropped with the loop, its batchers hold no reference to it once their workers are cancelled
+    batcher = batchers.get(key)
+    if batcher is None:
+        batcher = batchers[key] = MicroBatcher(make_func())
+    return batcher
+
+
+def _operation(operation: str, lang: str, **kwargs) -> Callable:
+    func = get_operation(operation, lang)
+    return partial(func, **kwargs) if kwargs else func
+
+
+def _check_lang(name: str, lang: str):
+    if lang not in _DOCUMENTS:
+        raise ValueError(f"{name}: `lang` must be one of {tuple(_DOCUMENTS)}, not {lang!r}")
+
+
+async def aclean(text: str, lang: str = "am", keep_abbrev: bool = False) -> str:
+    """ Async `clean_amharic` or `clean_tigrigna`, computed in the executor with concurrent calls.
+    """
+    _check_lang("aclean", lang)
+    batcher = _get_batcher(("clean", lang, keep_abbrev), partial(_operation, "clean", lang, keep_abbrev=keep_abbrev))
+    return await batcher(text)
+
+
+async def atokenize(text: str, lang: str = "am") -> List[str]:
+    """ Async `word_tokenize`, computed in the executor with concurrent calls.
+    """
+    _check_lang("atokenize", lang)
+    return await _get_batcher(("word", lang), partial(_operation, "word", lang))(text)
+
+
+async def asent_tokenize(text: str, lang: str = "am") -> List[str]:
+    """ Async `sent_tokenize`, computed in the executor with concurrent calls.
+    """
+    _check_lang("asent_tokenize", lang)
+    return await _get_batcher(("sent", lang), partial(_operation, "sent", lang))(text)
+
+
+def _document_factory(lang: str, attrs: Tuple[str, ...]) -> Callable:
+    module_name, cls_name = _DOCUMENTS[lang]
+    cls = getattr(importlib.import_module(module_name), cls_name)
+    return partial(make_document, cls, attrs=attrs)
+
+
+async def adocument(text: str, lang: str = "am", attrs: Iterable[str] = ("tokens", "words", "sentences")):
+    """ Async `Amharic(text)` or `Tigrigna(text)`, the `attrs` annotations are computed in the executor
+    so reading them does not block the event loop.
+    """
+    _check_lang("adocument", lang)
+    attrs = tuple(attrs)
+    return await _get_batcher(("doc", lang, attrs), partial(_document_factory, lang, attrs))(text)
+
+
+async def _aiter_batches(items: Union[AsyncIterable, Iterable], batch_size: int) -> AsyncIterator[List]:
+    batch = []
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            batch.append(item)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    else:
+        for item in items:
+            batch.append(item)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
+async def apipe(
+    func: Callable,
+    items: Union[AsyncIterable, Iterable],
+    batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+    max_concurrency: Optional[int] = None,
+    error_handler: Optional[Callable] = None,
+    executor: Optional[Executor] = None
+) -> AsyncIterator:
+    """ Async counterpart of `etnltk.common.parallel.pipe`: applies `func` to a stream of items,
+    in batches computed in the executor, and yields the results in input order.
+
+    At most `2 * max_concurrency` batches are in flight. The input is not read further until
+    the oldest one is done, so a fast producer is slowed down to the pace of the executor.
+
+    Args:
+        func (Callable): function applied to every item, e.g. ``clean_amharic``.
+        items (Union[AsyncIterable, Iterable]): the input stream.
+        batch_size (int, optional): number of items sent to the executor at a time. Defaults to 64.
+        max_concurrency (Optional[int], optional): number of batches computed at a time,
+            by default the number of CPUs.
+        error_handler (Optional[Callable], optional): called as ``error_handler(item, error)``
+            when `func` raises, its return value is yielded instead. If not passed, `None` is yielded.
+        executor (Optional[Executor], optional): by default the one of :func:`get_executor`.
+
+    Returns:
+        AsyncIterator: results of `func`, in the order of `items`.
+    """
+    if batch_size < 1:
+        raise ValueError(f"apipe: `batch_size` must be positive, not {batch_size}")
+    loop = asyncio.get_running_loop()
+    executor = executor or get_executor()
+    max_in_flight = 2 * (max_concurrency or _default_concurrency())
+
+    pending = deque()
+    try:
+        async for batch in _aiter_batches(items, batch_size):
+            pending.append((batch, loop.run_in_executor(executor, process_batch, func, batch)))
+            if len(pending) >= max_in_flight:
+                done_batch, results = pending.popleft()
+                for result in handle_results(done_batch, await results, error_handler):
+                    yield result
+        while pending:
+            done_batch, results = pending.popleft()
+            for result in handle_results(done_batch, await results, error_handler):
+                yield result
+    finally:
+        # The consumer stopped early, the batches not started yet are dropped
+        for _, results in pending:
+            results.cancel()
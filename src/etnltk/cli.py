@@ -0,0 +1,183 @@
+# coding=utf-8
+#
+# Standard libraries
+import argparse
+import importlib
+import io
+import json
+import sys
+from typing import Callable, Iterator, List, Optional, TextIO
+
+# etnltk libraries
+from .common.parallel import pipe
+from .corpus.chunks import DEFAULT_CHUNK_SIZE, process_file
+from .corpus.reader import read_corpus
+
+# (module, function) of every operation per language.
+# Only the module of the selected language is imported.
+OPERATIONS = {
+    "clean": {
+        "am": ("etnltk.lang.am", "clean_amharic"),
+        "tg": ("etnltk.lang.tg", "clean_tigrigna"),
+    },
+    "sent": {
+        "am": ("etnltk.tokenize.am", "sent_tokenize"),
+        "tg": ("etnltk.tokenize.tg", "sent_tokenize"),
+    },
+    "word": {
+        "am": ("etnltk.tokenize.am", "word_tokenize"),
+        "tg": ("etnltk.tokenize.tg", "word_tokenize"),
+    },
+}
+
+# The JSON key of the result of every operation
+_JSON_KEYS = {
+    "clean": "text",
+    "sent": "sentences",
+    "word": "words",
+}
+
+
+def get_operation(operation: str, lang: str) -> Callable:
+    """Returns the function of an operation for a language.
+    """
+    module_name, func_name = OPERATIONS[operation][lang]
+    return getattr(importlib.import_module(module_name), func_name)
+
+
+def write_result(out: TextIO, fmt: str, operation: str, doc_id: int, result) -> None:
+    """Writes the result of one line or document.
+
+    text: `clean` and `word` write one line per input, `sent` writes one sentence per line
+          followed by an empty line.
+    jsonl: one JSON object per input.
+    tsv: `clean` writes "id<TAB>text" per input, `sent` and `word` write "id<TAB>index<TAB>item" per item.
+    """
+    failed = isinstance(result, Exception)
+    if fmt == "jsonl":
+        if failed:
+            record = {"id": doc_id, "error": f"{type(result).__name__}: {result}"}
+        else:
+            record = {"id": doc_id, _JSON_KEYS[operation]: result}
+        out.write(json.dumps(record, ensure_ascii=False) + "\n")
+    elif fmt == "tsv":
+        if failed:
+            return
+        if operation == "clean":
+            out.write(f"{doc_id}\t{result}\n")
+        else:
+            for index, item in enumerate(result):
+                out.write(f"{doc_id}\t{index}\t{item}\n")
+    else:
+        # Failed inputs are written as empty lines, so output lines stay aligned with the input
+        if operation == "clean":
+            out.write(("" if failed else result) + "\n")
+        elif operation == "word":
+            out.write(("" if failed else " ".join(result)) + "\n")
+        else:
+            for sentence in ([] if failed else result):
+                out.write(sentence + "\n")
+            out.write("\n")
+
+
+def _report_error(text, error: Exception) -> Exception:
+    print(f"etnltk: failed to process {text[:40]!r}: {type(error).__name__}: {error}", file=sys.stderr)
+    return error
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m etnltk",
+        description="Stream a UTF-8 corpus through etnltk cleaning or tokenization.",
+    )
+    parser.add_argument("operation", choices=sorted(OPERATIONS),
+                        help="clean: clean_amharic / clean_tigrigna, sent: sent_tokenize, word: word_tokenize")
+    parser.add_argument("inputs", nargs="*", default=["-"],
+                        help="input files, `-` or nothing reads from the standard input")
+    parser.add_argument("-l", "--lang", choices=("am", "tg"), default="am",
+                        help="language of the corpus (default: am)")
+    parser.add_argument("-u", "--unit", choices=("line", "document", "chunk"), default="line",
+                        help="process every line, or every block of lines separated by empty lines, "
+                             "or with --mmap every chunk cut after newlines and `።` (default: line)")
+    parser.add_argument("-f", "--format", choices=("text", "jsonl", "tsv"), default="text",
+                        help="output format (default: text)")
+    parser.add_argument("-o", "--output", default="-",
+                        help="output file, `-` writes to the standard output (default: -)")
+    parser.add_argument("-n", "--n-process", type=int, default=1,
+                        help="number of worker processes, -1 uses all CPUs (default: 1)")
+    parser.add_argument("-t", "--n-threads", type=int, default=1,
+                        help="number of worker threads, used instead of worker processes, "
+                             "-1 uses all CPUs (default: 1)")
+    parser.add_argument("-b", "--batch-size", type=int, default=1000,
+                        help="number of lines or documents sent to a worker at a time (default: 1000)")
+    parser.add_argument("--mmap", action="store_true",
+                        help="memory-map the input files, the workers read and process chunks of them in parallel")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"with --mmap, bytes read by a worker at a time (default: {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument("--encoding-errors", choices=("strict", "replace", "skip", "ignore"), default="strict",
+                        help="how invalid UTF-8 in the input is handled, `ignore` is `skip` (default: strict)")
+    return parser
+
+
+def _process_files(func: Callable, args: argparse.Namespace) -> Iterator:
+    for path in args.inputs:
+        yield from process_file(
+            func,
+            path,
+            unit=args.unit,
+            chunk_size=args.chunk_size,
+            n_process=args.n_process,
+            error_handler=_report_error,
+            errors=args.encoding_errors,
+            n_threads=args.n_threads,
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    # Intermixed, so the options can also come between the operation and the inputs
+    args = parser.parse_intermixed_args(argv)
+
+    if args.n_process != 1 and args.n_threads != 1:
+        parser.error("--n-process and --n-threads can't be used together")
+
+    func = get_operation(args.operation, args.lang)
+    if args.mmap:
+        if "-" in args.inputs:
+            parser.error("--mmap needs input files, not the standard input")
+        results = _process_files(func, args)
+    else:
+        if args.unit == "chunk":
+            parser.error("--unit chunk needs --mmap")
+        texts = read_corpus(args.inputs, unit=args.unit, errors=args.encoding_errors)
+        results = pipe(
+            func,
+            texts,
+            batch_size=args.batch_size,
+            n_process=args.n_process,
+            error_handler=_report_error,
+            n_threads=args.n_threads,
+        )
+
+    if args.output == "-":
+        out = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", newline="\n")
+    else:
+        out = open(args.output, "w", encoding="utf-8", newline="\n")
+
+    try:
+        for doc_id, result in enumerate(results):
+            write_result(out, args.format, args.operation, doc_id, result)
+        out.flush()
+    except BrokenPipeError:
+        # The reader of the output went away, e.g. `| head`
+        return 1
+    except UnicodeDecodeError as error:
+        print(f"etnltk: error: the input is not valid UTF-8: {error}, "
+              "see --encoding-errors", file=sys.stderr)
+        return 1
+    finally:
+        if args.output == "-":
+            out.detach()
+        else:
+            out.close()
+    return 0
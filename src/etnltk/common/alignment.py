@@ -0,0 +1,175 @@
+# coding=utf-8
+#
+# Standard libraries
+from bisect import bisect_right
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+# etnltk libraries
+
+
+class Alignment(object):
+    """Maps offsets in a normalized text back to offsets in the text it was normalized from.
+
+    Only the replaced parts of the text are stored, as (output start, output end, input start, input end)
+    segments; the text between them was copied unchanged. An offset inside a replaced part maps to the
+    start of its source when it starts a span, and to the end of its source when it ends a span,
+    so a token taken from an expansion like ጠቅላይ ሚኒስተር points at the whole short form ጠ/ሚ.
+
+    Alignments of successive normalizations are chained with :func:`chain_alignments`.
+    """
+    def __init__(self, segments: Iterable[Tuple[int, int, int, int]] = (), previous: Optional["Alignment"] = None):
+        """
+        Args:
+            segments (Iterable[Tuple[int, int, int, int]], optional): the replaced parts,
+                as (output start, output end, input start, input end), sorted by output start.
+            previous (Optional[Alignment], optional): alignment of the input text to the text it was
+                normalized from, offsets are mapped through it too. Defaults to None.
+        """
+        self._segments = list(segments)
+        self._output_starts = [segment[0] for segment in self._segments]
+        self.previous = previous
+
+    @classmethod
+    def from_replacements(cls, replacements: Iterable[Tuple], previous: Optional["Alignment"] = None) -> "Alignment":
+        """ Builds the alignment of a replacement from its entities,
+        the ``(start, end, match, replacement)`` tuples returned by ``Replacer.replace(text, return_entities=True)``.
+        """
+        segments = []
+        output_offset = 0
+        previous_end = 0
+        for start, end, _, replacement in replacements:
+            # The text between two replacements is copied
+            output_offset += max(0, start - previous_end)
+            segments.append((output_offset, output_offset + len(replacement), start, end))
+            output_offset += len(replacement)
+            previous_end = end
+        return cls(segments, previous)
+
+    def __repr__(self):
+        cls_name = self.__class__.__name__
+        return f"{cls_name}(segments={len(self._segments)}, chained={self.previous is not None})"
+
+    @property
+    def is_identity(self) -> bool:
+        """True when every offset maps to itself."""
+        return not self._segments and (self.previous is None or self.previous.is_identity)
+
+    def _input_start(self, offset: int) -> int:
+        index = bisect_right(self._output_starts, offset) - 1
+        if index < 0:
+            return offset
+        output_start, output_end, input_start, input_end = self._segments[index]
+        if offset < output_end:
+            return input_start
+        return input_end + offset - output_end
+
+    def _input_end(self, offset: int) -> int:
+        if offset <= 0:
+            return offset
+        # The segment of the last character of the span
+        index = bisect_right(self._output_starts, offset - 1) - 1
+        if index < 0:
+            return offset
+        output_start, output_end, input_start, input_end = self._segments[index]
+        if offset - 1 < output_end:
+            return input_end
+        return input_end + offset - output_end
+
+    def input_start(self, offset: int) -> int:
+        """ Returns the input offset of a span starting at `offset` in the output.
+        """
+        alignment = self
+        while alignment is not None:
+            if alignment._segments:
+                offset = alignment._input_start(offset)
+            alignment = alignment.previous
+        return offset
+
+    def input_end(self, offset: int) -> int:
+        """ Returns the input offset of a span ending at `offset` (exclusive) in the output.
+        """
+        alignment = self
+        while alignment is not None:
+            if alignment._segments:
+                offset = alignment._input_end(offset)
+            alignment = alignment.previous
+        return offset
+
+    def input_span(self, start: int, end: int) -> Tuple[int, int]:
+        """ Returns the (start, end) input offsets of the output span [start, end).
+        """
+        input_start = self.input_start(start)
+        return input_start, max(input_start, self.input_end(end))
+
+    def input_spans(self, spans: Iterable[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """ Maps many (start, end) output spans at once.
+        Spans sorted by start and end, e.g. tokens, are mapped in one pass over the segments.
+        """
+        spans = list(spans)
+        if self.is_identity:
+            return spans
+        starts = [start for start, _ in spans]
+        ends = [end for _, end in spans]
+        if not (_is_sorted(starts) and _is_sorted(ends)):
+            return [self.input_span(start, end) for start, end in spans]
+        alignment = self
+        while alignment is not None:
+            # Mapping keeps the offsets sorted
+            if alignment._segments:
+                starts = alignment._input_starts(starts)
+                ends = alignment._input_ends(ends)
+            alignment = alignment.previous
+        return [(start, max(start, end)) for start, end in zip(starts, ends)]
+
+    def _input_starts(self, offsets: List[int]) -> List[int]:
+        """Same as `_input_start` on every one of sorted offsets."""
+        segments = self._segments
+        count = len(segments)
+        index = -1
+        result = []
+        for offset in offsets:
+            while index + 1 < count and segments[index + 1][0] <= offset:
+                index += 1
+            if index < 0:
+                result.append(offset)
+                continue
+            output_start, output_end, input_start, input_end = segments[index]
+            result.append(input_start if offset < output_end else input_end + offset - output_end)
+        return result
+
+    def _input_ends(self, offsets: List[int]) -> List[int]:
+        """Same as `_input_end` on every one of sorted offsets."""
+        segments = self._segments
+        count = len(segments)
+        index = -1
+        result = []
+        for offset in offsets:
+            # The segment of the last character of the span
+            while index + 1 < count and segments[index + 1][0] <= offset - 1:
+                index += 1
+            if index < 0:
+                result.append(offset)
+                continue
+            output_start, output_end, input_start, input_end = segments[index]
+            result.append(input_end if offset - 1 < output_end else input_end + offset - output_end)
+        return result
+
+
+def _is_sorted(offsets: List[int]) -> bool:
+    return all(a <= b for a, b in zip(offsets, offsets[1:]))
+
+
+def chain_alignments(alignments: Sequence[Alignment]) -> Alignment:
+    """ Combines the alignments of successive normalizations, in the order they were applied,
+    into one alignment from the last output to the first input.
+    """
+    chained = None
+    for alignment in alignments:
+        chained = Alignment(alignment._segments, previous=_chain_previous(alignment.previous, chained))
+    return chained if chained is not None else Alignment()
+
+
+def _chain_previous(previous: Optional[Alignment], chained: Optional[Alignment]) -> Optional[Alignment]:
+    if previous is None:
+        return chained
+    return Alignment(previous._segments, previous=_chain_previous(previous.previous, chained))
@@ -0,0 +1,193 @@
+# coding=utf-8
+#
+# Standard libraries
+import re
+import threading
+from collections import OrderedDict, namedtuple
+from functools import wraps
+from typing import Callable, Hashable, List, Optional
+
+# etnltk libraries
+
+DEFAULT_MAXSIZE = 100_000
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+# The whitespace separated chunks of a text, the unit of the token cache
+_REGEX_CHUNK = re.compile(r"\S+")
+
+
+class LRUCache(object):
+    """A size-bounded cache that drops the least recently used entries first,
+    with hit and miss statistics. It can be shared by threads.
+    """
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE):
+        """
+        Args:
+            maxsize (int, optional): maximum number of entries. Defaults to 100000.
+        """
+        if maxsize < 0:
+            raise ValueError(f"LRUCache: `maxsize` can't be negative, not {maxsize}")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.info()})"
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get_or_compute(self, key: Hashable, compute: Callable, *args):
+        """ Returns the cached value of `key`, or computes it as ``compute(*args)`` and caches it.
+        """
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._data.move_to_end(key)
+                return value
+
+        # Computed without holding the lock
+        value = compute(*args)
+        with self._lock:
+            self._data[key] = value
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def info(self) -> CacheInfo:
+        """ Returns the statistics of the cache, like ``functools.lru_cache``.
+        """
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+    def clear(self) -> None:
+        """ Removes all entries and resets the statistics.
+        """
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def resize(self, maxsize: int) -> None:
+        """ Changes the maximum number of entries, the least recently used ones are dropped if needed.
+        """
+        if maxsize < 0:
+            raise ValueError(f"LRUCache: `maxsize` can't be negative, not {maxsize}")
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._data) > maxsize:
+                self._data.popitem(last=False)
+
+
+def once_per_key(func: Callable) -> Callable:
+    """ Caches the results of a function, like ``functools.lru_cache(maxsize=None)``,
+    but a result is computed once even when threads ask for it at the same time: the others wait for it.
+    Used for the shared data of a language, so all threads use the same objects.
+    """
+    results = {}
+    lock = threading.RLock()
+
+    @wraps(func)
+    def wrapper(*args):
+        try:
+            return results[args]
+        except KeyError:
+            pass
+        with lock:
+            if args not in results:
+                results[args] = func(*args)
+            return results[args]
+
+    wrapper.cache_clear = results.clear
+    return wrapper
+
+
+def once_per_thread(func: Callable) -> Callable:
+    """ Caches the results of a function in every thread, every thread gets its own objects.
+    Used for the objects that are not safe to share, e.g. a `textsearch.TextSearch`.
+    """
+    local = threading.local()
+
+    @wraps(func)
+    def wrapper(*args):
+        results = getattr(local, "results", None)
+        if results is None:
+            results = local.results = {}
+        try:
+            return results[args]
+        except KeyError:
+            result = results[args] = func(*args)
+            return result
+
+    return wrapper
+
+
+# The cache of the tokenizers, None when it is disabled
+_token_cache: Optional[LRUCache] = None
+
+
+def enable_token_cache(maxsize: int = DEFAULT_MAXSIZE) -> LRUCache:
+    """ Enables the token cache of the tokenizers and documents, or resizes it if it is already enabled.
+
+    The tokens of every whitespace separated chunk of a text, normalized and cleaned, are cached,
+    so a chunk seen before is not normalized again. The output of the tokenizers is unchanged.
+
+    Args:
+        maxsize (int, optional): maximum number of cached chunks. Defaults to 100000.
+
+    Returns:
+        LRUCache: the token cache, e.g. to read its statistics with ``info()``.
+    """
+    global _token_cache
+    if _token_cache is None:
+        _token_cache = LRUCache(maxsize)
+    else:
+        _token_cache.resize(maxsize)
+    return _token_cache
+
+
+def disable_token_cache() -> None:
+    """ Disables the token cache and frees its entries.
+    """
+    global _token_cache
+    _token_cache = None
+
+
+def get_token_cache() -> Optional[LRUCache]:
+    """ Returns the token cache, None when it is disabled.
+    """
+    return _token_cache
+
+
+def tokenize_chunks(cache: LRUCache, key: Hashable, text: str, tokenize: Callable) -> List:
+    """ Tokenizes every whitespace separated chunk of `text` on its own, through the cache.
+
+    Args:
+        cache (LRUCache): the cache.
+        key (Hashable): identifies the tokenizer and its options in the cache.
+        text (str): the text.
+        tokenize (Callable): returns the (token, start, end) tuples of a chunk.
+            The tokens of a chunk must not depend on the text around it.
+
+    Returns:
+        List: the (token, start, end) tuples of `text`.
+    """
+    tokens = []
+    for match in _REGEX_CHUNK.finditer(text):
+        chunk = match[0]
+        chunk_tokens = cache.get_or_compute((key, chunk), tokenize, chunk)
+        offset = match.start()
+        if offset:
+            tokens.extend([(token, start + offset, end + offset) for token, start, end in chunk_tokens])
+        else:
+            tokens.extend(chunk_tokens)
+    return tokens
@@ -0,0 +1,303 @@
+# coding=utf-8
+#
+# Standard libraries
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+# etnltk libraries
+from .utils import import_numpy
+
+# The classes of the codepoints, a codepoint is in exactly one class
+CLASS_OTHER = 0
+CLASS_SPACE = 1             # the space, the only whitespace kept by `remove_non_ethiopic`
+CLASS_WHITESPACE = 2        # the other ASCII whitespaces
+CLASS_ETHIOPIC_LETTER = 3   # syllables and combining marks, U+1200 - U+135F
+CLASS_ETHIOPIC_PUNCT = 4    # ፠ ፡ ። ፣ ፤ ፥ ፦ ፧ ፨, U+1360 - U+1368
+CLASS_ETHIOPIC_DIGIT = 5    # ፩ - ፼, U+1369 - U+137C
+CLASS_ETHIOPIC_OTHER = 6    # unassigned, U+137D - U+137F
+CLASS_ASCII_LETTER = 7
+CLASS_ASCII_DIGIT = 8
+CLASS_ASCII_PUNCT = 9
+CLASS_ARABIC = 10           # letters, U+0621 - U+064A
+CLASS_CHINESE = 11          # same as `is_chinese_char`
+
+CLASS_NAMES = (
+    "other",
+    "space",
+    "whitespace",
+    "ethiopic_letter",
+    "ethiopic_punct",
+    "ethiopic_digit",
+    "ethiopic_other",
+    "ascii_letter",
+    "ascii_digit",
+    "ascii_punct",
+    "arabic",
+    "chinese",
+)
+
+# The (first, last) codepoints of every class but `CLASS_OTHER`
+CLASS_RANGES: Dict[int, Tuple[Tuple[int, int], ...]] = {
+    CLASS_SPACE: ((0x20, 0x20),),
+    CLASS_WHITESPACE: ((0x09, 0x0D),),
+    CLASS_ETHIOPIC_LETTER: ((0x1200, 0x135F),),
+    CLASS_ETHIOPIC_PUNCT: ((0x1360, 0x1368),),
+    CLASS_ETHIOPIC_DIGIT: ((0x1369, 0x137C),),
+    CLASS_ETHIOPIC_OTHER: ((0x137D, 0x137F),),
+    CLASS_ASCII_LETTER: ((0x41, 0x5A), (0x61, 0x7A)),
+    CLASS_ASCII_DIGIT: ((0x30, 0x39),),
+    CLASS_ASCII_PUNCT: ((0x21, 0x2F), (0x3A, 0x40), (0x5B, 0x60), (0x7B, 0x7E)),
+    CLASS_ARABIC: ((0x0621, 0x064A),),
+    CLASS_CHINESE: (
+        (0x4E00, 0x9FFF),
+        (0x3400, 0x4DBF),
+        (0x20000, 0x2A6DF),
+        (0x2A700, 0x2B73F),
+        (0x2B740, 0x2B81F),
+        (0x2B820, 0x2CEAF),
+        (0xF900, 0xFAFF),
+        (0x2F800, 0x2FA1F),
+    ),
+}
+
+# The classes of the Ethiopic characters, kept by `remove_non_ethiopic` with the space
+ETHIOPIC_CLASSES = (CLASS_ETHIOPIC_LETTER, CLASS_ETHIOPIC_PUNCT, CLASS_ETHIOPIC_DIGIT, CLASS_ETHIOPIC_OTHER)
+
+# Shorter texts are filtered with a regex, encoding them for NumPy costs more than it saves
+NUMPY_MIN_LENGTH = 512
+
+_UNICODE_SIZE = 0x110000
+# Every selection of classes filtered keeps a table of 1.1 MB
+_MAX_CACHED_SELECTIONS = 8
+
+
+def _regex_class(classes: Iterable[int]) -> str:
+    """Returns the body of a regex character class matching the codepoints of `classes`."""
+    return "".join(
+        re.escape(chr(first)) if first == last else f"{re.escape(chr(first))}-{re.escape(chr(last))}"
+        for class_id in sorted(set(classes)) for first, last in CLASS_RANGES[class_id]
+    )
+
+
+def _check_classes(func_name: str, classes: Iterable[int]) -> Tuple[int, ...]:
+    classes = tuple(classes)
+    for class_id in classes:
+        if not 0 <= class_id < len(CLASS_NAMES):
+            raise ValueError(f"{func_name}: unknown class {class_id!r}, the classes are 0 to {len(CLASS_NAMES) - 1}")
+    return classes
+
+
+class CodepointClassifier(object):
+    """Classifies the codepoints of texts with NumPy.
+
+    A text is viewed as an array of UTF-32 codepoints and every codepoint is mapped to its class
+    through a lookup table of all Unicode codepoints, so a text is classified, counted or filtered
+    with a few array operations instead of a Python function call per character.
+
+    Example::
+
+        classifier = get_classifier()
+        text, counts = classifier.filter(text, drop=(CLASS_ETHIOPIC_DIGIT,), return_counts=True)
+        counts["ascii_letter"]
+    """
+    def __init__(self):
+        np = import_numpy()
+        if np is None:
+            raise ImportError("CodepointClassifier: needs `numpy`, install it with `pip install numpy`")
+        self._np = np
+        # One byte per codepoint, 1.1 MB
+        self.table = np.zeros(_UNICODE_SIZE, dtype=np.uint8)
+        for class_id, ranges in CLASS_RANGES.items():
+            for first, last in ranges:
+                self.table[first:last + 1] = class_id
+        # The kept classes and codepoints of the selections filtered so far, by (keep, drop)
+        self._keep_cache: Dict[Tuple, Tuple] = {}
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(classes={len(CLASS_NAMES)})"
+
+    def codepoints(self, text: str):
+        """ Returns the codepoints of a text, as a NumPy array of uint32.
+        """
+        try:
+            encoded = text.encode("utf-32-le")
+        except UnicodeEncodeError:
+            # Lone surrogates are codepoints too, of the `other` class
+            encoded = text.encode("utf-32-le", "surrogatepass")
+        return self._np.frombuffer(encoded, dtype=self._np.uint32)
+
+    def classify(self, text: str):
+        """ Returns the class of every codepoint of a text, as a NumPy array of uint8.
+        """
+        return self.table.take(self.codepoints(text))
+
+    def counts(self, text: str) -> Dict[str, int]:
+        """ Returns the number of codepoints of every class in a text, by class name.
+        """
+        return self._counts(self.classify(text))
+
+    def _counts(self, classes) -> Dict[str, int]:
+        counts = self._np.bincount(classes, minlength=len(CLASS_NAMES))
+        return dict(zip(CLASS_NAMES, counts.tolist()))
+
+    def _keep_tables(self, func_name: str, keep: Optional[Iterable[int]], drop: Optional[Iterable[int]]):
+        """Returns the boolean tables of the kept classes and of the kept codepoints."""
+        if (keep is None) == (drop is None):
+            raise ValueError(f"{func_name}: one of `keep` and `drop` must be passed")
+        key = (tuple(keep), None) if keep is not None else (None, tuple(drop))
+        tables = self._keep_cache.get(key)
+        if tables is None:
+            if keep is not None:
+                kept_classes = self._np.zeros(len(CLASS_NAMES), dtype=bool)
+                kept_classes[list(_check_classes(func_name, key[0]))] = True
+            else:
+                kept_classes = self._np.ones(len(CLASS_NAMES), dtype=bool)
+                kept_classes[list(_check_classes(func_name, key[1]))] = False
+            # A codepoint is then filtered with one lookup instead of two
+            tables = kept_classes, kept_classes.take(self.table)
+            if len(self._keep_cache) >= _MAX_CACHED_SELECTIONS:
+                self._keep_cache.clear()
+            self._keep_cache[key] = tables
+        return tables
+
+    def _filter(self, text: str, keep, drop, return_counts: bool, func_name: str):
+        """Returns the filtered codepoints and the classes of all the codepoints if `return_counts` is True."""
+        kept_classes, kept_codepoints = self._keep_tables(func_name, keep, drop)
+        codepoints = self.codepoints(text)
+        if return_counts:
+            classes = self.table.take(codepoints)
+            return codepoints[kept_classes.take(classes)], classes
+        return codepoints[kept_codepoints.take(codepoints)], None
+
+    def filter(
+        self,
+        text: str,
+        keep: Optional[Iterable[int]] = None,
+        drop: Optional[Iterable[int]] = None,
+        return_counts: bool = False
+    ) -> Union[str, Tuple[str, Dict[str, int]]]:
+        """ Removes the characters of some classes from a text.
+
+        Args:
+            text (str): input text
+            keep (Optional[Iterable[int]], optional): the classes kept, all others are removed.
+            drop (Optional[Iterable[int]], optional): the classes removed, all others are kept.
+            return_counts (bool, optional): also return the number of codepoints of every class
+                in `text`. Defaults to False.
+
+        Returns:
+            str: the filtered text, and the counts if `return_counts` is True.
+        """
+        codepoints, classes = self._filter(text, keep, drop, return_counts, "CodepointClassifier.filter")
+        filtered = codepoints.tobytes().decode("utf-32-le", "surrogatepass")
+        if return_counts:
+            return filtered, self._counts(classes)
+        return filtered
+
+    def filter_batch(
+        self,
+        texts: List[str],
+        keep: Optional[Iterable[int]] = None,
+        drop: Optional[Iterable[int]] = None,
+        return_counts: bool = False
+    ) -> Union[List[str], Tuple[List[str], Dict[str, int]]]:
+        """ Like :meth:`filter` for a batch of texts, classified and filtered as one array.
+        The counts are the totals of the batch.
+        """
+        np = self._np
+        kept_classes, kept_codepoints = self._keep_tables("CodepointClassifier.filter_batch", keep, drop)
+        codepoints = self.codepoints("".join(texts))
+        classes = None
+        if return_counts:
+            classes = self.table.take(codepoints)
+            mask = kept_classes.take(classes)
+        else:
+            mask = kept_codepoints.take(codepoints)
+        filtered = codepoints[mask].tobytes().decode("utf-32-le", "surrogatepass")
+
+        # Number of kept codepoints before the end of every text
+        ends = np.cumsum([len(text) for text in texts], dtype=np.int64)
+        kept_ends = np.concatenate(([0], np.cumsum(mask, dtype=np.int64)))[ends].tolist()
+        outputs = []
+        start = 0
+        for end in kept_ends:
+            outputs.append(filtered[start:end])
+            start = end
+        if return_counts:
+            return outputs, self._counts(classes)
+        return outputs
+
+
+_classifier: Optional[CodepointClassifier] = None
+_classifier_lock = threading.Lock()
+
+
+def get_classifier() -> Optional[CodepointClassifier]:
+    """ Returns the shared :class:`CodepointClassifier`, built on first use, or None without NumPy.
+    """
+    global _classifier
+    if _classifier is None and import_numpy() is not None:
+        with _classifier_lock:
+            if _classifier is None:
+                _classifier = CodepointClassifier()
+    return _classifier
+
+
+def filter_chars(text: str, keep: Optional[Iterable[int]] = None, drop: Optional[Iterable[int]] = None) -> str:
+    """ Removes the characters of some classes from a text, with NumPy for long texts when it is installed,
+    else with a regex.
+
+    Args:
+        text (str): input text
+        keep (Optional[Iterable[int]], optional): the classes kept, all others are removed.
+        drop (Optional[Iterable[int]], optional): the classes removed, all others are kept.
+
+    Returns:
+        str: the filtered text.
+    """
+    if len(text) >= NUMPY_MIN_LENGTH:
+        classifier = get_classifier()
+        if classifier is not None:
+            return classifier.filter(text, keep=keep, drop=drop)
+    return _filter_regex(
+        tuple(keep) if keep is not None else None,
+        tuple(drop) if drop is not None else None
+    ).sub("", text)
+
+
+_filter_regexes: Dict[Tuple, "re.Pattern"] = {}
+
+
+def _filter_regex(keep: Optional[Tuple[int, ...]], drop: Optional[Tuple[int, ...]]) -> "re.Pattern":
+    """Returns the regex matching the runs of removed characters, compiled once per selection."""
+    regex = _filter_regexes.get((keep, drop))
+    if regex is None:
+        if (keep is None) == (drop is None):
+            raise ValueError("filter_chars: one of `keep` and `drop` must be passed")
+        if keep is not None:
+            kept = set(_check_classes("filter_chars", keep))
+        else:
+            kept = set(range(len(CLASS_NAMES))) - set(_check_classes("filter_chars", drop))
+
+        if CLASS_OTHER in kept:
+            # The `other` class has no ranges, the other removed classes are matched
+            removed = [class_id for class_id in CLASS_RANGES if class_id not in kept]
+            regex = re.compile(f"[{_regex_class(removed)}]+" if removed else "(?!)")
+        else:
+            regex = re.compile(f"[^{_regex_class(kept)}]+" if kept else "(?s).+")
+        _filter_regexes[(keep, drop)] = regex
+    return regex
+
+
+def class_counts(text: str) -> Dict[str, int]:
+    """ Returns the number of characters of every class in a text, by class name, with NumPy when it is installed.
+    """
+    classifier = get_classifier()
+    if classifier is not None:
+        return classifier.counts(text)
+    counts = dict.fromkeys(CLASS_NAMES, 0)
+    for class_id in range(1, len(CLASS_NAMES)):
+        counts[CLASS_NAMES[class_id]] = sum(map(len, re.findall(f"[{_regex_class((class_id,))}]+", text)))
+    counts[CLASS_NAMES[CLASS_OTHER]] = len(text) - sum(counts.values())
+    return counts
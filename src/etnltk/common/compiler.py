@@ -0,0 +1,305 @@
+# coding=utf-8
+#
+# Standard libraries
+import re
+import time
+from functools import lru_cache, partial
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# etnltk libraries
+from .preprocessing import (
+    REGEX_PATTERN_URLS,
+    REGEX_PATTERN_TAGS,
+    REGEX_PATTERN_EMAIL,
+    SPECIAL_CHARACTERS,
+    _char_ranges,
+    _emoji_chars,
+    remove_links,
+    remove_tags,
+    remove_emojis,
+    remove_email,
+    remove_digits,
+    remove_english_chars,
+    remove_arabic_chars,
+    remove_chinese_chars,
+    remove_special_characters
+)
+
+from .ethiopic import (
+    remove_ethiopic_digits,
+    remove_ethiopic_punctuation,
+    remove_non_ethiopic
+)
+
+from .instrumentation import Instrumentation, get_instrumentation
+
+# Built-in stages that delete a pattern match.
+# Maps the function to (pattern, characters a match can start with).
+# When the first characters are unknown the value is `None`.
+PATTERN_STAGES = {
+    remove_links: (REGEX_PATTERN_URLS, None),
+    remove_tags: (REGEX_PATTERN_TAGS, None),
+    remove_email: (REGEX_PATTERN_EMAIL, r"a-z0-9._%+\-"),
+}
+
+# Built-in stages that delete single characters.
+# Maps the function to (character class, negated).
+# A negated class lists the characters that are *kept*.
+CHAR_STAGES = {
+    remove_special_characters: (re.escape(SPECIAL_CHARACTERS), False),
+    remove_digits: (r"\d", False),
+    remove_ethiopic_digits: (r"\u1369-\u137C", False),
+    remove_english_chars: (r"A-Za-z", False),
+    remove_arabic_chars: (r"\u0621-\u064A", False),
+    remove_chinese_chars: (
+        r"\u4E00-\u9FFF\u3400-\u4DBF\uF900-\uFAFF"
+        r"\U00020000-\U0002A6DF\U0002A700-\U0002B73F\U0002B740-\U0002B81F"
+        r"\U0002B820-\U0002CEAF\U0002F800-\U0002FA1F",
+        False
+    ),
+    remove_ethiopic_punctuation: (r"\u1360-\u1368", False),
+    remove_non_ethiopic: (r"\u1200-\u137F ", True),
+}
+
+# The characters a pipeline checks to be plain, i.e. matched by none of its stages: the prescan
+# of a text removes the runs of plain characters and only looks at the distinct characters left.
+_PLAIN_CANDIDATES = "".join(map(chr, [*range(0x09, 0x0E), *range(0x20, 0x7F), *range(0x1200, 0x1380)]))
+# Maximum number of characters whose prescan result is kept by a pipeline
+_MAX_CACHED_CHARS = 4096
+
+
+def _may_have_emojis(chars: str) -> Any:
+    return _emoji_chars()[1].search(chars)
+
+
+def _char_test(char_class: str, negated: bool) -> Callable[[str], Any]:
+    return re.compile(f"[^{char_class}]" if negated else f"[{char_class}]").search
+
+
+# The prescan tests of the built-in stages: (test of the distinct characters of a text,
+# literals one of which is in the text). A stage failing its test can't match the text.
+PRESCAN_TESTS: Dict[Callable, Tuple[Callable[[str], Any], Tuple[str, ...]]] = {
+    remove_links: (re.compile(r"[:w]").search, ("://", "www.")),
+    remove_tags: (re.compile(r"[<&]").search, ()),
+    remove_emojis: (_may_have_emojis, ()),
+    remove_email: (re.compile(r"@").search, ()),
+    **{stage: (_char_test(*char_stage), ()) for stage, char_stage in CHAR_STAGES.items()},
+}
+
+_GLOBAL_FLAGS = re.compile(r"^\(\?([imsx]+)\)")
+
+
+def _scoped(pattern: str) -> str:
+    """Turns leading global inline flags like ``(?x)`` into a scoped group,
+    so the pattern can be embedded inside a larger alternation.
+    """
+    flags = _GLOBAL_FLAGS.match(pattern)
+    if flags:
+        return f"(?{flags.group(1)}:{pattern[flags.end():]})"
+    return f"(?:{pattern})"
+
+
+class _Segment(object):
+    """A run of stages that can be executed by a single regex scan:
+    an optional pattern stage followed by any number of character stages.
+    """
+    def __init__(self, pattern_stage=None):
+        self.pattern_stage = pattern_stage
+        self.names: List[str] = []
+        self.chars: List[str] = []
+        self.negated: List[str] = []
+
+    def add_chars(self, name: str, char_class: str, negated: bool):
+        self.names.append(name)
+        if negated:
+            self.negated.append(char_class)
+        else:
+            self.chars.append(char_class)
+
+    def compile(self, count: bool = False) -> Callable[[str], str]:
+        """Returns the function deleting the matches, it also returns their number if `count` is True."""
+        alternatives = []
+        if self.chars:
+            alternatives.append("[{0}]".format("".join(self.chars)))
+        alternatives.extend("[^{0}]".format(char_class) for char_class in self.negated)
+        deleted = "|".join(alternatives)
+        if len(alternatives) > 1:
+            deleted = f"(?:{deleted})"
+
+        if self.pattern_stage is None:
+            regex = f"{deleted}+"
+        else:
+            pattern, first_chars = self.pattern_stage
+            regex = _scoped(pattern.pattern)
+            if deleted and first_chars:
+                # A run of deleted characters must stop where the pattern
+                # could start, otherwise it would swallow the start of a match.
+                regex += f"|{deleted}(?:(?![{first_chars}]){deleted})*"
+            elif deleted:
+                regex += f"|{deleted}"
+        compiled = re.compile(regex)
+        return partial(compiled.subn if count else compiled.sub, "")
+
+
+class CompiledPipeline(object):
+    """A preprocessing pipeline fused into as few scans over the text as possible.
+
+    Consecutive built-in stages from `etnltk.common.preprocessing` and `etnltk.common.ethiopic`
+    are merged into one combined regex, while any other callable runs unchanged.
+    The output is identical to running each function of the pipeline in order.
+
+    A text is prescanned first: the distinct characters it has besides Ethiopic syllables and spaces
+    tell which built-in stages can't match it, e.g. `remove_english_chars` without ASCII letters
+    or `remove_email` without ``@``. Those are skipped, a clean Ethiopic text runs almost no stage.
+    """
+    def __init__(self, pipeline: Sequence[Callable], prescan: bool = True):
+        """
+        Args:
+            pipeline (Sequence[Callable]): preprocessing functions, applied in order.
+            prescan (bool, optional): skip the built-in stages that can't match a text. Defaults to True.
+        """
+        self.pipeline: Tuple[Callable, ...] = tuple(pipeline)
+        # Stages after a custom callable always run, so there is nothing to skip if it is the first one
+        self.prescan = prescan and bool(self.pipeline) and self.pipeline[0] in PRESCAN_TESTS
+        # The prescan tests by stage bit, the bit of a stage is 1 << its index
+        self._char_tests: List[Tuple[int, Callable[[str], Any]]] = []
+        self._literals: List[Tuple[int, Tuple[str, ...]]] = []
+        self._always = 0
+        for index, stage in enumerate(self.pipeline):
+            if stage not in PRESCAN_TESTS:
+                self._always = (1 << len(self.pipeline)) - (1 << index)
+                break
+            test_chars, literals = PRESCAN_TESTS[stage]
+            self._char_tests.append((1 << index, test_chars))
+            if literals:
+                self._literals.append((1 << index, literals))
+        self._all = (1 << len(self.pipeline)) - 1
+        # The stages a character can be matched by, as a bit mask
+        self._char_masks: Dict[str, int] = {}
+        self._plain_chars = None
+        if self.prescan:
+            plain_chars = [char for char in _PLAIN_CANDIDATES if not self._char_mask(char)]
+            self._plain_chars = re.compile(f"[{_char_ranges(plain_chars)}]+")
+            self._char_masks.clear()
+        # The steps run for a text, by bit mask of the stages kept by the prescan
+        self._selected: Dict[int, List[Callable[[str], str]]] = {}
+        self.stages: List[Tuple[str, ...]] = []
+        self._steps: List[Callable[[str], str]] = []
+        # Every stage on its own, built when the pipeline is first run with the instrumentation enabled
+        self._instrumented_steps: Optional[List[Tuple[str, Callable, bool]]] = None
+
+        segment: Optional[_Segment] = None
+        for pipe_func in self.pipeline:
+            name = getattr(pipe_func, "__name__", repr(pipe_func))
+            if pipe_func in CHAR_STAGES:
+                if segment is None:
+                    segment = _Segment()
+                segment.add_chars(name, *CHAR_STAGES[pipe_func])
+                continue
+
+            self._add_segment(segment)
+            segment = None
+            if pipe_func in PATTERN_STAGES:
+                segment = _Segment(PATTERN_STAGES[pipe_func])
+                segment.names.append(name)
+            else:
+                self.stages.append((name,))
+                self._steps.append(pipe_func)
+        self._add_segment(segment)
+
+    def _add_segment(self, segment: Optional[_Segment]):
+        if segment is not None:
+            self.stages.append(tuple(segment.names))
+            self._steps.append(segment.compile())
+
+    def __call__(self, text: str) -> str:
+        instrumentation = get_instrumentation()
+        if instrumentation is not None:
+            return self._call_instrumented(text, instrumentation)
+        steps = self._steps
+        if self.prescan:
+            mask = self._prescan(text)
+            if mask != self._all:
+                steps = self._selected.get(mask)
+                if steps is None:
+                    kept = [stage for index, stage in enumerate(self.pipeline) if mask >> index & 1]
+                    steps = self._selected[mask] = CompiledPipeline(kept, prescan=False)._steps
+        for step in steps:
+            text = step(text)
+        return text
+
+    def _prescan(self, text: str) -> int:
+        """Returns the bit mask of the stages that can change the text, in one scan of the text."""
+        mask = self._always
+        char_masks = self._char_masks
+        for char in set(self._plain_chars.sub("", text)):
+            char_mask = char_masks.get(char)
+            if char_mask is None:
+                char_mask = self._char_mask(char)
+            mask |= char_mask
+        # A literal can be made by a deletion, it is only searched in the text before any stage runs
+        for bit, literals in self._literals:
+            if mask & bit and not mask & (bit - 1) and not any(literal in text for literal in literals):
+                mask &= ~bit
+        return mask
+
+    def _char_mask(self, char: str) -> int:
+        """Returns the bit mask of the stages a character can be matched by."""
+        char_mask = 0
+        for bit, test_chars in self._char_tests:
+            if test_chars(char):
+                char_mask |= bit
+        # Bounded, a text can have any character
+        if len(self._char_masks) < _MAX_CACHED_CHARS:
+            self._char_masks[char] = char_mask
+        return char_mask
+
+    def _call_instrumented(self, text: str, instrumentation: Instrumentation) -> str:
+        """Runs the stages one by one instead of fused, so each of them is measured. The output is the same."""
+        if self._instrumented_steps is None:
+            self._instrumented_steps = [_instrumented_step(pipe_func) for pipe_func in self.pipeline]
+        for name, step, counted in self._instrumented_steps:
+            start = time.perf_counter()
+            if counted:
+                output, replacements = step(text)
+            else:
+                output, replacements = step(text), 0
+            instrumentation.record(name, time.perf_counter() - start, len(text), len(output), replacements)
+            text = output
+        return text
+
+    def __repr__(self):
+        cls_name = self.__class__.__name__
+        stages = ", ".join("+".join(names) for names in self.stages)
+        return f"{cls_name}([{stages}])"
+
+
+def _instrumented_step(pipe_func: Callable) -> Tuple[str, Callable, bool]:
+    """Returns the name of a stage, the function running it alone and whether it counts its replacements."""
+    name = getattr(pipe_func, "__name__", repr(pipe_func))
+    if pipe_func in CHAR_STAGES:
+        segment = _Segment()
+        segment.add_chars(name, *CHAR_STAGES[pipe_func])
+    elif pipe_func in PATTERN_STAGES:
+        segment = _Segment(PATTERN_STAGES[pipe_func])
+    else:
+        return name, pipe_func, False
+    return name, segment.compile(count=True), True
+
+
+@lru_cache(maxsize=32)
+def _compile_pipeline(pipeline: Tuple[Callable, ...]) -> CompiledPipeline:
+    return CompiledPipeline(pipeline)
+
+
+def compile_pipeline(pipeline: Sequence[Callable]) -> CompiledPipeline:
+    """ Returns a :class:`CompiledPipeline` for a list of preprocessing functions.
+    Compiled pipelines are cached, so calling this for every text is cheap.
+
+    Args:
+        pipeline (Sequence[Callable]): preprocessing functions, applied in order.
+
+    Returns:
+        CompiledPipeline: callable that takes a text and returns the preprocessed text.
+    """
+    return _compile_pipeline(tuple(pipeline))
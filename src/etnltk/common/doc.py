@@ -1,13 +1,56 @@
-class Document(object):
-    def __init__(self, text, lang):
+# Standard libraries
+from abc import ABC, abstractmethod
+from bisect import bisect_right
+from functools import cached_property, partial
+from typing import Callable, Iterable, Iterator, List, Optional
+
+# etnltk libraries
+from .parallel import pipe
+from .utf8 import BUFFER_TYPES, ByteOffsets, decode_utf8
+from .vocab import FLAG_STOP
+from ..tokenize.wordpunct import TokenSpan, ethiopic_words
+
+# Used to load the language data of every worker before the first batch arrives
+_WARM_UP_TEXT = "ሰላም ለዓለም።"
+
+
+def make_document(cls, text, attrs=(), kwargs=None):
+    """Creates a document and computes the `attrs` annotations,
+    so they are computed in the worker process and not after the document is returned.
+    """
+    doc = cls(text, **(kwargs or {}))
+    for attr in attrs:
+        getattr(doc, attr)
+    return doc
+
+
+def _warm_up(make_doc: Callable):
+    try:
+        make_doc(_WARM_UP_TEXT)
+    except Exception:
+        pass
+
+
+class Document(ABC):
+    """The base class of the documents of a language, e.g. ``Amharic``.
+
+    A language implements the `tokens` and `words` annotations and the hooks analysing its texts,
+    the spans, sentences, :meth:`edit` and :meth:`append` are built on them.
+    """
+    def __init__(self, text, lang, errors="strict"):
+        if isinstance(text, BUFFER_TYPES):
+            # UTF-8 bytes, e.g. a slice of a memory-mapped file, are decoded once.
+            # The offsets of the annotations can be mapped back to them with `byte_offsets`.
+            text, self.__dict__["byte_offsets"] = decode_utf8(text, errors)
+
         self._text = text
         self._lang = lang
         self._sentences = []
 
-        if not isinstance(text, (str, bytes)):
+        if not isinstance(text, str):
             raise TypeError('The `text` argument passed to `__init__(text)` '
-                            f'must be a string, not {type(text)}')
-            
+                            f'must be a string or UTF-8 bytes, not {type(text)}')
+
         if not len(text.strip()):
             raise ValueError("Document: `text` can't be `Empty String`")
 
@@ -33,19 +76,299 @@ class Document(object):
     def doc(self):
         return self
 
-class Sentence(object):
-    def __init__(self, sentence, start_index=0, end_index=None, clean_sentence=None):
-        self.raw_sentence = sentence
-        self.start = self.start_index = start_index
-        self.end = self.end_index = end_index or len(sentence) - 1
-        self.sentence = clean_sentence
-    
+    @property
+    @abstractmethod
+    def tokens(self):
+        """The tokens of the document, a :class:`TokenTable`, implemented by the languages.
+        """
+
+    @property
+    @abstractmethod
+    def words(self):
+        """The words of the document, a :class:`TokenTable`, implemented by the languages.
+        """
+
+    @cached_property
+    def byte_offsets(self) -> ByteOffsets:
+        """Maps the offsets of `raw` to byte offsets in the UTF-8 bytes the document was created from,
+        or in the UTF-8 encoding of `raw`.
+        """
+        return ByteOffsets(self.raw)
+
+    @cached_property
+    def content_words(self) -> List:
+        """The words that are not stop words, read from the flags of the vocabulary.
+        """
+        return self.words.filter(exclude=FLAG_STOP)
+
+    def __getitem__(self, index):
+        """ ``doc[i]`` returns a token, ``doc[i:j]`` the :class:`Span` of the tokens from i to j.
+        """
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self.tokens))
+            if step != 1:
+                raise ValueError("Document: spans must be contiguous, slice step must be 1")
+            if start >= stop:
+                offset = self.tokens.starts[start] if start < len(self.tokens) else len(self.raw)
+                return Span(self, offset, offset)
+            return Span(self, self.tokens.starts[start], self.tokens.ends[stop - 1])
+        return self.tokens[index]
+
+    @abstractmethod
+    def _normalize_sentence(self, text):
+        """Returns the punctuation normalized text of a sentence, implemented by the languages.
+        """
+
+    @abstractmethod
+    def _clean_sentence(self, start, end):
+        """Returns the clean text of the sentence at offsets [start, end), implemented by the languages.
+        """
+
+    @abstractmethod
+    def _token_spans(self, text) -> List[TokenSpan]:
+        """Returns the (token, start, end) tuples of a text, implemented by the languages.
+        """
+
+    @abstractmethod
+    def _sentence_spans(self, text) -> List[TokenSpan]:
+        """Returns the (sentence, start, end) tuples of a text, implemented by the languages.
+        """
+
+    def edit(self, start: int, end: int, text: str) -> "Document":
+        """ Returns a new document where ``raw[start:end]`` is replaced by `text`.
+
+        The tokens, words and sentences already computed are updated instead of recomputed:
+        only the sentences around the change are analysed again, the offsets of the others are moved.
+        They are the same as the ones of a new document of the edited text.
+        The other annotations, e.g. `cleaned`, are computed again when they are accessed.
+
+        Args:
+            start (int): offset in `raw` of the first replaced character.
+            end (int): offset in `raw` after the last replaced character, `start` to only insert `text`.
+            text (str): the new text.
+
+        Returns:
+            Document: the edited document, this one is left unchanged.
+        """
+        raw = self.raw
+        if text is None:
+            raise ValueError("Document.edit: `text` can't be `None`")
+        if not 0 <= start <= end <= len(raw):
+            raise ValueError(f"Document.edit: [{start}, {end}) is not a range of a text of length {len(raw)}")
+        new_raw = raw[:start] + text + raw[end:]
+        shift = len(text) - (end - start)
+        doc = self._copy(new_raw)
+
+        analysed = self.__dict__
+        if not any(name in analysed for name in ("tokens", "words", "sentences")):
+            return doc
+
+        # The sentences from the one before the change to the one after it are analysed again.
+        # A sentence starts after the whitespace following a sentence punctuation mark, and the
+        # text up to a whitespace is normalized and tokenized the same whatever follows it.
+        sentences = self.sentences
+        starts = [sentence.start for sentence in sentences]
+        first = max(bisect_right(starts, start) - 2, 0)
+        last = bisect_right(starts, end) + 1
+        region_start = starts[first] if first else 0
+        region_end = starts[last] if last < len(starts) else len(raw)
+        region = new_raw[region_start:region_end + shift]
+
+        doc.__dict__["sentences"] = doc._sentences = (
+            [Sentence(doc, sentence.start, sentence.end) for sentence in sentences[:first]]
+            + [Sentence(doc, s + region_start, e + region_start) for _, s, e in doc._sentence_spans(region)]
+            + [Sentence(doc, sentence.start + shift, sentence.end + shift) for sentence in sentences[last:]]
+        )
+
+        if "tokens" in analysed:
+            tokens = doc._token_spans(region)
+            doc.__dict__["tokens"] = self.tokens.splice(
+                *self.tokens.index_range(region_start, region_end), tokens, offset=region_start, shift=shift
+            )
+            if "words" in analysed:
+                doc.__dict__["words"] = self.words.splice(
+                    *self.words.index_range(region_start, region_end), ethiopic_words(tokens),
+                    offset=region_start, shift=shift
+                )
+        return doc
+
+    def append(self, text: str) -> "Document":
+        """ Returns a new document with `text` added at the end, see :meth:`edit`.
+        """
+        return self.edit(len(self.raw), len(self.raw), text)
+
+    def _copy(self, text: str) -> "Document":
+        """Returns a document of the same class and options with another text, without its annotations."""
+        doc = self.__class__.__new__(self.__class__)
+        cls = type(self)
+        doc.__dict__.update({
+            name: value for name, value in self.__dict__.items()
+            if not isinstance(getattr(cls, name, None), cached_property)
+        })
+        Document.__init__(doc, text, self.lang)
+        return doc
+
+    @classmethod
+    def pipe(
+        cls,
+        texts: Iterable[str],
+        batch_size: int = 1000,
+        n_process: int = 1,
+        attrs: Iterable[str] = (),
+        error_handler: Optional[Callable] = None,
+        n_threads: int = 1,
+        **kwargs
+    ) -> Iterator["Document"]:
+        """ Process a stream of texts as documents, in batches and optionally in worker processes or threads.
+
+        Args:
+            texts (Iterable[str]): the texts to process.
+            batch_size (int, optional): number of texts sent to a worker at a time. Defaults to 1000.
+            n_process (int, optional): number of worker processes, -1 uses all CPUs. Defaults to 1.
+            attrs (Iterable[str], optional): annotations computed before a document is returned,
+                e.g. ``("words", "sentences")``. Defaults to ().
+            error_handler (Optional[Callable], optional): called as ``error_handler(text, error)``
+                for a text that can't be processed, its return value is yielded instead.
+                If not passed, `None` is yielded for that text. Defaults to None.
+            n_threads (int, optional): number of worker threads, used instead of worker processes,
+                -1 uses all CPUs. Defaults to 1.
+            **kwargs: passed to the document class, e.g. ``clean_text=False``.
+
+        Returns:
+            Iterator[Document]: the documents, in the order of `texts`.
+        """
+        make_doc = partial(make_document, cls, attrs=tuple(attrs), kwargs=kwargs)
+        return pipe(
+            make_doc,
+            texts,
+            batch_size=batch_size,
+            n_process=n_process,
+            error_handler=error_handler,
+            initializer=_warm_up,
+            initargs=(make_doc,),
+            n_threads=n_threads
+        )
+
+
+class Span(object):
+    """A slice of a document, stored as offsets in its raw text.
+    Its text, tokens and words are read from the document when they are accessed.
+    The words of an expanded short form share its offsets, a span has all or none of them.
+    """
+    __slots__ = ("doc", "start", "end")
+
+    def __init__(self, doc: "Document", start: int, end: int):
+        """
+        Args:
+            doc (Document): the parent document.
+            start (int): offset of the first character in ``doc.raw``.
+            end (int): offset after the last character in ``doc.raw``.
+        """
+        if not isinstance(doc, Document):
+            # Sentences used to be created from their text:
+            # `Sentence(sentence, start_index, end_index, clean_sentence)`
+            raise TypeError(f"{self.__class__.__name__}: `doc` must be a Document, not {type(doc)}, "
+                            "spans and sentences are created from the document they are part of")
+        self.doc = doc
+        self.start = start
+        self.end = end
+
+    def __repr__(self):
+        """Returns a string representation for debugging.
+        """
+        cls_name = self.__class__.__name__
+        return f'{cls_name}("{self.text}")'
+
+    def __str__(self):
+        return self.text
+
+    def __len__(self):
+        start, stop = self._token_range()
+        return stop - start
+
+    def __eq__(self, other):
+        if isinstance(other, Span):
+            return self.doc is other.doc and (self.start, self.end) == (other.start, other.end)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((id(self.doc), self.start, self.end))
+
+    def _token_range(self):
+        return self.doc.tokens.index_range(self.start, self.end)
+
+    @property
+    def start_index(self):
+        return self.start
+
+    @property
+    def end_index(self):
+        return self.end
+
+    @property
+    def byte_start(self):
+        """Offset of the first byte of the span in the UTF-8 bytes of the document, see `Document.byte_offsets`.
+        """
+        return self.doc.byte_offsets.byte_offset(self.start)
+
+    @property
+    def byte_end(self):
+        """Offset after the last byte of the span in the UTF-8 bytes of the document.
+        """
+        return self.doc.byte_offsets.byte_span(self.start, self.end)[1]
+
+    @property
+    def text(self):
+        """Returns the raw text of the span.
+        """
+        return self.doc.raw[self.start:self.end]
+
+    @property
+    def tokens(self):
+        """Returns the tokens starting in the span.
+        """
+        return self.doc.tokens[slice(*self._token_range())]
+
+    @property
+    def words(self):
+        """Returns the words starting in the span.
+        """
+        return self.doc.words[slice(*self.doc.words.index_range(self.start, self.end))]
+
+    @property
+    def dict(self):
+        """The dict representation of this span.
+        """
+        return {
+            'text': self.text,
+            'start_index': self.start_index,
+            'end_index': self.end_index,
+        }
+
+
+class Sentence(Span):
+    """A sentence of a document. Its raw and clean texts are built from the document when they are accessed.
+    """
+    __slots__ = ()
+
     def __repr__(self):
         """Returns a string representation for debugging.
         """
         cls_name = self.__class__.__name__
         return f'{cls_name}("{self.sentence}")'
-    
+
+    @property
+    def raw_sentence(self):
+        """Returns the punctuation normalized text of the sentence.
+        """
+        return self.doc._normalize_sentence(self.text)
+
+    @property
+    def sentence(self):
+        """Returns the clean text of the sentence, its ethiopic words joined by spaces.
+        """
+        return self.doc._clean_sentence(self.start, self.end)
+
     @property
     def dict(self):
         """The dict representation of this sentence.
@@ -57,14 +380,23 @@ class Sentence(object):
             'end_index': self.end_index,   
         }
 
+
 class Word(str):
+    # No instance `__dict__`, a word is only its string
+    __slots__ = ()
+
     def __new__(cls, string):
         """Return a new instance of the class.
         """
         return super(Word, cls).__new__(cls, string)
-    
-    def __init__(self, string):
-        self._string = string
+
+    @property
+    def _string(self):
+        return str.__str__(self)
+
+    def __reduce__(self):
+        # Pickles as the plain string
+        return self.__class__, (self._string,)
 
     def __repr__(self):
         return repr(self._string)
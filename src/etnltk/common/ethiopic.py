@@ -5,6 +5,7 @@ import re
 import unicodedata
 
 # etnltk libraries
+from .charclass import CLASS_ETHIOPIC_DIGIT, CLASS_SPACE, ETHIOPIC_CLASSES, filter_chars
 from .utils import (
     merge_chars,
     split_chars,
@@ -63,10 +64,7 @@ def is_special_punct(char) -> bool:
 def remove_ethiopic_digits(text):
     """Remove all ethiopic digits from a text string
     """
-    output = [
-        char for char in text if not is_ethiopic_digit(char)
-    ]
-    return "".join(output)
+    return filter_chars(text, drop=(CLASS_ETHIOPIC_DIGIT,))
 
 
 def remove_ethiopic_punctuation(text: str) -> str:
@@ -78,5 +76,4 @@ def remove_ethiopic_punctuation(text: str) -> str:
 def remove_non_ethiopic(text: str):
     """Remove non ethioipc characters from a text string
     """
-    ethiopic_only = "".join([char for char in text if (is_ethiopic(char) or ord(char) == 32)])
-    return ethiopic_only
+    return filter_chars(text, keep=ETHIOPIC_CLASSES + (CLASS_SPACE,))
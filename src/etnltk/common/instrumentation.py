@@ -0,0 +1,185 @@
+# coding=utf-8
+#
+# Standard libraries
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Dict, Iterator, List, Optional
+
+# etnltk libraries
+
+# Exported metrics: attribute of `StageStats`, metric name, help text
+_METRICS = (
+    ("calls", "stage_calls_total", "Number of calls of a text processing stage."),
+    ("seconds", "stage_seconds_total", "Wall time spent in a text processing stage, in seconds."),
+    ("chars_in", "stage_input_chars_total", "Number of characters given to a text processing stage."),
+    ("chars_out", "stage_output_chars_total", "Number of characters returned by a text processing stage."),
+    ("replacements", "stage_replacements_total", "Number of matches removed or replaced by a text processing stage."),
+)
+
+
+class StageStats(object):
+    """The aggregated measures of one stage."""
+    __slots__ = ("calls", "seconds", "chars_in", "chars_out", "replacements")
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.chars_in = 0
+        self.chars_out = 0
+        self.replacements = 0
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.as_dict()})"
+
+    def as_dict(self) -> Dict[str, float]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class Instrumentation(object):
+    """Records the wall time, calls, input and output characters and replacements of every stage
+    of the cleaning pipelines and of the normalizers, while it is enabled.
+
+    The stages are named after their function: ``remove_links`` for a stage of a pipeline,
+    ``am.normalize_punct`` for a function of a language, ``clean_amharic`` for the whole cleaning.
+    The replacements are only counted for the built-in stages and the normalizers.
+
+    Example::
+
+        with instrument() as stats:
+            for text in texts:
+                clean_amharic(text)
+        print(stats.as_dict()["remove_links"]["seconds"])
+    """
+    def __init__(self, callbacks: Optional[List[Callable]] = None):
+        """
+        Args:
+            callbacks (Optional[List[Callable]], optional): called as
+                ``callback(stage, seconds, chars_in, chars_out, replacements)`` after every measured call.
+        """
+        self.stages: Dict[str, StageStats] = {}
+        self.callbacks: List[Callable] = list(callbacks or ())
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(stages={list(self.stages)})"
+
+    def add_callback(self, callback: Callable) -> None:
+        """ Registers a function called after every measured call, e.g. to feed another metrics system.
+        """
+        self.callbacks.append(callback)
+
+    def record(self, stage: str, seconds: float, chars_in: int, chars_out: int, replacements: int = 0) -> None:
+        """ Adds the measures of one call of a stage.
+        """
+        with self._lock:
+            stats = self.stages.get(stage)
+            if stats is None:
+                stats = self.stages[stage] = StageStats()
+            stats.calls += 1
+            stats.seconds += seconds
+            stats.chars_in += chars_in
+            stats.chars_out += chars_out
+            stats.replacements += replacements
+        for callback in self.callbacks:
+            callback(stage, seconds, chars_in, chars_out, replacements)
+
+    def call(self, stage: str, func: Callable, text: str, *args, **kwargs):
+        """ Calls ``func(text, *args, **kwargs)`` and records it, the replacements are not counted.
+        """
+        start = time.perf_counter()
+        output = func(text, *args, **kwargs)
+        self.record(stage, time.perf_counter() - start, len(text), _length(output))
+        return output
+
+    def reset(self) -> None:
+        with self._lock:
+            self.stages.clear()
+
+    def as_dict(self) -> Dict[str, Dict[str, float]]:
+        """ Returns the measures of every stage, as ``{stage: {"calls": ..., "seconds": ..., ...}}``.
+        """
+        with self._lock:
+            return {stage: stats.as_dict() for stage, stats in self.stages.items()}
+
+    def to_prometheus(self, prefix: str = "etnltk") -> str:
+        """ Returns the measures in the Prometheus text exposition format, one counter per measure
+        with a ``stage`` label.
+        """
+        stages = self.as_dict()
+        lines = []
+        for attr, name, help_text in _METRICS:
+            metric = f"{prefix}_{name}"
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} counter")
+            for stage, stats in stages.items():
+                lines.append(f'{metric}{{stage="{_escape_label(stage)}"}} {stats[attr]}')
+        return "\n".join(lines) + "\n"
+
+
+def _length(output) -> int:
+    """Number of characters of the output of a stage: a text, a list of words or a (text, alignment) pair."""
+    if isinstance(output, str):
+        return len(output)
+    if isinstance(output, tuple):
+        return _length(output[0])
+    return sum(map(len, output))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+# The active instrumentation, None when it is disabled
+_instrumentation: Optional[Instrumentation] = None
+
+
+def enable_instrumentation(instrumentation: Optional[Instrumentation] = None) -> Instrumentation:
+    """ Starts recording the stages in `instrumentation`, or in a new one, for all threads.
+
+    Returns:
+        Instrumentation: the active instrumentation, to read its measures.
+    """
+    global _instrumentation
+    _instrumentation = instrumentation if instrumentation is not None else Instrumentation()
+    return _instrumentation
+
+
+def disable_instrumentation() -> None:
+    """ Stops recording the stages.
+    """
+    global _instrumentation
+    _instrumentation = None
+
+
+def get_instrumentation() -> Optional[Instrumentation]:
+    """ Returns the active instrumentation, None when it is disabled.
+    """
+    return _instrumentation
+
+
+@contextmanager
+def instrument(instrumentation: Optional[Instrumentation] = None) -> Iterator[Instrumentation]:
+    """ Records the stages inside a ``with`` block, the previous instrumentation is restored after it.
+    """
+    global _instrumentation
+    previous = _instrumentation
+    try:
+        yield enable_instrumentation(instrumentation)
+    finally:
+        _instrumentation = previous
+
+
+def instrumented(stage: str) -> Callable[[Callable], Callable]:
+    """ Decorator recording the calls of a function as `stage` while the instrumentation is enabled.
+    """
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(text, *args, **kwargs):
+            instrumentation = _instrumentation
+            if instrumentation is None:
+                return func(text, *args, **kwargs)
+            return instrumentation.call(stage, func, text, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,266 @@
+# coding=utf-8
+#
+# Standard libraries
+from contextlib import contextmanager
+from functools import partial
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+# etnltk libraries
+from .compiler import compile_pipeline
+from .doc import Document, _warm_up
+from .parallel import pipe
+
+# The kinds of components:
+# a `text` component takes and returns a text, it cleans or normalizes the `cleaned` text of a document,
+# a `doc` component takes a document and computes some of its annotations.
+COMPONENT_KINDS = ("text", "doc")
+
+
+def _annotate(attrs: Tuple[str, ...], doc: Document) -> None:
+    for attr in attrs:
+        getattr(doc, attr)
+
+
+# The built-in document components, they compute the annotations the documents otherwise compute on first access
+tokenizer = partial(_annotate, ("tokens", "words"))
+sentencizer = partial(_annotate, ("sentences",))
+stopwords = partial(_annotate, ("content_words",))
+
+
+class Language(object):
+    """The processing pipeline of a language, like the `nlp` object of spaCy: calling it on a text
+    returns a document annotated by its components.
+
+    Every component has a name and can be disabled, for the pipeline or for a call, so a service only
+    pays for the annotations it uses. A component can require other components, whose annotations it reads:
+    it is disabled as well when one of them is disabled or removed, e.g. `stopwords` without `tokenizer`. The enabled `text` components run first, in order, on the raw text
+    and their result is the `cleaned` text of the document. The consecutive built-in cleaners among them
+    are fused into one scan, see :func:`compile_pipeline`. The enabled `doc` components then run in order.
+    The annotations of disabled `doc` components are computed on their first access, as in any document.
+
+    Example::
+
+        nlp = etnltk.load("am")
+        doc = nlp(text, disable=["tokenizer", "stopwords"])
+
+        with nlp.select_pipes(enable=["sentencizer"]):
+            docs = list(nlp.pipe(texts))
+    """
+    def __init__(self, lang: str, make_doc: Callable[[str], Document]):
+        """
+        Args:
+            lang (str): language code, e.g. ``am``.
+            make_doc (Callable[[str], Document]): creates the document of a text, e.g. ``Amharic``.
+        """
+        self.lang = lang
+        self.make_doc = make_doc
+        self._components: List[Tuple[str, Callable, str]] = []
+        self._disabled: Set[str] = set()
+        self._requires: Dict[str, Tuple[str, ...]] = {}
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(lang={self.lang!r}, pipe_names={self.pipe_names})"
+
+    @property
+    def component_names(self) -> List[str]:
+        """The names of all the components, in order."""
+        return [name for name, _, _ in self._components]
+
+    @property
+    def pipe_names(self) -> List[str]:
+        """The names of the enabled components, in order."""
+        disabled = self._with_dependants(self._disabled)
+        return [name for name, _, _ in self._components if name not in disabled]
+
+    @property
+    def disabled(self) -> List[str]:
+        """The names of the disabled components, in order, including the ones whose requirements are disabled."""
+        disabled = self._with_dependants(self._disabled)
+        return [name for name, _, _ in self._components if name in disabled]
+
+    def has_pipe(self, name: str) -> bool:
+        return name in self.component_names
+
+    def get_pipe(self, name: str) -> Callable:
+        """ Returns the function of a component.
+        """
+        return self._components[self._index(name)][1]
+
+    def add_pipe(
+        self,
+        name: str,
+        component: Callable,
+        kind: str = "doc",
+        before: Optional[str] = None,
+        after: Optional[str] = None,
+        disabled: bool = False,
+        requires: Sequence[str] = ()
+    ) -> Callable:
+        """ Adds a component, by default at the end of the pipeline.
+
+        Args:
+            name (str): unique name of the component.
+            component (Callable): for a `text` component a function returning a cleaned copy of a text,
+                for a `doc` component a function computing annotations of a document.
+                Must be picklable to use :meth:`pipe` with several processes.
+            kind (str, optional): "text" or "doc". Defaults to "doc".
+            before (Optional[str], optional): name of the component it is inserted before. Defaults to None.
+            after (Optional[str], optional): name of the component it is inserted after. Defaults to None.
+            disabled (bool, optional): add it disabled, it runs once enabled. Defaults to False.
+            requires (Sequence[str], optional): names of the components computing the annotations it reads,
+                it only runs when they all run. Defaults to ().
+
+        Returns:
+            Callable: the component.
+        """
+        if kind not in COMPONENT_KINDS:
+            raise ValueError(f"Language.add_pipe: `kind` must be one of {COMPONENT_KINDS}, not {kind!r}")
+        if self.has_pipe(name):
+            raise ValueError(f"Language.add_pipe: there is already a component named {name!r}")
+        if before is not None and after is not None:
+            raise ValueError("Language.add_pipe: only one of `before` and `after` can be passed")
+
+        if before is not None:
+            index = self._index(before)
+        elif after is not None:
+            index = self._index(after) + 1
+        else:
+            index = len(self._components)
+        self._components.insert(index, (name, component, kind))
+        if requires:
+            self._requires[name] = tuple(requires)
+        if disabled:
+            self._disabled.add(name)
+        return component
+
+    def remove_pipe(self, name: str) -> Callable:
+        """ Removes a component, returns its function.
+        """
+        _, component, _ = self._components.pop(self._index(name))
+        self._disabled.discard(name)
+        self._requires.pop(name, None)
+        return component
+
+    def disable_pipe(self, name: str) -> None:
+        self._index(name)
+        self._disabled.add(name)
+
+    def enable_pipe(self, name: str) -> None:
+        self._index(name)
+        self._disabled.discard(name)
+
+    @contextmanager
+    def select_pipes(self, disable: Optional[Iterable[str]] = None, enable: Optional[Iterable[str]] = None):
+        """ Disables components inside a ``with`` block: the `disable` ones, or all but the `enable` ones,
+        which are enabled even if they are disabled by default. The previous selection is restored after it.
+        """
+        if (disable is None) == (enable is None):
+            raise ValueError("Language.select_pipes: one of `disable` and `enable` must be passed")
+        previous = set(self._disabled)
+        if enable is not None:
+            enable = self._check_names(enable)
+            self._disabled = {name for name in self.component_names if name not in enable}
+        else:
+            self._disabled.update(self._check_names(disable))
+        try:
+            yield self
+        finally:
+            self._disabled = previous
+
+    def _index(self, name: str) -> int:
+        for index, (component_name, _, _) in enumerate(self._components):
+            if component_name == name:
+                return index
+        raise ValueError(f"Language: no component named {name!r}, the components are {self.component_names}")
+
+    def _with_dependants(self, disabled: Set[str]) -> Set[str]:
+        """Returns the disabled components and the ones requiring a disabled or missing component."""
+        if not self._requires:
+            return disabled
+        disabled = set(disabled)
+        names = set(self.component_names)
+        # A component can require one defined after it, so it loops until nothing changes
+        changed = True
+        while changed:
+            changed = False
+            for name, requires in self._requires.items():
+                if name not in disabled and any(r in disabled or r not in names for r in requires):
+                    disabled.add(name)
+                    changed = True
+        return disabled
+
+    def _check_names(self, names: Iterable[str]) -> Set[str]:
+        names = {names} if isinstance(names, str) else set(names)
+        for name in names:
+            self._index(name)
+        return names
+
+    def _components_to_run(self, disable: Sequence[str] = ()) -> Tuple[Callable, List[Callable]]:
+        """Returns the fused enabled `text` components and the enabled `doc` components."""
+        disabled = self._disabled.union(self._check_names(disable)) if disable else self._disabled
+        disabled = self._with_dependants(disabled)
+        texts, docs = [], []
+        for name, component, kind in self._components:
+            if name not in disabled:
+                (texts if kind == "text" else docs).append(component)
+        return compile_pipeline(texts), docs
+
+    def __call__(self, text: str, disable: Sequence[str] = ()) -> Document:
+        """ Returns the document of a text, annotated by the enabled components.
+
+        Args:
+            text (str): the raw text.
+            disable (Sequence[str], optional): names of components disabled for this call. Defaults to ().
+
+        Returns:
+            Document: the document, e.g. an ``Amharic`` document.
+        """
+        text_pipeline, doc_components = self._components_to_run(disable)
+        return self._process(text_pipeline, doc_components, text)
+
+    def _process(self, text_pipeline: Callable, doc_components: List[Callable], text: str) -> Document:
+        doc = self.make_doc(text)
+        # `raw` and not `text`, that can be UTF-8 bytes
+        doc.cleaned = text_pipeline(doc.raw)
+        for component in doc_components:
+            component(doc)
+        return doc
+
+    def pipe(
+        self,
+        texts: Iterable[str],
+        batch_size: int = 1000,
+        n_process: int = 1,
+        disable: Sequence[str] = (),
+        error_handler: Optional[Callable] = None,
+        n_threads: int = 1
+    ) -> Iterator[Document]:
+        """ Process a stream of texts, in batches and optionally in worker processes or threads,
+        see `etnltk.common.parallel.pipe`.
+
+        Args:
+            texts (Iterable[str]): the texts to process.
+            batch_size (int, optional): number of texts sent to a worker at a time. Defaults to 1000.
+            n_process (int, optional): number of worker processes, -1 uses all CPUs. Defaults to 1.
+            disable (Sequence[str], optional): names of components disabled for these texts. Defaults to ().
+            error_handler (Optional[Callable], optional): called as ``error_handler(text, error)``
+                for a text that can't be processed, its return value is yielded instead.
+                If not passed, `None` is yielded for that text. Defaults to None.
+            n_threads (int, optional): number of worker threads, used instead of worker processes,
+                -1 uses all CPUs. Defaults to 1.
+
+        Returns:
+            Iterator[Document]: the documents, in the order of `texts`.
+        """
+        text_pipeline, doc_components = self._components_to_run(disable)
+        return pipe(
+            partial(self._process, text_pipeline, doc_components),
+            texts,
+            batch_size=batch_size,
+            n_process=n_process,
+            error_handler=error_handler,
+            initializer=_warm_up,
+            initargs=(self.make_doc,),
+            n_threads=n_threads
+        )
+
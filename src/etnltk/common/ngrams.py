@@ -0,0 +1,207 @@
+# coding=utf-8
+#
+# Standard libraries
+from array import array
+from collections import Counter, defaultdict
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+# etnltk libraries
+from .utils import import_numpy
+
+# Ids buffered before the n-grams are counted with NumPy
+DEFAULT_BUFFER_SIZE = 1 << 20
+
+# Separates the word sequences in the buffer, n-grams containing it are not counted
+_SEPARATOR = -1
+
+
+def iter_ngrams(words: Sequence, n: int = 2) -> Iterator[Tuple]:
+    """ Yields the n-grams (tuples of n successive words) of `words`, without building a list.
+    """
+    if n <= 0:
+        return iter(())
+    return zip(*(islice(words, i, None) for i in range(n)))
+
+
+class NgramCounter(object):
+    """Counts the n-grams of one or several orders over many word sequences.
+
+    Words are encoded as integer ids, n-grams never cross two sequences. With NumPy, the ids are
+    buffered and the n-grams of every order are counted as sliding windows over the buffer,
+    each window packed into one integer; without it, tuples of ids are counted.
+
+    Example::
+
+        counter = NgramCounter(orders=(1, 2, 3))
+        for doc in docs:
+            counter.update(doc.words)
+        trigram_counts = counter.counts(3)
+    """
+    def __init__(self, orders: Union[int, Sequence[int]] = 2, use_numpy: Optional[bool] = None,
+                 buffer_size: int = DEFAULT_BUFFER_SIZE):
+        """
+        Args:
+            orders (Union[int, Sequence[int]], optional): the n of the n-grams to count. Defaults to 2.
+            use_numpy (Optional[bool], optional): count with NumPy, by default when it is installed.
+            buffer_size (int, optional): number of ids buffered before they are counted with NumPy.
+        """
+        if isinstance(orders, int):
+            orders = (orders,)
+        self.orders = tuple(sorted({n for n in orders if n > 0}))
+
+        self._np = import_numpy() if use_numpy in (None, True) else None
+        if use_numpy and self._np is None:
+            raise ImportError("NgramCounter: `use_numpy=True` needs `numpy`, install it with `pip install numpy`")
+
+        # Word -> id and id -> word
+        self.vocab: Dict[str, int] = {}
+        self.words: List[str] = []
+
+        self.buffer_size = buffer_size
+        self._buffer = array("q")
+        # With NumPy: n -> (unique n-grams as an (m, n) array of ids, their counts); else n -> Counter
+        self._counts = {n: None if self._np is not None else Counter() for n in self.orders}
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(orders={self.orders}, vocab_size={len(self.words)})"
+
+    def encode(self, words: Iterable[str]) -> List[int]:
+        """ Returns the ids of `words`, new words are added to the vocabulary.
+        """
+        vocab = self.vocab
+        ids = []
+        for word in words:
+            word_id = vocab.get(word)
+            if word_id is None:
+                word_id = vocab[word] = len(self.words)
+                self.words.append(str(word))
+            ids.append(word_id)
+        return ids
+
+    def update(self, words: Iterable[str]) -> "NgramCounter":
+        """ Counts the n-grams of a word sequence, e.g. the words of a document.
+        """
+        ids = self.encode(words)
+        if self._np is None:
+            for n, counts in self._counts.items():
+                counts.update(iter_ngrams(ids, n))
+            return self
+
+        self._buffer.extend(ids)
+        self._buffer.append(_SEPARATOR)
+        if len(self._buffer) >= self.buffer_size:
+            self._flush()
+        return self
+
+    def _flush(self):
+        np = self._np
+        if not self._buffer:
+            return
+        ids = np.frombuffer(self._buffer, dtype=np.int64)
+        # Number of separators up to every position, to find the windows without separator
+        separators = np.concatenate([[0], np.cumsum(ids == _SEPARATOR)])
+        base = len(self.words) + 1
+        for n in self.orders:
+            if len(ids) < n:
+                continue
+            windows = np.lib.stride_tricks.sliding_window_view(ids, n)
+            windows = windows[separators[n:] == separators[:len(ids) - n + 1]]
+            grams, counts = self._reduce(windows, None, base)
+            if self._counts[n] is not None:
+                previous_grams, previous_counts = self._counts[n]
+                grams, counts = self._reduce(
+                    np.concatenate([previous_grams, grams]), np.concatenate([previous_counts, counts]), base
+                )
+            self._counts[n] = grams, counts
+        self._buffer = array("q")
+
+    def _reduce(self, grams, counts, base):
+        """Sums the counts of the identical rows of `grams`, every row counts once if `counts` is None."""
+        np = self._np
+        n = grams.shape[1]
+        if not len(grams):
+            return np.zeros((0, n), dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+        if base ** n >= 2 ** 63:
+            order = np.lexsort(grams.T[::-1])
+            sorted_grams = grams[order]
+            # First row of every run of identical n-grams
+            starts = np.flatnonzero(np.concatenate([[True], (sorted_grams[1:] != sorted_grams[:-1]).any(axis=1)]))
+            if counts is None:
+                return sorted_grams[starts], np.diff(np.append(starts, len(grams)))
+            return sorted_grams[starts], np.add.reduceat(counts[order], starts)
+
+        # Every n-gram packed into one integer
+        keys = np.zeros(len(grams), dtype=np.int64)
+        for column in range(n):
+            keys = keys * base + grams[:, column]
+        if counts is None:
+            sorted_keys = np.sort(keys)
+            starts = np.flatnonzero(np.concatenate([[True], sorted_keys[1:] != sorted_keys[:-1]]))
+            counts = np.diff(np.append(starts, len(keys)))
+        else:
+            order = np.argsort(keys)
+            sorted_keys = keys[order]
+            starts = np.flatnonzero(np.concatenate([[True], sorted_keys[1:] != sorted_keys[:-1]]))
+            counts = np.add.reduceat(counts[order], starts)
+
+        # Unpacked back into rows of ids
+        keys = sorted_keys[starts]
+        grams = np.empty((len(keys), n), dtype=np.int64)
+        for column in range(n - 1, -1, -1):
+            keys, grams[:, column] = np.divmod(keys, base)
+        return grams, counts
+
+    def arrays(self, n: int):
+        """ Returns the counted n-grams of order `n` as ids, and their counts.
+
+        Returns:
+            With NumPy, an ``(m, n)`` array of word ids and an array of m counts,
+            else a list of tuples of ids and a list of counts.
+        """
+        if n not in self._counts:
+            raise ValueError(f"NgramCounter: order {n} is not counted, `orders` are {self.orders}")
+        if self._np is None:
+            counts = self._counts[n]
+            return list(counts.keys()), list(counts.values())
+
+        np = self._np
+        self._flush()
+        if self._counts[n] is None:
+            return np.zeros((0, n), dtype=np.int64), np.zeros(0, dtype=np.int64)
+        return self._counts[n]
+
+    def items(self, n: int) -> Iterator[Tuple[Tuple[str, ...], int]]:
+        """ Yields the (n-gram, count) pairs of order `n`, the n-grams are decoded when they are yielded.
+        """
+        grams, counts = self.arrays(n)
+        if self._np is not None:
+            grams, counts = grams.tolist(), counts.tolist()
+        words = self.words
+        for gram, count in zip(grams, counts):
+            yield tuple([words[word_id] for word_id in gram]), count
+
+    def counts(self, n: int) -> Dict[Tuple[str, ...], int]:
+        """ Returns a dict of the n-grams of order `n` and their frequencies.
+        """
+        return dict(self.items(n))
+
+
+def count_ngrams(words: Iterable[str], n: Union[int, Sequence[int]] = 2,
+                 use_numpy: Optional[bool] = None) -> Dict:
+    """ Counts the n-grams of a word sequence.
+
+    Args:
+        words (Iterable[str]): the words, e.g. ``doc.words``.
+        n (Union[int, Sequence[int]], optional): the order, or several orders. Defaults to 2.
+        use_numpy (Optional[bool], optional): count with NumPy, by default when it is installed.
+
+    Returns:
+        Dict: a ``defaultdict(int)`` of the n-grams (tuples of n successive words) and their frequencies,
+            by order if several orders are passed.
+    """
+    counter = NgramCounter(n, use_numpy=use_numpy).update(words)
+    if isinstance(n, int):
+        return defaultdict(int, counter.items(n) if n > 0 else ())
+    return {order: defaultdict(int, counter.items(order)) for order in counter.orders}
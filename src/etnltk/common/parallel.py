@@ -0,0 +1,156 @@
+# coding=utf-8
+#
+# Standard libraries
+import os
+from collections import deque
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+
+def batched(items: Iterable, batch_size: int) -> Iterator[List]:
+    """Splits `items` into lists of `batch_size` items, without reading ahead.
+    """
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def raise_error(item, error: Exception):
+    """An `error_handler` of :func:`pipe` that raises the error of a failing item instead of yielding a value."""
+    raise error
+
+
+def process_batch(func: Callable, batch: List) -> List[Tuple[bool, Any]]:
+    """Applies `func` to every item of a batch.
+    Errors are returned per item, so one bad item does not fail the whole batch.
+    """
+    results = []
+    for item in batch:
+        try:
+            results.append((True, func(item)))
+        except Exception as error:
+            results.append((False, error))
+    return results
+
+
+def handle_results(batch: List, results: List[Tuple[bool, Any]], error_handler: Optional[Callable]) -> Iterator:
+    """Yields the results of :func:`process_batch`, the ones of failing items given by `error_handler`.
+    """
+    for item, (ok, result) in zip(batch, results):
+        if ok:
+            yield result
+        elif error_handler is None:
+            yield None
+        else:
+            yield error_handler(item, result)
+
+
+def pipe(
+    func: Callable,
+    items: Iterable,
+    batch_size: int = 1000,
+    n_process: int = 1,
+    error_handler: Optional[Callable] = None,
+    initializer: Optional[Callable] = None,
+    initargs: tuple = (),
+    n_threads: int = 1
+) -> Iterator:
+    """ Applies `func` to a stream of items, in batches and optionally in worker processes or threads.
+    Results are yielded in input order. Only a few batches per worker are kept in memory at a time.
+
+    Worker threads share the language data of the process and nothing is pickled. The cleaners,
+    tokenizers and documents of etnltk can be used from several threads at a time and give the same
+    output as in one thread. With the GIL, threads only run Python code one at a time, they pay off
+    on free-threaded Python builds or next to work that releases the GIL, e.g. I/O.
+
+    Args:
+        func (Callable): function applied to every item, must be picklable when `n_process` > 1.
+        items (Iterable): the input stream, e.g. texts.
+        batch_size (int, optional): number of items sent to a worker at a time. Defaults to 1000.
+        n_process (int, optional): number of worker processes, -1 uses all CPUs. Defaults to 1.
+        error_handler (Optional[Callable], optional): called as ``error_handler(item, error)``
+            when `func` raises, its return value is yielded instead.
+            If not passed, `None` is yielded for the failing item. Defaults to None.
+        initializer (Optional[Callable], optional): called once as ``initializer(*initargs)``
+            in every worker when it starts, e.g. to load language data. Defaults to None.
+        initargs (tuple, optional): arguments for `initializer`. Defaults to ().
+        n_threads (int, optional): number of worker threads, used instead of worker processes,
+            -1 uses all CPUs. `initializer` is then called once in every thread. Defaults to 1.
+
+    Returns:
+        Iterator: results of `func`, in the order of `items`.
+    """
+    if batch_size < 1:
+        raise ValueError(f"pipe: `batch_size` must be positive, not {batch_size}")
+
+    if n_process == -1:
+        n_process = os.cpu_count() or 1
+    if n_threads == -1:
+        n_threads = os.cpu_count() or 1
+    if n_process > 1 and n_threads > 1:
+        raise ValueError("pipe: only one of `n_process` and `n_threads` can be greater than 1")
+
+    if n_threads > 1:
+        return _thread_pipe(func, batched(items, batch_size), n_threads, error_handler, initializer, initargs)
+    return _pipe(func, batched(items, batch_size), n_process, error_handler, initializer, initargs)
+
+
+def _pipe(func, batches, n_process, error_handler, initializer, initargs) -> Iterator:
+    if n_process <= 1:
+        for batch in batches:
+            yield from handle_results(batch, process_batch(func, batch), error_handler)
+        return
+
+    # Only imported when worker processes are used, `multiprocessing` is slow to import
+    import multiprocessing
+
+    # The workers stay alive for the whole stream,
+    # so language data is loaded once per worker and not once per batch.
+    with multiprocessing.Pool(n_process, initializer=initializer, initargs=initargs) as pool:
+        pending = deque()
+        for batch in batches:
+            pending.append((batch, pool.apply_async(process_batch, (func, batch))))
+            # Bounds the memory: stop reading input until the oldest batch is done
+            if len(pending) >= 2 * n_process:
+                yield from _collect(func, *pending.popleft(), error_handler)
+
+        while pending:
+            yield from _collect(func, *pending.popleft(), error_handler)
+
+
+def _collect(func: Callable, batch: List, async_result, error_handler: Optional[Callable]) -> Iterator:
+    try:
+        results = async_result.get()
+    except Exception:
+        # The batch failed as a whole, e.g. a result could not be pickled.
+        # Retry it here, so the errors are isolated per item again.
+        results = process_batch(func, batch)
+    yield from handle_results(batch, results, error_handler)
+
+
+def _thread_pipe(func, batches, n_threads, error_handler, initializer, initargs) -> Iterator:
+    # Only imported when worker threads are used
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(
+        n_threads, thread_name_prefix="etnltk", initializer=initializer, initargs=initargs
+    ) as executor:
+        pending = deque()
+        try:
+            for batch in batches:
+                pending.append((batch, executor.submit(process_batch, func, batch)))
+                # Bounds the memory: stop reading input until the oldest batch is done
+                if len(pending) >= 2 * n_threads:
+                    batch, future = pending.popleft()
+                    yield from handle_results(batch, future.result(), error_handler)
+
+            while pending:
+                batch, future = pending.popleft()
+                yield from handle_results(batch, future.result(), error_handler)
+        finally:
+            # The consumer stopped early, the batches not started yet are dropped
+            for _, future in pending:
+                future.cancel()
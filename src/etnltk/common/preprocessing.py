@@ -5,11 +5,10 @@ from __future__ import unicode_literals
 import re
 from typing import List, Optional, Union
 
-# Third party libraries
-import emoji
-
 # etnltk libraries
-from .utils import is_chinese_char, regex_replace
+from .cache import once_per_key
+from .charclass import CLASS_CHINESE, filter_chars
+from .utils import regex_replace
 
 # Regular expression
 REGEX_PATTERN_URLS = re.compile(r'https?://\S+|www\.\S+')
@@ -40,10 +39,64 @@ def remove_tags(text: str) -> str:
     return regex_replace(text, pattern=REGEX_PATTERN_TAGS, replace='')
 
 
+def _char_ranges(chars) -> str:
+    """Returns a regex character class body that matches all `chars`.
+    """
+    codepoints = sorted(set(ord(char) for char in chars))
+    ranges = []
+    for cp in codepoints:
+        if ranges and ranges[-1][1] == cp - 1:
+            ranges[-1][1] = cp
+        else:
+            ranges.append([cp, cp])
+    return "".join(
+        re.escape(chr(lo)) if lo == hi else f"{re.escape(chr(lo))}-{re.escape(chr(hi))}" for lo, hi in ranges
+    )
+
+
+@once_per_key
+def _emoji_chars():
+    """Returns the ascii characters that can start an emoji (keycaps like `1️⃣`),
+    a regex matching from the first non-ascii emoji character to the end of the run
+    and `emoji.replace_emoji`.
+    """
+    # `emoji` is slow to import, so it is only imported once emojis are removed
+    import emoji
+
+    # Variation selectors are dropped by `emoji` even outside of an emoji.
+    chars = set("".join(emoji.EMOJI_DATA)) | {"\ufe0e", "\ufe0f", "\u200d"}
+    ascii_chars = "".join(sorted(char for char in chars if ord(char) < 128))
+    # A single astral range is much faster to match than the exact emoji ranges,
+    # extra characters only make the runs passed to `emoji` a bit longer.
+    non_ascii_chars = _char_ranges(char for char in chars if 128 <= ord(char) <= 0xFFFF) + "\U00010000-\U0010FFFF"
+    emoji_chars = re.escape(ascii_chars) + non_ascii_chars
+    # `emoji` fills its search tree on the first `replace_emoji` call, a thread calling it meanwhile
+    # would use a partial tree. It is filled here, before any thread gets `replace_emoji`.
+    emoji.replace_emoji("\U0001F600")
+    return ascii_chars, re.compile(rf"[{non_ascii_chars}][{emoji_chars}]*"), emoji.replace_emoji
+
+
 def remove_emojis(text: str) -> str:
     """Remove emojis from a text string
     """
-    return emoji.replace_emoji(text, replace='')
+    # `emoji.replace_emoji` walks the text one character at a time,
+    # so it is only applied to the runs of characters that can be part of an emoji.
+    ascii_chars, regex_emoji_run, replace_emoji = _emoji_chars()
+
+    output = []
+    end = 0
+    for match in regex_emoji_run.finditer(text):
+        start = match.start()
+        while start > end and text[start - 1] in ascii_chars:
+            start -= 1
+        output.append(text[end:start])
+        output.append(replace_emoji(text[start:match.end()], replace=''))
+        end = match.end()
+
+    if not output:
+        return text
+    output.append(text[end:])
+    return "".join(output)
 
 
 def remove_email(text: str) -> str:
@@ -73,10 +126,7 @@ def remove_arabic_chars(text: str) -> str:
 def remove_chinese_chars(text: str) -> str:
     """Remove chinese characters from a text string
     """
-    output = [
-        char for char in text if not is_chinese_char(ord(char))
-    ]
-    return "".join(output)
+    return filter_chars(text, drop=(CLASS_CHINESE,))
 
 
 def remove_special_characters(text: str) -> str:
@@ -0,0 +1,82 @@
+# coding=utf-8
+#
+# Standard libraries
+import string
+from typing import Dict, List, Tuple, Union
+
+# Third party libraries
+import ahocorasick
+
+# Characters a match can not be preceded or followed by, same as `textsearch`
+ALPHANUM = frozenset(string.digits + string.ascii_letters + '_')
+
+
+class Replacer(object):
+    """Replaces whole-word occurrences of the keys of a dictionary by their values.
+
+    It gives the same output as a ``TextSearch("sensitive", "object")`` from `textsearch`
+    with the same words added, but only needs `ahocorasick` and can be pickled
+    with its automaton already built. It is only read once built, so threads can share it.
+    """
+    def __init__(self, replacements: Dict[str, str]):
+        self.automaton = ahocorasick.Automaton()
+        for key, value in replacements.items():
+            self.automaton.add_word(key, (len(key), key if value is None else value))
+        self.automaton.make_automaton()
+
+    def __len__(self):
+        return len(self.automaton)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(num_items={len(self)})"
+
+    def replace(self, text: str, return_entities: bool = False) -> Union[str, Tuple[str, List[Tuple[int, int, str, str]]]]:
+        """ Replaces the known words in `text`.
+
+        Overlapping matches are resolved like `textsearch`: the first match wins,
+        unless a later match that overlaps it is longer.
+
+        Args:
+            text (str): input text
+            return_entities (bool, optional): also return the replaced matches
+                as ``(start, end, match, replacement)`` tuples, `start` and `end` index `text`. Defaults to False.
+
+        Returns:
+            str: the text with the matches replaced, and the matches if `return_entities` is True.
+        """
+        length_text = len(text)
+        # (length, start, stop, match, replacement), the first item is a sentinel
+        keywords = [(None, None, 0, "", "")]
+        current_stop = -1
+        for end_index, (length, replacement) in self.automaton.iter(text):
+            start = end_index - length + 1
+            stop = end_index + 1
+            # Whole words only
+            if stop != length_text and text[stop] in ALPHANUM:
+                continue
+            if start != 0 and text[start - 1] in ALPHANUM:
+                continue
+            if start >= current_stop:
+                current_stop = stop
+                keywords.append((current_stop - start, start, current_stop, text[start:stop], replacement))
+            elif stop - start > keywords[-1][0]:
+                current_stop = max(current_stop, stop)
+                keywords[-1] = (current_stop - start, start, current_stop, text[start:stop], replacement)
+
+        if len(keywords) == 1:
+            return (text, []) if return_entities else text
+
+        output = []
+        previous_stop = 0
+        for _, start, stop, _, replacement in keywords[1:]:
+            output.append(text[previous_stop:start])
+            output.append(replacement)
+            previous_stop = stop
+        output.append(text[previous_stop:])
+        replaced = "".join(output)
+
+        if return_entities:
+            entities = [(start, start + len(match), match, replacement)
+                        for _, start, _, match, replacement in keywords[1:]]
+            return replaced, entities
+        return replaced
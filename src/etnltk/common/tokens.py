@@ -0,0 +1,285 @@
+# coding=utf-8
+#
+# Standard libraries
+from array import array
+from bisect import bisect_left
+from collections.abc import Sequence
+from operator import itemgetter
+from typing import Callable, Iterator, List, Optional, Tuple
+
+# etnltk libraries
+from etnltk.tokenize.wordpunct import TokenSpan
+from etnltk.common.vocab import (
+    Vocab,
+    FLAG_WORD,
+    FLAG_PUNCT,
+    FLAG_STOP,
+    FLAG_ETHIOPIC,
+    FLAG_DIGIT
+)
+
+
+class TokenTable(Sequence):
+    """The tokens of a document, stored by columns.
+
+    Every token is the id of its word in a :class:`Vocab`, where each distinct word is stored once
+    with its lexical flags, and its offsets in the document are kept in arrays of integers.
+    The words the shared vocabulary doesn't keep, e.g. the ones with digits, are stored in a vocabulary
+    of the table, `local`, their ids are negative, see :meth:`Vocab.add_many`.
+    Items are created when they are accessed: indexing returns the token text as a `word_class` string,
+    :meth:`token` a :class:`Token` view.
+    """
+    def __init__(self, tokens: List[TokenSpan], word_class: Callable = str, vocab: Optional[Vocab] = None):
+        """
+        Args:
+            tokens (List[TokenSpan]): the (token, start, end) tuples, sorted by offsets. Tokens have no whitespace.
+            word_class (Callable, optional): type of the items, e.g. ``AmharicWord``. Defaults to str.
+            vocab (Optional[Vocab], optional): the vocabulary the tokens are added to,
+                e.g. ``get_vocab("am")``. Defaults to a new vocabulary of no language.
+        """
+        self.word_class = word_class
+        self.vocab = vocab if vocab is not None else Vocab()
+        self.local = Vocab(stop_words=self.vocab.stop_words)
+        self.ids = self.vocab.add_many(map(itemgetter(0), tokens), local=self.local)
+        self.starts = array("l", map(itemgetter(1), tokens))
+        self.ends = array("l", map(itemgetter(2), tokens))
+
+    def __len__(self):
+        return len(self.starts)
+
+    def _text(self, index: int) -> str:
+        return self._string(self.ids[index])
+
+    def _string(self, word_id: int) -> str:
+        return self.vocab.strings[word_id] if word_id >= 0 else self.local.strings[~word_id]
+
+    def _word_flags(self, word_id: int) -> int:
+        return self.vocab.flags[word_id] if word_id >= 0 else self.local.flags[~word_id]
+
+    def _norm(self, word_id: int) -> str:
+        if word_id >= 0:
+            return self.vocab.norm(word_id)
+        string = self.local.strings[~word_id]
+        return self.vocab.normalizer(string) if self.vocab.normalizer is not None else string
+
+    @property
+    def flags(self) -> array:
+        """The lexical flags of every token, read from the vocabulary."""
+        if not len(self.local):
+            flags = self.vocab.flags
+            return array("H", [flags[word_id] for word_id in self.ids])
+        return array("H", map(self._word_flags, self.ids))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                return [self.word_class(token) for token in self.texts(start, stop)]
+            return [self[i] for i in range(start, stop, step)]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("TokenTable: index out of range")
+        return self.word_class(self._text(index))
+
+    def __iter__(self):
+        return map(self.word_class, self.texts())
+
+    def __eq__(self, other):
+        if isinstance(other, (TokenTable, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def __reduce__(self):
+        # Pickled by columns: every distinct word once, with the ids of the tokens in that list of words.
+        # The ids are given again by the vocabulary of the process it is unpickled in, one word at a time.
+        word_ids = list(dict.fromkeys(self.ids))
+        local_ids = {word_id: index for index, word_id in enumerate(word_ids)}
+        strings = list(map(self._string, word_ids))
+        return _make_table, (
+            self.__class__,
+            self.word_class,
+            self.vocab,
+            strings,
+            _packed(array("l", map(local_ids.__getitem__, self.ids))),
+            _packed(self.starts),
+            _packed(self.ends)
+        )
+
+    def texts(self, start: int = 0, stop: int = None) -> List[str]:
+        """ Returns the token texts from `start` to `stop`, as plain strings.
+        """
+        strings = self.vocab.strings
+        if not len(self.local):
+            return [strings[word_id] for word_id in self.ids[start:stop]]
+        local_strings = self.local.strings
+        return [strings[word_id] if word_id >= 0 else local_strings[~word_id] for word_id in self.ids[start:stop]]
+
+    def spans(self, start: int = 0, stop: int = None) -> List[TokenSpan]:
+        """ Returns the (token, start, end) tuples from `start` to `stop`.
+        """
+        stop = len(self) if stop is None else stop
+        return list(zip(self.texts(start, stop), self.starts[start:stop], self.ends[start:stop]))
+
+    def splice(self, start: int, stop: int, tokens: List[TokenSpan], offset: int = 0, shift: int = 0) -> "TokenTable":
+        """ Returns a new table where the tokens from `start` to `stop` are replaced by `tokens`,
+        used to update the tokens of an edited document.
+
+        Args:
+            start (int): index of the first replaced token.
+            stop (int): index after the last replaced token.
+            tokens (List[TokenSpan]): the new (token, start, end) tuples, their offsets are moved by `offset`.
+            offset (int, optional): added to the offsets of `tokens`. Defaults to 0.
+            shift (int, optional): added to the offsets of the tokens after `stop`. Defaults to 0.
+        """
+        table = self.__class__.__new__(self.__class__)
+        table.word_class = self.word_class
+        table.vocab = self.vocab
+        # Shared with this table, its words are only added to
+        table.local = self.local
+        table.ids = self.ids[:start] + self.vocab.add_many(map(itemgetter(0), tokens), local=self.local)
+        table.ids += self.ids[stop:]
+        table.starts = self.starts[:start] + array("l", [token_start + offset for _, token_start, _ in tokens])
+        table.starts += _shifted(self.starts[stop:], shift)
+        table.ends = self.ends[:start] + array("l", [token_end + offset for _, _, token_end in tokens])
+        table.ends += _shifted(self.ends[stop:], shift)
+        return table
+
+    def index_range(self, start: int, end: int) -> Tuple[int, int]:
+        """ Returns the (first, last + 1) indexes of the tokens starting in the document offsets [start, end).
+        """
+        return bisect_left(self.starts, start), bisect_left(self.starts, end)
+
+    def filter(self, exclude: int = 0, include: int = 0) -> List:
+        """ Returns the tokens without any of the `exclude` flags and with all the `include` flags,
+        e.g. ``doc.words.filter(exclude=FLAG_STOP)`` are the words that are not stop words.
+        """
+        if not len(self.local):
+            strings = self.vocab.strings
+            return [self.word_class(strings[word_id]) for word_id in self.vocab.filter(self.ids, exclude, include)]
+        return [
+            self.word_class(self._string(word_id)) for word_id, flags in zip(self.ids, self.flags)
+            if not flags & exclude and flags & include == include
+        ]
+
+    def token(self, index: int) -> "Token":
+        """ Returns a view of a token, with its offsets and flags.
+        """
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("TokenTable: index out of range")
+        return Token(self, index)
+
+    def iter_tokens(self) -> Iterator["Token"]:
+        """ Yields a :class:`Token` view of every token.
+        """
+        for index in range(len(self)):
+            yield Token(self, index)
+
+
+def _make_table(cls, word_class: Callable, vocab: Vocab, strings: List[str],
+                local_ids: array, starts: array, ends: array) -> TokenTable:
+    """Returns an unpickled table, its words are added to `vocab` once each."""
+    table = cls.__new__(cls)
+    table.word_class = word_class
+    table.vocab = vocab
+    table.local = Vocab(stop_words=vocab.stop_words)
+    word_ids = vocab.add_many(strings, local=table.local).tolist()
+    table.ids = array("l", map(word_ids.__getitem__, local_ids))
+    table.starts = array("l", starts.tolist())
+    table.ends = array("l", ends.tolist())
+    return table
+
+
+def _packed(values: array) -> array:
+    """Returns non-negative integers in the smallest array type that holds them, to pickle fewer bytes."""
+    largest = max(values, default=0)
+    for typecode in ("B", "H", "I"):
+        if largest < 1 << 8 * array(typecode).itemsize:
+            return array(typecode, values)
+    return values
+
+
+def _shifted(offsets: array, shift: int) -> array:
+    if not shift:
+        return offsets
+    return array("l", [offset + shift for offset in offsets])
+
+
+class Token(object):
+    """A view of a token of a :class:`TokenTable`, its text is read from the table when it is accessed."""
+    __slots__ = ("table", "index")
+
+    def __init__(self, table: TokenTable, index: int):
+        self.table = table
+        self.index = index
+
+    @property
+    def text(self) -> str:
+        return self.table._text(self.index)
+
+    @property
+    def start(self) -> int:
+        """Offset of the token in the document, its expansion shares the offsets of a short form."""
+        return self.table.starts[self.index]
+
+    @property
+    def end(self) -> int:
+        return self.table.ends[self.index]
+
+    @property
+    def id(self) -> int:
+        """Id of the word of the token in the vocabulary, negative in the vocabulary of the table."""
+        return self.table.ids[self.index]
+
+    @property
+    def flags(self) -> int:
+        return self.table._word_flags(self.id)
+
+    @property
+    def norm(self) -> str:
+        """The normalized form of the word."""
+        return self.table._norm(self.id)
+
+    @property
+    def is_word(self) -> bool:
+        return bool(self.flags & FLAG_WORD)
+
+    @property
+    def is_punct(self) -> bool:
+        return bool(self.flags & FLAG_PUNCT)
+
+    @property
+    def is_stopword(self) -> bool:
+        return bool(self.flags & FLAG_STOP)
+
+    @property
+    def is_ethiopic(self) -> bool:
+        return bool(self.flags & FLAG_ETHIOPIC)
+
+    @property
+    def has_digit(self) -> bool:
+        return bool(self.flags & FLAG_DIGIT)
+
+    def __len__(self):
+        return len(self.text)
+
+    def __str__(self):
+        return self.text
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.text!r}, start={self.start}, end={self.end})"
+
+    def __eq__(self, other):
+        if isinstance(other, Token):
+            return self.table is other.table and self.index == other.index
+        if isinstance(other, str):
+            return self.text == other
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.text)
@@ -0,0 +1,263 @@
+# coding=utf-8
+#
+# Standard libraries
+import mmap
+from bisect import bisect_left
+from itertools import accumulate
+from typing import Iterable, Iterator, List, Tuple, Union
+
+# The policies for invalid UTF-8: raise an error, replace every invalid sequence by U+FFFD, or drop it.
+# `ignore`, the name of `open`, is the same as `skip`.
+ERRORS = ("strict", "replace", "skip")
+_ERROR_ALIASES = {"ignore": "skip"}
+# The error handlers of the `utf-8` codec of the policies
+_CODEC_ERRORS = {"strict": "strict", "replace": "replace", "skip": "ignore"}
+
+# The bytes-like texts, decoded from UTF-8
+BUFFER_TYPES = (bytes, bytearray, memoryview, mmap.mmap)
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+# Bytes decoded at a time after an invalid sequence
+_WINDOW_SIZE = 1 << 16
+# Characters between two stored byte offsets of `ByteOffsets`
+_BLOCK_SIZE = 256
+# Size of U+FFFD in UTF-8
+_REPLACEMENT_SIZE = 3
+
+
+def check_errors(func_name: str, errors: str) -> str:
+    """ Returns the policy for invalid UTF-8 named by `errors`, "ignore" is "skip".
+    Raises a `ValueError` naming `func_name` for an unknown one.
+    """
+    errors = _ERROR_ALIASES.get(errors, errors)
+    if errors not in ERRORS:
+        raise ValueError(f"{func_name}: `errors` must be one of {ERRORS}, not {errors!r}")
+    return errors
+
+
+def codec_errors(func_name: str, errors: str) -> str:
+    """ Returns the error handler of the `utf-8` codec, e.g. for `open`, of a policy for invalid UTF-8.
+    """
+    return _CODEC_ERRORS[check_errors(func_name, errors)]
+
+
+def _as_bytes_view(data: Buffer) -> memoryview:
+    view = memoryview(data)
+    if view.ndim != 1 or view.itemsize != 1:
+        view = view.cast("B")
+    return view
+
+
+class Utf8Decoder(object):
+    """Decodes UTF-8 given in chunks of bytes, e.g. read from a socket or the chunks of a memory-mapped file.
+
+    A codepoint split between two chunks is decoded with the next one. The buffers are decoded
+    without being copied, only a chunk completing a split codepoint is. The invalid sequences are
+    handled by the `errors` policy and kept in `invalid`, so the offsets of the decoded text can be
+    mapped back to the bytes, see :class:`ByteOffsets`.
+
+    Example::
+
+        decoder = Utf8Decoder(errors="replace")
+        for chunk in chunks:
+            text = decoder.decode(chunk)
+        text = decoder.decode(b"", final=True)
+    """
+    def __init__(self, errors: str = "strict"):
+        """
+        Args:
+            errors (str, optional): the policy for invalid UTF-8: "strict" raises a `UnicodeDecodeError`,
+                "replace" replaces every invalid sequence by U+FFFD, "skip" drops it. Defaults to "strict".
+        """
+        self.errors = check_errors("Utf8Decoder", errors)
+        # Decoded so far, the bytes of a split codepoint excluded
+        self.num_bytes = 0
+        self.num_chars = 0
+        # (offset in the decoded text, number of characters, number of bytes) of every invalid sequence
+        self.invalid: List[Tuple[int, int, int]] = []
+        self._pending = b""
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(errors={self.errors!r}, num_bytes={self.num_bytes})"
+
+    def decode(self, data: Buffer, final: bool = False) -> str:
+        """ Returns the text of a chunk.
+
+        Args:
+            data (Buffer): the next bytes, bytes, bytearray, memoryview or mmap.
+            final (bool, optional): it is the last chunk, an incomplete codepoint at its end is invalid.
+                Defaults to False.
+
+        Returns:
+            str: the decoded text, without the bytes of a codepoint completed by the next chunk.
+        """
+        view = _as_bytes_view(data)
+        if self._pending:
+            view = memoryview(self._pending + view.tobytes())
+            self._pending = b""
+
+        pieces = []
+        num_chars = self.num_chars
+        position = 0
+        size = len(view)
+        # Decoded at once, then by windows after an invalid sequence:
+        # a decoding error copies the bytes it was decoding
+        window = size
+        while position < size:
+            stop = min(position + window, size)
+            try:
+                piece = str(view[position:stop], "utf-8")
+            except UnicodeDecodeError as error:
+                window = _WINDOW_SIZE
+                start = position + error.start
+                end = position + error.end
+                piece = str(view[position:start], "utf-8")
+                pieces.append(piece)
+                num_chars += len(piece)
+                if end == stop and error.reason == "unexpected end of data":
+                    if stop < size:
+                        # A codepoint split by the window
+                        position = start
+                        continue
+                    if not final:
+                        # Completed by the next chunk
+                        self._pending = view[start:].tobytes()
+                        size = start
+                        break
+                if self.errors == "strict":
+                    raise UnicodeDecodeError(
+                        "utf-8", view[start:end].tobytes(), 0, end - start,
+                        f"{error.reason}, at byte {self.num_bytes + start}"
+                    )
+                replacement = "\ufffd" if self.errors == "replace" else ""
+                self.invalid.append((num_chars, len(replacement), end - start))
+                pieces.append(replacement)
+                num_chars += len(replacement)
+                position = end
+            else:
+                pieces.append(piece)
+                num_chars += len(piece)
+                position = stop
+
+        self.num_bytes += size
+        self.num_chars = num_chars
+        return pieces[0] if len(pieces) == 1 else "".join(pieces)
+
+
+def iter_decode(chunks: Iterable[Union[str, Buffer]], errors: str = "strict") -> Iterator[str]:
+    """ Yields the texts of chunks of UTF-8 bytes, decoded by a :class:`Utf8Decoder`.
+    The texts already decoded are yielded as they are.
+    """
+    decoder = Utf8Decoder(errors)
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            text = decoder.decode(b"", final=True) + chunk
+        else:
+            text = decoder.decode(chunk)
+        if text:
+            yield text
+    text = decoder.decode(b"", final=True)
+    if text:
+        yield text
+
+
+class ByteOffsets(object):
+    """Maps the character offsets of a text to byte offsets in the UTF-8 bytes it was decoded from,
+    or in its UTF-8 encoding.
+
+    The bytes of an invalid sequence replaced by U+FFFD are the bytes of that character.
+    The bytes of a skipped one are before the next character: they are at the end of neither span.
+    A byte offset is computed from the one stored every 256 characters.
+    """
+    def __init__(self, text: str, invalid: Iterable[Tuple[int, int, int]] = ()):
+        """
+        Args:
+            text (str): the decoded text.
+            invalid (Iterable[Tuple[int, int, int]], optional): the invalid sequences of the bytes,
+                see `Utf8Decoder.invalid`. Defaults to (), `text` is then its own UTF-8 encoding.
+        """
+        self.text = text
+        self.invalid = list(invalid)
+        self._invalid_offsets = [offset for offset, _, _ in self.invalid]
+        # The bytes an invalid sequence adds to the UTF-8 encoding of its characters
+        self._extra_bytes = [0] + list(accumulate(
+            num_bytes - num_chars * _REPLACEMENT_SIZE for _, num_chars, num_bytes in self.invalid
+        ))
+        self._identity = not self.invalid and text.isascii()
+        self._blocks = None
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(num_chars={len(self.text)}, num_invalid={len(self.invalid)})"
+
+    def _extra(self, start: int, end: int) -> int:
+        """Returns the extra bytes of the invalid sequences at offsets [start, end)."""
+        offsets = self._invalid_offsets
+        if not offsets:
+            return 0
+        return self._extra_bytes[bisect_left(offsets, end)] - self._extra_bytes[bisect_left(offsets, start)]
+
+    def _encoded_size(self, start: int, end: int) -> int:
+        return len(self.text[start:end].encode("utf-8", "surrogatepass")) + self._extra(start, end)
+
+    def _end(self, offset: int) -> int:
+        """Returns the byte offset after the character before `offset`."""
+        if self._blocks is None:
+            blocks = [0]
+            for start in range(0, len(self.text) - _BLOCK_SIZE + 1, _BLOCK_SIZE):
+                blocks.append(blocks[-1] + self._encoded_size(start, start + _BLOCK_SIZE))
+            self._blocks = blocks
+        start = offset - offset % _BLOCK_SIZE
+        return self._blocks[offset // _BLOCK_SIZE] + self._encoded_size(start, offset)
+
+    def _check_offset(self, offset: int):
+        if not 0 <= offset <= len(self.text):
+            raise IndexError(f"ByteOffsets: offset {offset} is out of a text of length {len(self.text)}")
+
+    def byte_offset(self, offset: int) -> int:
+        """ Returns the byte offset of the character at `offset`, `len(text)` gives the end of the bytes.
+        """
+        self._check_offset(offset)
+        if self._identity:
+            return offset
+        byte_offset = self._end(offset)
+        # The skipped bytes before the character
+        index = bisect_left(self._invalid_offsets, offset)
+        while index < len(self.invalid) and self.invalid[index][0] == offset:
+            _, num_chars, num_bytes = self.invalid[index]
+            if num_chars:
+                break
+            byte_offset += num_bytes
+            index += 1
+        return byte_offset
+
+    def byte_span(self, start: int, end: int) -> Tuple[int, int]:
+        """ Returns the (start, end) byte offsets of the characters at offsets [start, end).
+        """
+        self._check_offset(end)
+        byte_start = self.byte_offset(start)
+        if self._identity:
+            return byte_start, end
+        return byte_start, max(byte_start, self._end(end))
+
+
+def decode_utf8(data: Buffer, errors: str = "strict") -> Tuple[str, ByteOffsets]:
+    """ Decodes UTF-8 bytes.
+
+    Args:
+        data (Buffer): bytes, bytearray, memoryview or mmap, e.g. a slice of a memory-mapped file.
+        errors (str, optional): the policy for invalid UTF-8, "strict", "replace" or "skip". Defaults to "strict".
+
+    Returns:
+        Tuple[str, ByteOffsets]: the text and the map of its offsets to offsets in `data`.
+    """
+    decoder = Utf8Decoder(errors)
+    text = decoder.decode(data, final=True)
+    return text, ByteOffsets(text, decoder.invalid)
+
+
+def as_text(text: Union[str, Buffer], errors: str = "strict") -> str:
+    """ Returns `text` decoded when it is UTF-8 bytes, else `text` itself.
+    """
+    if isinstance(text, BUFFER_TYPES):
+        return Utf8Decoder(errors).decode(text, final=True)
+    return text
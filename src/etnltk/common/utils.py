@@ -55,6 +55,15 @@ def is_chinese_char(cp) -> bool:
     return False
 
 
+def import_numpy():
+    """Returns the `numpy` module, or None when it is not installed."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
 def remove_control_char(s):
     """Remove a control character in a string."""
     return "".join(ch for ch in s if unicodedata.category(ch)[0] != "C")
@@ -62,4 +71,4 @@ def remove_control_char(s):
 
 def regex_replace(text: str, pattern: Pattern[AnyStr], replace: str = '') -> str:
     """ Uses a regular expression to perform substitution on a sequence of characters. """
-    return pattern.sub(replace, text, re.UNICODE)
+    return pattern.sub(replace, text)
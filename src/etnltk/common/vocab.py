@@ -0,0 +1,228 @@
+# coding=utf-8
+#
+# Standard libraries
+import importlib
+import re
+import threading
+import unicodedata
+from array import array
+from typing import Callable, Dict, Iterable, List, Optional
+
+# etnltk libraries
+from .cache import once_per_key
+
+# Lexical flags of a lexeme, combined in `Vocab.flags`
+FLAG_WORD = 1       # has ethiopic letters, i.e. it is kept by `ethiopic_words`
+FLAG_PUNCT = 2      # a single punctuation mark or symbol
+FLAG_STOP = 4       # a stop word of the language
+FLAG_ETHIOPIC = 8   # only ethiopic letters
+FLAG_DIGIT = 16     # has a digit, ethiopic numbers included
+
+# Maximum number of words of the vocabulary of a language, see `get_vocab`
+DEFAULT_MAX_SIZE = 500_000
+
+# Same characters as kept by `strip_non_ethiopic`
+_REGEX_ETHIOPIC_WORD_CHAR = re.compile(r"[\u1200-\u135F\u1369-\u137F]")
+_REGEX_ETHIOPIC_LETTERS = re.compile(r"[\u1200-\u135F]+")
+_REGEX_DIGIT = re.compile(r"[\d\u1369-\u137C]")
+
+
+def _is_punct(string: str) -> bool:
+    return len(string) == 1 and unicodedata.category(string)[0] in "PS"
+
+
+def lexeme_flags(string: str, stop_words=frozenset()) -> int:
+    """ Returns the lexical flags of a word.
+    """
+    flags = 0
+    if _REGEX_ETHIOPIC_WORD_CHAR.search(string):
+        flags |= FLAG_WORD
+    elif _is_punct(string):
+        flags |= FLAG_PUNCT
+    if string in stop_words:
+        flags |= FLAG_STOP
+    if _REGEX_ETHIOPIC_LETTERS.fullmatch(string):
+        flags |= FLAG_ETHIOPIC
+    if _REGEX_DIGIT.search(string):
+        flags |= FLAG_DIGIT
+    return flags
+
+
+class Vocab(object):
+    """Stores every distinct word string once, with an integer id and precomputed lexical attributes.
+
+    Ids are given in the order words are added and never change, so arrays of ids can stand for texts.
+    The vocabulary of a language is shared by all its documents, see :func:`get_vocab`. So that it does not
+    grow with every text, the words with digits and the other noise, or all new words once it has `max_size`
+    words, can be kept out of it: :meth:`add_many` then adds them to a vocabulary of the caller instead.
+
+    Attributes:
+        lang (Optional[str]): language code, None for a vocabulary of no language.
+        strings (List[str]): the words, by id.
+        flags (array): the lexical flags of every word, by id, see `FLAG_STOP` and the others.
+        norms (array): the id of the normalized form of every word, by id.
+    """
+    def __init__(
+        self,
+        lang: Optional[str] = None,
+        stop_words=frozenset(),
+        normalizer: Optional[Callable] = None,
+        max_size: Optional[int] = None
+    ):
+        """
+        Args:
+            lang (Optional[str], optional): language code. Defaults to None.
+            stop_words (optional): the stop words, flagged with `FLAG_STOP`. Defaults to frozenset().
+            normalizer (Optional[Callable], optional): returns the normalized form of a word. Defaults to None.
+            max_size (Optional[int], optional): number of words after which :meth:`add_many` keeps new words
+                out of the vocabulary when it is given a `local` one. Defaults to None, no limit.
+        """
+        self.lang = lang
+        self.stop_words = stop_words
+        self.normalizer = normalizer
+        self.max_size = max_size
+        self.strings: List[str] = []
+        self.flags = array("H")
+        self.norms = array("l")
+        self._ids: Dict[str, int] = {}
+        # Only adding words is locked, looking them up is not
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(lang={self.lang!r}, size={len(self)})"
+
+    def __len__(self):
+        return len(self.strings)
+
+    def __contains__(self, string):
+        return string in self._ids
+
+    def __getitem__(self, key):
+        """ ``vocab[word_id]`` returns a word, ``vocab[word]`` its id.
+        """
+        if isinstance(key, str):
+            return self._ids[key]
+        return self.strings[key]
+
+    def __reduce__(self):
+        # The vocabulary of a language is the one of the process it is unpickled in
+        if self.lang is not None:
+            return get_vocab, (self.lang,)
+        return _make_vocab, (self.strings,)
+
+    def add(self, string: str) -> int:
+        """ Returns the id of a word, the word is added with its attributes if it is new.
+        """
+        word_id = self._ids.get(string)
+        if word_id is None:
+            with self._lock:
+                word_id = self._add(str(string))
+        return word_id
+
+    def _add(self, string: str, normalize: bool = True, flags: Optional[int] = None) -> int:
+        word_id = self._ids.get(string)
+        if word_id is not None:
+            return word_id
+        word_id = len(self.strings)
+        self.strings.append(string)
+        self.flags.append(lexeme_flags(string, self.stop_words) if flags is None else flags)
+        self.norms.append(word_id)
+        if normalize and self.normalizer is not None:
+            norm = self.normalizer(string)
+            if norm != string:
+                # The normalized form is a word of its own, its own normalized form is not computed
+                self.norms[word_id] = self._add(norm, normalize=False)
+        # Added last, the lookups that don't take the lock only find words with all their attributes
+        self._ids[string] = word_id
+        return word_id
+
+    def add_many(self, strings: Iterable[str], local: Optional["Vocab"] = None) -> array:
+        """ Returns the ids of words, the new words are added.
+
+        With a `local` vocabulary, the new words this one doesn't keep, see :meth:`keeps`, are added to `local`
+        instead, their id is then ``~local_id``, a negative number.
+        """
+        get = self._ids.get
+        strings = list(strings)
+        ids = array("l", [get(string, -1) for string in strings])
+        if -1 in ids:
+            with self._lock:
+                for index, word_id in enumerate(ids):
+                    if word_id != -1:
+                        continue
+                    string = str(strings[index])
+                    if local is None:
+                        ids[index] = self._add(string)
+                        continue
+                    word_id = self._ids.get(string)
+                    if word_id is None:
+                        flags = lexeme_flags(string, self.stop_words)
+                        if self.keeps(flags):
+                            word_id = self._add(string, flags=flags)
+                        else:
+                            word_id = ~local.add(string)
+                    ids[index] = word_id
+        return ids
+
+    def keeps(self, flags: int) -> bool:
+        """ Returns whether a new word with these lexical flags is added to this vocabulary by :meth:`add_many`
+        given a `local` one: the punctuation marks and the ethiopic words without digits, until it has
+        `max_size` words.
+        """
+        if self.max_size is not None and len(self.strings) >= self.max_size:
+            return False
+        return bool(flags & FLAG_PUNCT or flags & FLAG_WORD and not flags & FLAG_DIGIT)
+
+    def lookup(self, strings: Iterable[str]) -> array:
+        """ Returns the ids of words, -1 for unknown words, without adding them.
+        """
+        get = self._ids.get
+        return array("l", [get(string, -1) for string in strings])
+
+    def has_flag(self, word_id: int, flag: int) -> bool:
+        return bool(self.flags[word_id] & flag)
+
+    def is_stop(self, string: str) -> bool:
+        """ Returns whether a word is flagged as a stop word, an unknown word is not, and is not added.
+        """
+        word_id = self._ids.get(string)
+        return word_id is not None and bool(self.flags[word_id] & FLAG_STOP)
+
+    def norm(self, word_id: int) -> str:
+        """ Returns the normalized form of a word.
+        """
+        return self.strings[self.norms[word_id]]
+
+    def filter(self, ids: Iterable[int], exclude: int = 0, include: int = 0) -> List[int]:
+        """ Keeps the ids of the words without any of the `exclude` flags and with all the `include` flags,
+        e.g. ``vocab.filter(ids, exclude=FLAG_STOP)`` removes the stop words.
+        """
+        flags = self.flags
+        return [word_id for word_id in ids if not flags[word_id] & exclude and flags[word_id] & include == include]
+
+
+def _make_vocab(strings: List[str]) -> Vocab:
+    vocab = Vocab()
+    vocab.add_many(strings)
+    return vocab
+
+
+@once_per_key
+def get_vocab(lang: str) -> Vocab:
+    """ Returns the shared vocabulary of a language, created once per process, even when threads ask for it
+    at the same time.
+    Its stop words come from the language pack and are added first, the normalized forms from the `normalize`
+    of the language. The documents add their words with digits and their noise to a vocabulary of their own,
+    and all their new words once it has `DEFAULT_MAX_SIZE` words, so its size is bounded.
+
+    Args:
+        lang (str): language code, ``am`` or ``tg``.
+    """
+    # Imported here, the language modules import this one
+    from etnltk.lang.pack import load_pack
+    pack = load_pack(lang)
+    normalizer = importlib.import_module(f"etnltk.lang.{lang}").normalize
+    vocab = Vocab(lang, stop_words=pack.stop_words, normalizer=normalizer, max_size=DEFAULT_MAX_SIZE)
+    # The stop words are in the vocabulary from the start, so a word it doesn't have is not a stop word
+    vocab.add_many(sorted(pack.stop_words))
+    return vocab
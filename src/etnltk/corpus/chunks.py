@@ -0,0 +1,218 @@
+# coding=utf-8
+#
+# Standard libraries
+import mmap
+import os
+import re
+from contextlib import contextmanager
+from functools import partial
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+# etnltk libraries
+from etnltk.common.parallel import pipe, raise_error
+from etnltk.common.utf8 import codec_errors, decode_utf8
+
+# Bytes read by a worker at a time
+DEFAULT_CHUNK_SIZE = 1 << 22
+
+# Where a chunk can end, after the match, for every unit
+_BOUNDARIES = {
+    "line": re.compile(rb"\n"),
+    "document": re.compile(rb"\n[ \t\r\f\v]*\n"),
+}
+# Where a `chunk` can end, by preference: after a `።`, a newline, a whitespace.
+# `።` is E1 8D A2 in UTF-8, a lead byte is never a continuation byte so a match is never mid-codepoint.
+_CHUNK_BOUNDARIES = (re.compile("።".encode("utf-8")), re.compile(rb"\n"), re.compile(rb"\s"))
+_UNITS = ("line", "document", "chunk")
+# Universal newlines, as in a file opened in text mode
+_REGEX_NEWLINE = re.compile(r"\r\n|\r|\n")
+
+
+@contextmanager
+def map_file(path: str) -> Iterator:
+    """Memory-maps a file for reading, an empty file gives empty bytes."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b""
+            return
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield data
+        finally:
+            data.close()
+
+
+def _codepoint_start(data, offset: int) -> int:
+    """Moves `offset` back to the first byte of the UTF-8 codepoint it is in."""
+    while offset > 0 and 0x80 <= data[offset] < 0xC0:
+        offset -= 1
+    return offset
+
+
+def find_chunks(data, chunk_size: int = DEFAULT_CHUNK_SIZE, unit: str = "line") -> Iterator[Tuple[int, int]]:
+    """ Yields the (start, end) byte offsets of the chunks of UTF-8 `data`, of about `chunk_size` bytes.
+
+    A chunk ends after a newline, or after an empty line for the ``document`` unit,
+    so no line or document is split. For the ``chunk`` unit, it ends after the first ``።``
+    in the next `chunk_size` bytes, else after a newline, a whitespace, or else between two codepoints.
+    Only the bytes around the boundaries are read.
+    """
+    if unit not in _UNITS:
+        raise ValueError(f"find_chunks: `unit` must be one of {_UNITS}, not {unit!r}")
+    if chunk_size < 1:
+        raise ValueError(f"find_chunks: `chunk_size` must be positive, not {chunk_size}")
+    boundary = _BOUNDARIES.get(unit)
+    size = len(data)
+    start = 0
+    while start < size:
+        target = start + chunk_size
+        if target >= size:
+            yield start, size
+            return
+        if unit == "chunk":
+            window = min(size, target + chunk_size)
+            for chunk_boundary in _CHUNK_BOUNDARIES:
+                match = chunk_boundary.search(data, target, window)
+                if match:
+                    end = match.end()
+                    break
+            else:
+                end = _codepoint_start(data, target)
+            if end <= start:
+                # A `chunk_size` smaller than a codepoint
+                end = target
+                while end < size and 0x80 <= data[end] < 0xC0:
+                    end += 1
+        else:
+            # Lines and documents are never split, however long
+            match = boundary.search(data, target)
+            end = match.end() if match else size
+        yield start, end
+        start = end
+
+
+def read_chunk(data, start: int, end: int, errors: str = "strict") -> str:
+    """ Decodes the UTF-8 bytes of a chunk, `errors` is "strict", "replace", or "skip" (or "ignore").
+    """
+    return str(data[start:end], "utf-8", codec_errors("read_chunk", errors))
+
+
+def split_units(text: str, unit: str = "line") -> List[str]:
+    """ Splits the text of a chunk like `etnltk.corpus.reader` splits a file:
+    the non-empty lines, the documents separated by empty lines, or the whole chunk.
+    """
+    return [item for item, _, _ in split_units_with_spans(text, unit)]
+
+
+def split_units_with_spans(text: str, unit: str = "line") -> List[Tuple[str, int, int]]:
+    """ Like :func:`split_units`, every item comes with its (start, end) offsets in `text`.
+    The lines of a document are joined by ``\\n``, its offsets are the ones of its first and last lines.
+    """
+    if unit == "chunk":
+        return [(text, 0, len(text))] if text.strip() else []
+    lines = []
+    start = 0
+    for newline in _REGEX_NEWLINE.finditer(text):
+        lines.append((text[start:newline.start()], start, newline.start()))
+        start = newline.end()
+    lines.append((text[start:], start, len(text)))
+    if unit == "line":
+        return [line for line in lines if line[0].strip()]
+
+    documents, current = [], []
+    for line in lines:
+        if line[0].strip():
+            current.append(line)
+        elif current:
+            documents.append(("\n".join(line for line, _, _ in current), current[0][1], current[-1][2]))
+            current = []
+    if current:
+        documents.append(("\n".join(line for line, _, _ in current), current[0][1], current[-1][2]))
+    return documents
+
+
+def _process_chunk(
+    func: Callable,
+    path: str,
+    unit: str,
+    errors: str,
+    with_offsets: bool,
+    bounds: Tuple[int, int]
+) -> List[Tuple[bool, Any, Optional[Tuple[int, int]]]]:
+    """Applies `func` to every line or document of a chunk, read from the file by the worker itself.
+    Returns (ok, result, byte offsets in the file) per item, the errors with the item, as (item, error).
+    """
+    chunk_start = bounds[0]
+    with map_file(path) as data:
+        if with_offsets:
+            text, byte_offsets = decode_utf8(data[slice(*bounds)], errors)
+        else:
+            text = read_chunk(data, *bounds, errors=errors)
+    results = []
+    for item, start, end in split_units_with_spans(text, unit):
+        span = None
+        if with_offsets:
+            byte_start, byte_end = byte_offsets.byte_span(start, end)
+            span = (chunk_start + byte_start, chunk_start + byte_end)
+        try:
+            results.append((True, func(item), span))
+        except Exception as error:
+            results.append((False, (item, error), span))
+    return results
+
+
+def process_file(
+    func: Callable,
+    path: str,
+    unit: str = "line",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    n_process: int = 1,
+    error_handler: Optional[Callable] = None,
+    errors: str = "strict",
+    n_threads: int = 1,
+    with_offsets: bool = False
+) -> Iterator:
+    """ Applies `func` to every line, document or chunk of a large UTF-8 file, in parallel.
+
+    The file is memory-mapped and split into chunks of about `chunk_size` bytes at safe boundaries,
+    see :func:`find_chunks`. Every worker process reads its own chunks from the file,
+    so the file is never read as a whole and only the chunk offsets are sent to the workers.
+
+    Args:
+        func (Callable): function applied to every item, must be picklable when `n_process` > 1.
+        path (str): path of the UTF-8 file.
+        unit (str, optional): the items: every non-empty "line", every "document" separated by empty lines,
+            or every "chunk" as a whole, cut after ``።`` or newlines. Defaults to "line".
+        chunk_size (int, optional): bytes read by a worker at a time. Defaults to 4 MiB.
+        n_process (int, optional): number of worker processes, -1 uses all CPUs. Defaults to 1.
+        error_handler (Optional[Callable], optional): called as ``error_handler(item, error)``
+            when `func` raises, its return value is yielded instead.
+            If not passed, `None` is yielded for the failing item. Defaults to None.
+        errors (str, optional): how invalid UTF-8 is handled: "strict", "replace", or "skip" (or "ignore").
+            Defaults to "strict".
+        n_threads (int, optional): number of worker threads, used instead of worker processes,
+            -1 uses all CPUs. Defaults to 1.
+        with_offsets (bool, optional): yield every result as ``(result, (start, end))``, with the byte offsets
+            of its item in the file. Defaults to False.
+
+    Returns:
+        Iterator: results of `func`, in the order of the file.
+    """
+    codec_errors("process_file", errors)
+    with map_file(path) as data:
+        bounds = list(find_chunks(data, chunk_size, unit))
+
+    chunk_results = pipe(
+        partial(_process_chunk, func, path, unit, errors, with_offsets),
+        bounds,
+        batch_size=1,
+        n_process=n_process,
+        n_threads=n_threads,
+        # A chunk fails as a whole only if it can't be read, e.g. invalid UTF-8 with `errors="strict"`
+        error_handler=raise_error,
+    )
+    for results in chunk_results:
+        for ok, result, span in results:
+            if not ok:
+                result = None if error_handler is None else error_handler(*result)
+            yield (result, span) if with_offsets else result
@@ -0,0 +1,80 @@
+# coding=utf-8
+#
+# Standard libraries
+import io
+import sys
+from contextlib import contextmanager
+from typing import Iterable, Iterator, TextIO, Union
+
+# etnltk libraries
+from etnltk.common.utf8 import codec_errors
+
+PathOrFile = Union[str, TextIO]
+
+
+@contextmanager
+def open_text(path_or_file: PathOrFile, errors: str = "strict") -> Iterator[TextIO]:
+    """Opens a UTF-8 text file for streaming, `-` reads from the standard input.
+    Already opened files are used as they are and not closed.
+    `errors` is the policy for invalid UTF-8: "strict", "replace", or "skip" (or "ignore").
+    """
+    errors = codec_errors("open_text", errors)
+    if path_or_file == "-":
+        stdin = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8", errors=errors)
+        try:
+            yield stdin
+        finally:
+            # Keeps `sys.stdin` open
+            stdin.detach()
+    elif isinstance(path_or_file, str):
+        with open(path_or_file, encoding="utf-8", errors=errors) as f:
+            yield f
+    else:
+        yield path_or_file
+
+
+def read_lines(path_or_file: PathOrFile, errors: str = "strict") -> Iterator[str]:
+    """Yields the non-empty lines of a text file one at a time, without line endings.
+    """
+    with open_text(path_or_file, errors=errors) as f:
+        for line in f:
+            line = line.rstrip("\r\n")
+            if line.strip():
+                yield line
+
+
+def read_documents(path_or_file: PathOrFile, errors: str = "strict") -> Iterator[str]:
+    """Yields the documents of a text file one at a time.
+    Documents are separated by one or more empty lines.
+    Only the current document is kept in memory.
+    """
+    with open_text(path_or_file, errors=errors) as f:
+        lines = []
+        for line in f:
+            if line.strip():
+                lines.append(line)
+            elif lines:
+                yield "".join(lines).rstrip("\r\n")
+                lines = []
+        if lines:
+            yield "".join(lines).rstrip("\r\n")
+
+
+def read_corpus(paths: Iterable[PathOrFile], unit: str = "line", errors: str = "strict") -> Iterator[str]:
+    """Yields the lines or documents of several text files, one file after the other.
+
+    Args:
+        paths (Iterable[PathOrFile]): file paths or opened text files, `-` is the standard input.
+        unit (str, optional): one of "line" or "document". Defaults to "line".
+        errors (str, optional): how invalid UTF-8 is handled: "strict", "replace", or "skip" (or "ignore").
+            Defaults to "strict".
+    """
+    if unit == "line":
+        reader = read_lines
+    elif unit == "document":
+        reader = read_documents
+    else:
+        raise ValueError(f"read_corpus: `unit` must be 'line' or 'document', not {unit!r}")
+
+    for path in paths:
+        yield from reader(path, errors=errors)
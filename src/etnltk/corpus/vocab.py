@@ -0,0 +1,306 @@
+# coding=utf-8
+#
+# Standard libraries
+import importlib
+import json
+import os
+import struct
+import sys
+from array import array
+from collections import Counter
+from functools import partial
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# etnltk libraries
+from etnltk.common.ngrams import NgramCounter
+from etnltk.common.parallel import batched, pipe, raise_error
+from etnltk.corpus.reader import PathOrFile, read_corpus
+
+# The word tokenizer of every language
+_TOKENIZERS = {
+    "am": "etnltk.tokenize.am",
+    "tg": "etnltk.tokenize.tg",
+}
+
+# File format: magic, format version, length of the JSON header, the header, then the sections it lists
+VOCAB_MAGIC = b"ETNV"
+VOCAB_VERSION = 1
+_PREFIX = struct.Struct("<4sHI")
+
+
+class Vocabulary(object):
+    """The words and n-grams of a corpus with their frequencies.
+
+    Words are sorted by decreasing frequency, the id of a word is its index in `words`.
+    N-grams are stored as rows of word ids, in one flat array per order.
+
+    Attributes:
+        lang (str): language code of the corpus.
+        words (List[str]): the words, most frequent first.
+        counts (array): frequency of every word.
+        ngrams (Dict[int, Tuple[array, array]]): for every order n > 1, the word ids
+            of the n-grams (n ids per n-gram) and the frequency of every n-gram.
+        min_count (int): words and n-grams less frequent than it were dropped.
+    """
+    def __init__(self, lang: str, words: List[str], counts: array,
+                 ngrams: Optional[Dict[int, Tuple[array, array]]] = None, min_count: int = 1):
+        self.lang = lang
+        self.words = words
+        self.counts = counts
+        self.ngrams = ngrams or {}
+        self.min_count = min_count
+        self._index = None
+
+    def __repr__(self):
+        cls_name = self.__class__.__name__
+        return f"{cls_name}(lang={self.lang!r}, words={len(self.words)}, orders={self.orders})"
+
+    def __len__(self):
+        return len(self.words)
+
+    def __contains__(self, word):
+        return word in self.index
+
+    @property
+    def orders(self) -> Tuple[int, ...]:
+        return (1,) + tuple(sorted(self.ngrams))
+
+    @property
+    def index(self) -> Dict[str, int]:
+        """Word -> id, built on first use."""
+        if self._index is None:
+            self._index = {word: word_id for word_id, word in enumerate(self.words)}
+        return self._index
+
+    def count(self, word: str) -> int:
+        """ Returns the frequency of a word, 0 for an unknown word.
+        """
+        word_id = self.index.get(word)
+        return 0 if word_id is None else self.counts[word_id]
+
+    @property
+    def word_counts(self) -> Dict[str, int]:
+        """Dictionary of word frequencies, most frequent first."""
+        return dict(zip(self.words, self.counts))
+
+    def ngram_counts(self, n: int) -> Dict[Tuple[str, ...], int]:
+        """ Returns a dict of the n-grams of order `n` and their frequencies, most frequent first.
+        """
+        if n == 1:
+            return {(word,): count for word, count in zip(self.words, self.counts)}
+        if n not in self.ngrams:
+            raise ValueError(f"Vocabulary: order {n} was not counted, `orders` are {self.orders}")
+        ids, counts = self.ngrams[n]
+        words = self.words
+        grams = zip(*[iter(ids)] * n)
+        return {tuple([words[word_id] for word_id in gram]): count for gram, count in zip(grams, counts)}
+
+    def save(self, path: str) -> None:
+        """ Writes the vocabulary to a binary file, read back with :meth:`load`.
+        """
+        sections = [("\n".join(self.words).encode("utf-8"), "words", 1), (self.counts.tobytes(), "counts", 1)]
+        for n in sorted(self.ngrams):
+            ids, counts = self.ngrams[n]
+            sections.append((ids.tobytes(), "ids", n))
+            sections.append((counts.tobytes(), "counts", n))
+
+        header = json.dumps({
+            "lang": self.lang,
+            "min_count": self.min_count,
+            "num_words": len(self.words),
+            "byteorder": sys.byteorder,
+            "id_itemsize": array("i").itemsize,
+            "count_itemsize": array("q").itemsize,
+            "sections": [{"name": name, "order": n, "size": len(data)} for data, name, n in sections],
+        }).encode("utf-8")
+
+        # Written to a temporary file first, like the language packs
+        tmp_path = f"{path}.tmp{os.getpid()}"
+        try:
+            with open(tmp_path, "wb") as file:
+                file.write(_PREFIX.pack(VOCAB_MAGIC, VOCAB_VERSION, len(header)))
+                file.write(header)
+                for data, _, _ in sections:
+                    file.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> "Vocabulary":
+        """ Reads a vocabulary written by :meth:`save`.
+        """
+        with open(path, "rb") as file:
+            data = file.read()
+        magic, version, header_size = _PREFIX.unpack_from(data)
+        if magic != VOCAB_MAGIC:
+            raise ValueError(f"Vocabulary.load: {path!r} is not a vocabulary file")
+        if version != VOCAB_VERSION:
+            raise ValueError(f"Vocabulary.load: unsupported format version {version} in {path!r}")
+        offset = _PREFIX.size
+        header = json.loads(data[offset:offset + header_size].decode("utf-8"))
+        offset += header_size
+
+        swap = header["byteorder"] != sys.byteorder
+        view = memoryview(data)
+        words, counts, ngrams = [], array("q"), {}
+        for section in header["sections"]:
+            chunk = view[offset:offset + section["size"]]
+            offset += section["size"]
+            if section["name"] == "words":
+                words = str(chunk, "utf-8").split("\n") if header["num_words"] else []
+                continue
+            values = array("i" if section["name"] == "ids" else "q")
+            values.frombytes(chunk)
+            if swap:
+                values.byteswap()
+            if section["order"] == 1:
+                counts = values
+            elif section["name"] == "ids":
+                ngrams[section["order"]] = (values, None)
+            else:
+                ngrams[section["order"]] = (ngrams[section["order"]][0], values)
+        return cls(header["lang"], words, counts, ngrams, min_count=header["min_count"])
+
+
+def _count_batch(texts: List[str], lang: str, orders: Tuple[int, ...]) -> Dict[int, Dict[Tuple[str, ...], int]]:
+    """Counts the words and n-grams of a batch of texts, the partial counts of a worker."""
+    tokenizer = importlib.import_module(_TOKENIZERS[lang])
+    counter = NgramCounter(orders)
+    for text in texts:
+        counter.update(tokenizer.word_tokenize(text))
+    # The n-grams share the word strings of the counter, so they are pickled once
+    return {n: dict(counter.items(n)) for n in orders}
+
+
+def count_corpus(
+    texts: Iterable[str],
+    lang: str = "am",
+    orders: Sequence[int] = (1, 2),
+    n_process: int = 1,
+    batch_size: int = 1000
+) -> Dict[int, Counter]:
+    """ Counts the words and n-grams of a stream of texts, in batches counted by worker processes.
+
+    Returns:
+        Dict[int, Counter]: for every order, the merged counts of the n-grams (tuples of n words).
+    """
+    if lang not in _TOKENIZERS:
+        raise ValueError(f"count_corpus: `lang` must be one of {tuple(_TOKENIZERS)}, not {lang!r}")
+    orders = tuple(sorted({1, *[n for n in orders if n > 0]}))
+
+    totals = {n: Counter() for n in orders}
+    partials = pipe(
+        partial(_count_batch, lang=lang, orders=orders),
+        batched(texts, batch_size),
+        batch_size=1,
+        n_process=n_process,
+        error_handler=raise_error,
+    )
+    # Reduce: the partial counts are merged as they arrive
+    for partial_counts in partials:
+        for n, counts in partial_counts.items():
+            totals[n].update(counts)
+    return totals
+
+
+def build_vocab(
+    paths: Iterable[PathOrFile],
+    lang: str = "am",
+    orders: Sequence[int] = (1, 2),
+    min_count: int = 1,
+    unit: str = "line",
+    n_process: int = 1,
+    batch_size: int = 1000,
+    errors: str = "strict"
+) -> Vocabulary:
+    """ Builds the vocabulary of a corpus: its words and n-grams with their frequencies.
+
+    The texts of the files are tokenized and counted in worker processes,
+    the partial counts of every batch are merged, then pruned with `min_count`.
+
+    Args:
+        paths (Iterable[PathOrFile]): file paths or opened text files, `-` is the standard input.
+        lang (str, optional): language code, ``am`` or ``tg``. Defaults to "am".
+        orders (Sequence[int], optional): the n of the n-grams, words are always counted. Defaults to (1, 2).
+        min_count (int, optional): words and n-grams less frequent than it are dropped. Defaults to 1.
+        unit (str, optional): one of "line" or "document", n-grams don't cross them. Defaults to "line".
+        n_process (int, optional): number of worker processes, -1 uses all CPUs. Defaults to 1.
+        batch_size (int, optional): number of lines or documents counted by a worker at a time. Defaults to 1000.
+        errors (str, optional): how invalid UTF-8 is handled: "strict", "replace", or "skip" (or "ignore").
+            Defaults to "strict".
+
+    Returns:
+        Vocabulary: the words and n-grams, most frequent first.
+    """
+    texts = read_corpus(paths, unit=unit, errors=errors)
+    totals = count_corpus(texts, lang=lang, orders=orders, n_process=n_process, batch_size=batch_size)
+
+    # Most frequent first, ties in alphabetical order so the ids don't depend on the batches
+    word_counts = sorted(
+        ((gram[0], count) for gram, count in totals.pop(1).items() if count >= min_count),
+        key=lambda item: (-item[1], item[0])
+    )
+    words = [word for word, _ in word_counts]
+    index = {word: word_id for word_id, word in enumerate(words)}
+
+    ngrams = {}
+    for n, counts in totals.items():
+        # An n-gram is at most as frequent as its words, so its words were kept
+        kept = sorted(
+            ((gram, count) for gram, count in counts.items() if count >= min_count),
+            key=lambda item: (-item[1], item[0])
+        )
+        ids = array("i", [index[word] for gram, _ in kept for word in gram])
+        ngrams[n] = (ids, array("q", [count for _, count in kept]))
+
+    return Vocabulary(lang, words, array("q", [count for _, count in word_counts]), ngrams, min_count=min_count)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m etnltk.corpus.vocab",
+        description="Count the words and n-grams of a UTF-8 corpus and save them as a vocabulary file.",
+    )
+    parser.add_argument("inputs", nargs="*", default=["-"],
+                        help="input files, `-` or nothing reads from the standard input")
+    parser.add_argument("-o", "--output", required=True, help="the vocabulary file to write")
+    parser.add_argument("-l", "--lang", choices=tuple(_TOKENIZERS), default="am",
+                        help="language of the corpus (default: am)")
+    parser.add_argument("--orders", type=int, nargs="+", default=[1, 2],
+                        help="the n of the n-grams to count (default: 1 2)")
+    parser.add_argument("-m", "--min-count", type=int, default=1,
+                        help="drop words and n-grams less frequent than it (default: 1)")
+    parser.add_argument("-u", "--unit", choices=("line", "document"), default="line",
+                        help="count every line, or every block of lines separated by empty lines (default: line)")
+    parser.add_argument("-n", "--n-process", type=int, default=1,
+                        help="number of worker processes, -1 uses all CPUs (default: 1)")
+    parser.add_argument("-b", "--batch-size", type=int, default=1000,
+                        help="number of lines or documents counted by a worker at a time (default: 1000)")
+    parser.add_argument("--encoding-errors", choices=("strict", "replace", "skip", "ignore"), default="strict",
+                        help="how invalid UTF-8 in the input is handled (default: strict)")
+    args = parser.parse_args(argv)
+
+    vocab = build_vocab(
+        args.inputs,
+        lang=args.lang,
+        orders=args.orders,
+        min_count=args.min_count,
+        unit=args.unit,
+        n_process=args.n_process,
+        batch_size=args.batch_size,
+        errors=args.encoding_errors,
+    )
+    vocab.save(args.output)
+    print(f"{args.output}: {len(vocab)} words, orders {vocab.orders}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    # Use the imported module, so the worker processes find the functions in `etnltk.corpus.vocab`
+    from etnltk.corpus.vocab import main as _main
+    sys.exit(_main())
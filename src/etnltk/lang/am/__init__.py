@@ -2,23 +2,28 @@
 #
 # Standard libraries
 from collections import defaultdict
-from functools import cached_property
+from functools import cached_property, partial
 from typing import Callable, List, Optional
 
 # etnltk libraries
-from etnltk.tokenize.space import whitespace_tokenize
-
-from etnltk.tokenize.am import (
-    word_tokenize,
-    sent_tokenize,
-    EthiopicSentenceTokenizer
+from etnltk.tokenize.wordpunct import (
+    ethiopic_words,
+    strip_non_ethiopic,
+    whitespace_words
 )
 
+# Imported as a module: `etnltk.tokenize.am` imports this package while it is itself being
+# imported, so its functions are looked up when they are called.
+from etnltk.tokenize import am as am_tokenize
+
 from etnltk.common.doc import (
     Document,
     Sentence,
     Word
 )
+from etnltk.common.tokens import TokenTable
+from etnltk.common.vocab import get_vocab
+from etnltk.common.ngrams import count_ngrams, iter_ngrams
 
 from etnltk.common.preprocessing import (
     remove_links,
@@ -33,6 +38,11 @@ from etnltk.common.preprocessing import (
     remove_whitespaces
 )
 
+from etnltk.common.compiler import compile_pipeline
+from etnltk.common.utf8 import as_text
+from etnltk.common.language import Language, sentencizer, stopwords, tokenizer
+from etnltk.common.instrumentation import instrumented
+
 from etnltk.common.ethiopic import (
     remove_ethiopic_digits,
     remove_non_ethiopic,
@@ -41,6 +51,7 @@ from etnltk.common.ethiopic import (
 
 from .preprocessing import (
     remove_punctuation,
+    remove_punctuation_and_whitespaces,
     remove_stopwords,
 )
 
@@ -53,6 +64,14 @@ from .normalizer import (
 
 from .stop_words import STOP_WORDS
 
+
+def __getattr__(name: str):
+    # `word_tokenize`, `sent_tokenize` and `EthiopicSentenceTokenizer` are still available from here
+    if name in ("word_tokenize", "sent_tokenize", "EthiopicSentenceTokenizer"):
+        return getattr(am_tokenize, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 DEFAULT_PIPELINE: List[Callable] = [
     remove_links,
     remove_tags,
@@ -68,7 +87,8 @@ DEFAULT_PIPELINE: List[Callable] = [
 ]
 
 
-def clean_amharic(text: str, keep_abbrev=False, pipeline: Optional[List[Callable]] = None):
+@instrumented("clean_amharic")
+def clean_amharic(text: str, keep_abbrev=False, pipeline: Optional[List[Callable]] = None, errors: str = "strict"):
     """ Returns a preprocessed copy of *text*,
     by executing a series of data preprocessing steps defined in pipeline. 
 
@@ -76,6 +96,8 @@ def clean_amharic(text: str, keep_abbrev=False, pipeline: Optional[List[Callable
         text (str): _description_
         abbrev (bool, optional): _description_. Defaults to False.
         pipeline (Optional[List[Callable]], optional): _description_. Defaults to None.
+        errors (str, optional): when `text` is UTF-8 bytes, the policy for invalid UTF-8:
+            "strict", "replace" or "skip". Defaults to "strict".
 
     Raises:
         ValueError: _description_
@@ -85,20 +107,19 @@ def clean_amharic(text: str, keep_abbrev=False, pipeline: Optional[List[Callable
     """
     if text is None:
         raise ValueError("clean_amharic: `text` can't be `None`")
+    text = as_text(text, errors)
 
     if pipeline is None:
         pipeline = DEFAULT_PIPELINE
 
-    for pipe_func in pipeline:
-        text = pipe_func(text)
+    # Built-in preprocessing steps are fused into as few scans as possible
+    text = compile_pipeline(pipeline)(text)
 
     text = normalize_punct(text)
     if not keep_abbrev:
         text = normalize_shortened(text)
 
-    text = remove_punctuation(text, keep_abbrev=keep_abbrev)
-
-    text = remove_whitespaces(text)
+    text = remove_punctuation_and_whitespaces(text, keep_abbrev=keep_abbrev)
 
     if isinstance(text, str):
         processed_text = text
@@ -127,6 +148,7 @@ def normalize(text: str) -> str:
 
 
 class AmharicWord(Word):
+    __slots__ = ()
 
     @property
     def is_stopword(self):
@@ -136,18 +158,27 @@ class AmharicWord(Word):
         return self._check_stopword()
 
     def _check_stopword(self):
-        if self._string in STOP_WORDS:
-            return True
-        else:
-            return False
+        # Read from the flags of the vocabulary, an unknown word is not added to it
+        return get_vocab("am").is_stop(self._string)
 
 
 class Amharic(Document):
-    def __init__(self, text, clean_text=True):
-        super().__init__(text, lang="am")
+    """An Amharic document.
 
-        if clean_text:
-            self.cleaned = clean_amharic(text)
+    The text is analysed once, on the first access to `tokens`, `words` or `sentences`,
+    and all of them are derived from that analysis. `cleaned` is computed on its first access.
+    """
+    def __init__(self, text, clean_text=True, errors="strict"):
+        """
+        Args:
+            text (str): the text, or its UTF-8 bytes, e.g. a `memoryview` of a memory-mapped file.
+            clean_text (bool, optional): kept for compatibility. Defaults to True.
+            errors (str, optional): for bytes, the policy for invalid UTF-8: "strict", "replace" or "skip".
+                Defaults to "strict".
+        """
+        super().__init__(text, lang="am", errors=errors)
+        # Kept for compatibility, `cleaned` is computed when it is first accessed
+        self.clean_text = clean_text
 
     def __repr__(self):
         """Returns a string representation for debugging.
@@ -155,25 +186,32 @@ class Amharic(Document):
         cls_name = self.__class__.__name__
         return f'{cls_name}("{self.cleaned}")'
 
+    @cached_property
+    def cleaned(self):
+        """The text cleaned by :func:`clean_amharic`.
+        """
+        return clean_amharic(self.raw)
+
     @cached_property
     def tokens(self):
         """Return a list of tokens. This includes
         An individual token – i.e. a word, punctuation symbol, whitespace.
 
-        :returns: A :class:`List<AmharicWord>` of tokens.
+        The tokens are the analysis every other layer is derived from, they are stored by columns
+        with their offsets in `raw` and their flags, see :class:`TokenTable`.
+
+        :returns: A :class:`TokenTable` of :class:`AmharicWord` tokens.
         """
-        word_tokens = word_tokenize(self.raw, return_expand=True, return_word=False)
-        return [AmharicWord(w) for w in word_tokens]
+        return TokenTable(self._token_spans(self.raw), word_class=AmharicWord, vocab=get_vocab("am"))
 
     @cached_property
     def words(self):
         """Return a list of word tokens. This excludes punctuation characters.
         If you want to include punctuation characters, access the ``tokens`` property.
 
-        :returns: A :class:`List<AmharicWord>` of word tokens.
+        :returns: A :class:`TokenTable` of :class:`AmharicWord` word tokens.
         """
-        tokenized_words = word_tokenize(self.raw, return_expand=True, return_word=True)
-        return [AmharicWord(w) for w in tokenized_words]
+        return TokenTable(ethiopic_words(self.tokens.spans()), word_class=AmharicWord, vocab=get_vocab("am"))
 
     @cached_property
     def sentences(self):
@@ -201,44 +239,68 @@ class Amharic(Document):
         if n <= 0:
             return []
 
-        grams = [AmharicWord(tuple(self.words[i:i + n])) for i in range(len(self.words) - n + 1)]
+        grams = [AmharicWord(gram) for gram in iter_ngrams(self.words.texts(), n)]
         return grams
 
+    def count_ngrams(self, n=2):
+        """Return a dict of the n-grams (tuples of n successive words) of this document
+        and their frequencies. Pass several n, e.g. ``(1, 2, 3)``, to get the counts of every n.
+        """
+        return count_ngrams(self.words.texts(), n)
+
     def _create_sentence_objects(self):
 
-        self._sentences = []
-        sentences = EthiopicSentenceTokenizer().tokenize(self.raw)
-
-        # Since `EthiopicSentenceTokenizer` normalizes punctuation
-        # `raw` has to be also normalized to extract spans
-        punct_norm_text = normalize_punct(self.raw)
-
-        char_index = 0  # Keeps track of character index within the blob
-        for raw_sent in sentences:
-            # Compute the start and end indices of the sentence
-            # within the blob
-            start_index = punct_norm_text.index(raw_sent, char_index)
-            char_index += len(raw_sent)
-            end_index = start_index + len(raw_sent)
-
-            # Split into words by white space                
-            expanded_words = normalize_shortened(raw_sent)
-
-            # Split into words by white space
-            # Remove extra spaces, tabs, and new lines
-            whitespaced_tokens = whitespace_tokenize(expanded_words)
-
-            # remove non ethiopic chars and ethiopic punctuations
-            ethiopic_tokens = [
-                remove_non_ethiopic(token) for token in whitespaced_tokens if len(remove_non_ethiopic(token).strip())
-            ]
-            stripped_ethiopic_tokens = [
-                remove_ethiopic_punctuation(token) for token in ethiopic_tokens if
-                len(remove_ethiopic_punctuation(token).strip())
-            ]
-            clean_sent = " ".join(stripped_ethiopic_tokens)
-
-            # Sentences share the same models as their parent blob
-            sent = Sentence(raw_sent, start_index=start_index, end_index=end_index, clean_sentence=clean_sent)
-            self._sentences.append(sent)
+        # `EthiopicSentenceTokenizer` normalizes punctuation,
+        # the spans are mapped back to offsets in `raw`
+        sentences = self._sentence_spans(self.raw)
+
+        # Sentences are views of the document, their texts are built when they are accessed
+        self._sentences = [Sentence(self, start_index, end_index) for _, start_index, end_index in sentences]
         return self._sentences
+
+    def _token_spans(self, text):
+        return am_tokenize.word_tokenize_with_spans(text, return_expand=True, return_word=False)
+
+    def _sentence_spans(self, text):
+        return am_tokenize.sent_tokenize_with_spans(text)
+
+    def _normalize_sentence(self, text):
+        return normalize_punct(text)
+
+    def _clean_sentence(self, start, end):
+        # The whitespace separated words of the sentence, rebuilt from its tokens
+        whitespaced_tokens = whitespace_words(self.tokens.spans(*self.tokens.index_range(start, end)))
+
+        # remove non ethiopic chars and ethiopic punctuations
+        stripped_ethiopic_tokens = [token for token in strip_non_ethiopic(whitespaced_tokens) if token]
+        return " ".join(stripped_ethiopic_tokens)
+
+
+def make_pipeline(keep_abbrev: bool = False, pipeline: Optional[List[Callable]] = None) -> Language:
+    """ Returns the processing pipeline of Amharic, see :class:`Language`.
+
+    Its `text` components are the steps of :func:`clean_amharic`: a component per cleaner of `pipeline`,
+    then the normalizers and `remove_punctuation`, so the `cleaned` text of its documents is the one of
+    :func:`clean_amharic`. `normalize_labialized` and `normalize_char` are disabled by default. Its `doc` components are
+    `tokenizer` (`tokens` and `words`), `sentencizer` (`sentences`) and `stopwords` (`content_words`).
+    `stopwords` reads the words of `tokenizer`, it is disabled when `tokenizer` is.
+
+    Args:
+        keep_abbrev (bool, optional): keep the short forms, `normalize_shortened` is then disabled.
+            Defaults to False.
+        pipeline (Optional[List[Callable]], optional): the cleaners. Defaults to `DEFAULT_PIPELINE`.
+    """
+    nlp = Language("am", Amharic)
+    for cleaner in (DEFAULT_PIPELINE if pipeline is None else pipeline):
+        nlp.add_pipe(getattr(cleaner, "__name__", repr(cleaner)), cleaner, kind="text")
+    nlp.add_pipe("normalize_labialized", normalize_labialized, kind="text", disabled=True)
+    nlp.add_pipe("normalize_punct", normalize_punct, kind="text")
+    nlp.add_pipe("normalize_shortened", normalize_shortened, kind="text", disabled=keep_abbrev)
+    nlp.add_pipe("normalize_char", normalize_char, kind="text", disabled=True)
+    nlp.add_pipe(
+        "remove_punctuation", partial(remove_punctuation_and_whitespaces, keep_abbrev=keep_abbrev), kind="text"
+    )
+    nlp.add_pipe("tokenizer", tokenizer)
+    nlp.add_pipe("sentencizer", sentencizer)
+    nlp.add_pipe("stopwords", stopwords, requires=["tokenizer"])
+    return nlp
@@ -6,6 +6,7 @@ from functools import cached_property
 from typing import Callable, List, Optional
 
 # etnltk libraries
+from etnltk.common.ngrams import count_ngrams, iter_ngrams
 # from . import AmharicWord
 
 class WordStatMixin:
@@ -28,16 +29,10 @@ class WordStatMixin:
         if n <= 0:
             return []
 
-        grams = [tuple(self.words[i:i + n]) for i in range(len(self.words) - n + 1)]
+        grams = list(iter_ngrams(self.words, n))
         return grams
     
     def count_ngrams(self, n=2):
         """ Return dict includes n-grams (tuples of n successive words) and n-gram frequencies
         """
-        counts = defaultdict(int)
-        
-        ngrams = [ngram for ngram in self.ngrams(n)]
-        
-        for ngram in ngrams:
-            counts[ngram] += 1
-        return counts
\ No newline at end of file
+        return count_ngrams(self.words, n)
\ No newline at end of file
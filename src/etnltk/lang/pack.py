@@ -0,0 +1,238 @@
+# coding=utf-8
+#
+# Standard libraries
+import hashlib
+import importlib
+import json
+import os
+import pickle
+import pkgutil
+import sys
+from typing import Dict, List, Optional, Sequence
+
+# etnltk libraries
+from etnltk import __version__
+from etnltk.common.cache import once_per_key
+from etnltk.common.replacer import Replacer
+
+# Bump it when the content of `LanguagePack` changes, older packs are then rebuilt
+PACK_VERSION = 2
+
+LANGUAGES = ("am", "tg")
+
+# The normalization dictionaries of every language: ./lang/``lang``/data/``name``.json
+DICT_NAMES = (
+    "char_replacers_dict",
+    "punct_replacers_dict",
+    "labialized_dict",
+    "shortened_expansions_dict"
+)
+
+
+class LanguagePack(object):
+    """The ready-to-use data of a language, loaded with a single unpickle.
+
+    Attributes:
+        lang (str): language code, ``am`` or ``tg``.
+        source_hash (str): hash of the sources the pack was built from.
+        dicts (Dict[str, dict]): the normalization dictionaries, by name.
+        replacers (Dict[str, Replacer]): a :class:`Replacer` for every normalization dictionary, by name.
+        stop_words (frozenset): the stop words of the language.
+    """
+    def __init__(self, lang: str, source_hash: str, dicts: Dict[str, dict], stop_words: frozenset):
+        self.version = PACK_VERSION
+        self.lang = lang
+        self.source_hash = source_hash
+        self.dicts = dicts
+        self.replacers = {name: Replacer(replacements) for name, replacements in dicts.items()}
+        self.stop_words = stop_words
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(lang={self.lang!r}, source_hash={self.source_hash!r})"
+
+
+def _check_lang(func_name: str, lang: str):
+    if lang not in LANGUAGES:
+        raise ValueError(f"{func_name}: `lang` must be one of {LANGUAGES}, not {lang!r}")
+
+
+def _read_source(lang: str, name: str) -> bytes:
+    return pkgutil.get_data("etnltk.lang", "{0}/data/{1}.json".format(lang, name))
+
+
+def _source_paths(lang: str) -> List[str]:
+    """Returns the files a pack of `lang` is built from: the json dictionaries and the stop words."""
+    lang_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), lang)
+    paths = [os.path.join(lang_dir, "data", f"{name}.json") for name in DICT_NAMES]
+    paths.append(os.path.join(lang_dir, "stop_words.py"))
+    return paths
+
+
+def _load_stop_words(lang: str) -> frozenset:
+    return frozenset(importlib.import_module(f"etnltk.lang.{lang}.stop_words").STOP_WORDS)
+
+
+def source_hash(lang: str) -> str:
+    """ Returns the hash identifying the sources a pack of `lang` is built from:
+    the etnltk version, the pack format and the size and modification time of every source file.
+    It only stats the files, so checking the cache is cheap. A cached pack with another hash is outdated.
+    """
+    _check_lang("source_hash", lang)
+    hasher = hashlib.sha256()
+    hasher.update(f"{__version__}:{PACK_VERSION}:{sys.version_info[0]}.{sys.version_info[1]}".encode("utf-8"))
+    for path in _source_paths(lang):
+        hasher.update(os.path.basename(path).encode("utf-8"))
+        try:
+            stat = os.stat(path)
+        except OSError:
+            # Not installed as plain files (e.g. a zip), only the version identifies the sources
+            continue
+        hasher.update(f":{stat.st_size}:{stat.st_mtime_ns};".encode("utf-8"))
+    return hasher.hexdigest()
+
+
+def build_pack(lang: str) -> LanguagePack:
+    """ Builds the pack of a language from its sources, without using the cache.
+    """
+    _check_lang("build_pack", lang)
+    dicts = {}
+    for name in DICT_NAMES:
+        dicts[name] = json.loads(_read_source(lang, name).decode("utf-8"))
+
+    # Update the `shortened_expansions_dict` to support both `.` and `/`` patterns like አ.አ and አ/አ
+    shortened_expansions_dict = dicts["shortened_expansions_dict"]
+    shortened_expansions_dict.update({k.replace(".", "/"): v for k, v in shortened_expansions_dict.items()})
+
+    return LanguagePack(lang, source_hash(lang), dicts, _load_stop_words(lang))
+
+
+def get_cache_dir() -> str:
+    """ Returns the directory of the cached packs:
+    ``$ETNLTK_CACHE_DIR``, else ``$XDG_CACHE_HOME/etnltk``, else ``~/.cache/etnltk``.
+    """
+    cache_dir = os.environ.get("ETNLTK_CACHE_DIR")
+    if not cache_dir:
+        cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        cache_dir = os.path.join(cache_home, "etnltk")
+    return cache_dir
+
+
+def _pack_path(cache_dir: str, lang: str, pack_hash: str) -> str:
+    return os.path.join(cache_dir, f"{lang}-{pack_hash[:16]}.pack")
+
+
+def save_pack(pack: LanguagePack, cache_dir: Optional[str] = None) -> str:
+    """ Writes a pack to the cache and removes the outdated packs of its language.
+
+    Returns:
+        str: path of the pack file.
+    """
+    # Only needed when a pack is written, they are slow to import
+    import glob
+    import tempfile
+
+    cache_dir = cache_dir or get_cache_dir()
+    os.makedirs(cache_dir, exist_ok=True)
+    path = _pack_path(cache_dir, pack.lang, pack.source_hash)
+
+    # Written to a temporary file first, so other processes never read half a pack
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix=f".{pack.lang}-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            pickle.dump(pack, file, protocol=pickle.HIGHEST_PROTOCOL)
+        # `mkstemp` creates the file readable by its owner only
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+    for outdated_path in glob.glob(os.path.join(cache_dir, f"{pack.lang}-*.pack")):
+        if outdated_path != path:
+            try:
+                os.unlink(outdated_path)
+            except OSError:
+                pass
+    return path
+
+
+def _read_pack(path: str, pack_hash: str) -> Optional[LanguagePack]:
+    try:
+        with open(path, "rb") as file:
+            pack = pickle.load(file)
+    except Exception:
+        # A corrupted or incompatible pack, it is rebuilt
+        return None
+    if getattr(pack, "version", None) != PACK_VERSION or getattr(pack, "source_hash", None) != pack_hash:
+        return None
+    return pack
+
+
+@once_per_key
+def load_pack(lang: str) -> LanguagePack:
+    """ Returns the pack of a language, loaded once per process, even when threads ask for it at the same time.
+
+    The pack is read from the cache directory (see :func:`get_cache_dir`).
+    When it is missing or its sources changed, it is built and written to the cache.
+    If the cache directory is not writable, the pack is only kept in memory.
+
+    Args:
+        lang (str): language code, ``am`` or ``tg``.
+
+    Returns:
+        LanguagePack: the data of the language.
+    """
+    _check_lang("load_pack", lang)
+    cache_dir = get_cache_dir()
+    pack_hash = source_hash(lang)
+    pack = _read_pack(_pack_path(cache_dir, lang, pack_hash), pack_hash)
+    if pack is not None:
+        return pack
+
+    pack = build_pack(lang)
+    try:
+        save_pack(pack, cache_dir)
+    except OSError:
+        pass
+    return pack
+
+
+def compile_packs(langs: Sequence[str] = LANGUAGES, cache_dir: Optional[str] = None) -> List[str]:
+    """ Builds and caches the packs of languages, e.g. before starting worker processes
+    or when building a container image.
+
+    Args:
+        langs (Sequence[str], optional): language codes. Defaults to all languages.
+        cache_dir (Optional[str], optional): where the packs are written. Defaults to :func:`get_cache_dir`.
+
+    Returns:
+        List[str]: paths of the pack files.
+    """
+    return [save_pack(build_pack(lang), cache_dir) for lang in langs]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m etnltk.lang.pack",
+        description="Compile the language data of etnltk into cached binary packs.",
+    )
+    parser.add_argument("langs", nargs="*", default=list(LANGUAGES),
+                        help="languages to compile: am, tg (default: all)")
+    parser.add_argument("--cache-dir", default=None,
+                        help="where the packs are written (default: $ETNLTK_CACHE_DIR or ~/.cache/etnltk)")
+    args = parser.parse_args(argv)
+    for lang in args.langs:
+        if lang not in LANGUAGES:
+            parser.error(f"unknown language {lang!r}, expected one of {LANGUAGES}")
+
+    for path in compile_packs(args.langs, args.cache_dir):
+        print(path)
+    return 0
+
+
+if __name__ == "__main__":
+    # Use the imported module, so the pickled packs refer to `etnltk.lang.pack` and not to `__main__`
+    from etnltk.lang.pack import main as _main
+    sys.exit(_main())
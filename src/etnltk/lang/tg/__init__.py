@@ -2,7 +2,7 @@
 #
 # Standard libraries
 from collections import defaultdict
-from functools import cached_property
+from functools import cached_property, partial
 from typing import Callable, List, Optional
 
 # etnltk libraries
@@ -11,12 +11,14 @@ from etnltk.common.doc import (
     Sentence,
     Word
 )
+from etnltk.common.tokens import TokenTable
+from etnltk.common.vocab import get_vocab
+from etnltk.common.ngrams import count_ngrams, iter_ngrams
+from etnltk.tokenize.wordpunct import ethiopic_words
 
-from etnltk.tokenize.tg import (
-    word_tokenize,
-    sent_tokenize,
-    EthiopicSentenceTokenizer
-)
+# Imported as a module: `etnltk.tokenize.tg` imports this package while it is itself being
+# imported, so its functions are looked up when they are called.
+from etnltk.tokenize import tg as tg_tokenize
 
 from etnltk.common.preprocessing import (
     remove_links,
@@ -31,6 +33,11 @@ from etnltk.common.preprocessing import (
     remove_whitespaces
 )
 
+from etnltk.common.compiler import compile_pipeline
+from etnltk.common.utf8 import as_text
+from etnltk.common.language import Language, sentencizer, stopwords, tokenizer
+from etnltk.common.instrumentation import instrumented
+
 from etnltk.common.ethiopic import (
     remove_ethiopic_digits,
     remove_non_ethiopic,
@@ -39,6 +46,7 @@ from etnltk.common.ethiopic import (
 
 from .preprocessing import (
     remove_punctuation,
+    remove_punctuation_and_whitespaces,
     remove_stopwords,
     replace_apostrophe
 )
@@ -52,6 +60,14 @@ from .normalizer import (
 
 from .stop_words import STOP_WORDS
 
+
+def __getattr__(name: str):
+    # `word_tokenize`, `sent_tokenize` and `EthiopicSentenceTokenizer` are still available from here
+    if name in ("word_tokenize", "sent_tokenize", "EthiopicSentenceTokenizer"):
+        return getattr(tg_tokenize, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 DEFAULT_PIPELINE: List[Callable] = [
     remove_links,
     remove_tags,
@@ -67,7 +83,8 @@ DEFAULT_PIPELINE: List[Callable] = [
 ]
 
 
-def clean_tigrigna(text: str, keep_abbrev=False, pipeline: Optional[List[Callable]] = None):
+@instrumented("clean_tigrigna")
+def clean_tigrigna(text: str, keep_abbrev=False, pipeline: Optional[List[Callable]] = None, errors: str = "strict"):
     """ Returns a preprocessed copy of *text*,
     by executing a series of data preprocessing steps defined in pipeline.
 
@@ -75,6 +92,8 @@ def clean_tigrigna(text: str, keep_abbrev=False, pipeline: Optional[List[Callabl
         text (str): _description_
         abbrev (bool, optional): _description_. Defaults to False.
         pipeline (Optional[List[Callable]], optional): _description_. Defaults to None.
+        errors (str, optional): when `text` is UTF-8 bytes, the policy for invalid UTF-8:
+            "strict", "replace" or "skip". Defaults to "strict".
 
     Raises:
         ValueError: _description_
@@ -84,12 +103,13 @@ def clean_tigrigna(text: str, keep_abbrev=False, pipeline: Optional[List[Callabl
     """
     if text is None:
         raise ValueError("clean_tigrigna: `text` can't be `None`")
+    text = as_text(text, errors)
 
     if pipeline is None:
         pipeline = DEFAULT_PIPELINE
 
-    for pipe_func in pipeline:
-        text = pipe_func(text)
+    # Built-in preprocessing steps are fused into as few scans as possible
+    text = compile_pipeline(pipeline)(text)
 
     text = normalize_punct(text)
 
@@ -100,9 +120,7 @@ def clean_tigrigna(text: str, keep_abbrev=False, pipeline: Optional[List[Callabl
 
     text = normalize_char(text)
 
-    text = remove_punctuation(text, keep_abbrev=keep_abbrev)
-
-    text = remove_whitespaces(text)
+    text = remove_punctuation_and_whitespaces(text, keep_abbrev=keep_abbrev)
 
     if isinstance(text, str):
         processed_text = text
@@ -132,6 +150,7 @@ def normalize(text: str) -> str:
 
 
 class TigrignaWord(Word):
+    __slots__ = ()
 
     @property
     def is_stopword(self):
@@ -141,18 +160,27 @@ class TigrignaWord(Word):
         return self._check_stopword()
 
     def _check_stopword(self):
-        if self._string in STOP_WORDS:
-            return True
-        else:
-            return False
+        # Read from the flags of the vocabulary, an unknown word is not added to it
+        return get_vocab("tg").is_stop(self._string)
 
 
 class Tigrigna(Document):
-    def __init__(self, text, clean_text=True):
-        super().__init__(text, lang="am")
+    """A Tigrigna document.
 
-        if clean_text:
-            self.cleaned = clean_tigrigna(text)
+    The text is analysed once, on the first access to `tokens`, `words` or `sentences`,
+    and all of them are derived from that analysis. `cleaned` is computed on its first access.
+    """
+    def __init__(self, text, clean_text=True, errors="strict"):
+        """
+        Args:
+            text (str): the text, or its UTF-8 bytes, e.g. a `memoryview` of a memory-mapped file.
+            clean_text (bool, optional): kept for compatibility. Defaults to True.
+            errors (str, optional): for bytes, the policy for invalid UTF-8: "strict", "replace" or "skip".
+                Defaults to "strict".
+        """
+        super().__init__(text, lang="am", errors=errors)
+        # Kept for compatibility, `cleaned` is computed when it is first accessed
+        self.clean_text = clean_text
 
     def __repr__(self):
         """Returns a string representation for debugging.
@@ -160,25 +188,32 @@ class Tigrigna(Document):
         cls_name = self.__class__.__name__
         return f'{cls_name}("{self.cleaned}")'
 
+    @cached_property
+    def cleaned(self):
+        """The text cleaned by :func:`clean_tigrigna`.
+        """
+        return clean_tigrigna(self.raw)
+
     @cached_property
     def tokens(self):
         """Return a list of tokens. This includes
         An individual token – i.e. a word, punctuation symbol, whitespace.
 
-        :returns: A :class:`List<TigrignaWord>` of tokens.
+        The tokens are the analysis every other layer is derived from, they are stored by columns
+        with their offsets in `raw` and their flags, see :class:`TokenTable`.
+
+        :returns: A :class:`TokenTable` of :class:`TigrignaWord` tokens.
         """
-        word_tokens = word_tokenize(self.raw, return_word=False)
-        return [TigrignaWord(w) for w in word_tokens]
+        return TokenTable(self._token_spans(self.raw), word_class=TigrignaWord, vocab=get_vocab("tg"))
 
     @cached_property
     def words(self):
         """Return a list of word tokens. This excludes punctuation characters.
         If you want to include punctuation characters, access the ``tokens`` property.
 
-        :returns: A :class:`List<TigrignaWord>` of word tokens.
+        :returns: A :class:`TokenTable` of :class:`TigrignaWord` word tokens.
         """
-        tokenized_words = word_tokenize(self.raw, return_word=True)
-        return [TigrignaWord(w) for w in tokenized_words]
+        return TokenTable(ethiopic_words(self.tokens.spans()), word_class=TigrignaWord, vocab=get_vocab("tg"))
 
     @cached_property
     def word_counts(self):
@@ -199,9 +234,15 @@ class Tigrigna(Document):
         if n <= 0:
             return []
 
-        grams = [TigrignaWord(tuple(self.words[i:i + n])) for i in range(len(self.words) - n + 1)]
+        grams = [TigrignaWord(gram) for gram in iter_ngrams(self.words.texts(), n)]
         return grams
 
+    def count_ngrams(self, n=2):
+        """Return a dict of the n-grams (tuples of n successive words) of this document
+        and their frequencies. Pass several n, e.g. ``(1, 2, 3)``, to get the counts of every n.
+        """
+        return count_ngrams(self.words.texts(), n)
+
     @cached_property
     def sentences(self):
         """Return list of :class:`Sentence <Sentence>` objects.
@@ -210,28 +251,54 @@ class Tigrigna(Document):
 
     def _create_sentence_objects(self):
 
-        self._sentences = []
-        sentences = EthiopicSentenceTokenizer().tokenize(self.raw)
+        # `EthiopicSentenceTokenizer` normalizes punctuation,
+        # the spans are mapped back to offsets in `raw`
+        sentences = self._sentence_spans(self.raw)
 
-        # Since `EthiopicSentenceTokenizer` normalizes punctuation
-        # `raw` has to be also normalized to extact spans
-        punct_norm_text = normalize_punct(self.raw)
+        # Sentences are views of the document, their texts are built when they are accessed
+        self._sentences = [Sentence(self, start_index, end_index) for _, start_index, end_index in sentences]
+        return self._sentences
 
-        char_index = 0  # Keeps track of character index within the blob
-        for raw_sent in sentences:
-            # Compute the start and end indices of the sentence
-            # within the blob
-            start_index = punct_norm_text.index(raw_sent, char_index)
-            char_index += len(raw_sent)
-            end_index = start_index + len(raw_sent)
+    def _token_spans(self, text):
+        return tg_tokenize.word_tokenize_with_spans(text, return_word=False)
 
-            # Split sentence into word tokens 
-            stripped_sentence = word_tokenize(raw_sent)
+    def _sentence_spans(self, text):
+        return tg_tokenize.sent_tokenize_with_spans(text)
 
-            # Join word tokens into a single sentence                
-            clean_sent = " ".join(stripped_sentence)
+    def _normalize_sentence(self, text):
+        return normalize_punct(text)
 
-            # Sentences share the same models as their parent blob
-            sent = Sentence(raw_sent, start_index=start_index, end_index=end_index, clean_sentence=clean_sent)
-            self._sentences.append(sent)
-        return self._sentences
+    def _clean_sentence(self, start, end):
+        # Join the word tokens of the sentence into a single sentence
+        return " ".join(self.words.texts(*self.words.index_range(start, end)))
+
+
+def make_pipeline(keep_abbrev: bool = False, pipeline: Optional[List[Callable]] = None) -> Language:
+    """ Returns the processing pipeline of Tigrigna, see :class:`Language`.
+
+    Its `text` components are the steps of :func:`clean_tigrigna`: a component per cleaner of `pipeline`,
+    then the normalizers and `remove_punctuation`, so the `cleaned` text of its documents is the one of
+    :func:`clean_tigrigna`. `normalize_labialized` is disabled by default. Its `doc` components are
+    `tokenizer` (`tokens` and `words`), `sentencizer` (`sentences`) and `stopwords` (`content_words`).
+    `stopwords` reads the words of `tokenizer`, it is disabled when `tokenizer` is.
+
+    Args:
+        keep_abbrev (bool, optional): keep the short forms, `normalize_shortened` is then disabled.
+            Defaults to False.
+        pipeline (Optional[List[Callable]], optional): the cleaners. Defaults to `DEFAULT_PIPELINE`.
+    """
+    nlp = Language("tg", Tigrigna)
+    for cleaner in (DEFAULT_PIPELINE if pipeline is None else pipeline):
+        nlp.add_pipe(getattr(cleaner, "__name__", repr(cleaner)), cleaner, kind="text")
+    nlp.add_pipe("normalize_punct", normalize_punct, kind="text")
+    nlp.add_pipe("replace_apostrophe", replace_apostrophe, kind="text")
+    nlp.add_pipe("normalize_shortened", normalize_shortened, kind="text", disabled=keep_abbrev)
+    nlp.add_pipe("normalize_char", normalize_char, kind="text")
+    nlp.add_pipe("normalize_labialized", normalize_labialized, kind="text", disabled=True)
+    nlp.add_pipe(
+        "remove_punctuation", partial(remove_punctuation_and_whitespaces, keep_abbrev=keep_abbrev), kind="text"
+    )
+    nlp.add_pipe("tokenizer", tokenizer)
+    nlp.add_pipe("sentencizer", sentencizer)
+    nlp.add_pipe("stopwords", stopwords, requires=["tokenizer"])
+    return nlp
@@ -1,71 +1,104 @@
 # coding=utf-8
 #
 # Standard libraries
-import json
-import pkgutil
-
-# Third party libraries
-from textsearch import TextSearch
+import time
+from functools import partial
 
 # etnltk libraries
+from etnltk.common.alignment import Alignment
+from etnltk.common.cache import once_per_thread
+from etnltk.common.instrumentation import get_instrumentation
+from etnltk.lang.pack import load_pack
+
+
+def _replace(text: str, ts_replacer, return_alignment: bool = False, stage: str = ""):
+    instrumentation = get_instrumentation()
+    if instrumentation is not None:
+        start = time.perf_counter()
+        replaced, entities = ts_replacer.replace(text, return_entities=True)
+        instrumentation.record(stage, time.perf_counter() - start, len(text), len(replaced), len(entities))
+        return (replaced, Alignment.from_replacements(entities)) if return_alignment else replaced
+    if return_alignment:
+        replaced, entities = ts_replacer.replace(text, return_entities=True)
+        return replaced, Alignment.from_replacements(entities)
+    return ts_replacer.replace(text)
 
 
-def _load_json_data(name: str):
+def load_dict(name: str) -> dict:
     """
-    Load a json content from ./lang/tg/data/``name``.json and return it.
+    Return a Tigrigna normalization dictionary from the language pack.
+    The dictionaries are: ``char_replacers_dict``, ``punct_replacers_dict``,
+    ``labialized_dict`` and ``shortened_expansions_dict``.
     """
-    json_data = pkgutil.get_data("etnltk.lang", "tg/data/{0}.json".format(name))
-    return json.loads(json_data.decode("utf-8"))
+    return load_pack("tg").dicts[name]
 
-def _replace(text: str, ts_replacer: TextSearch) -> str:
-    return ts_replacer.replace(text)
 
-# Load the Amharic character levels replacers dictionary
-char_replacers_dict = _load_json_data("char_replacers_dict")
-
-# Load the Amharic punctuation replacers dictionary
-punct_replacers_dict = _load_json_data("punct_replacers_dict")
+@once_per_thread
+def load_replacer(name: str):
+    """
+    Build a `textsearch.TextSearch` replacer of a Tigrigna normalization dictionary on first use and return it.
+    A `TextSearch` is not safe to share, every thread gets its own.
+    The normalizers use the precompiled replacers of the language pack instead, they are only read and are
+    shared by all threads.
+    """
+    # `textsearch` is only imported when a TextSearch replacer is asked for
+    from textsearch import TextSearch
 
-# Load the Amharic character labialized dictionary
-labialized_dict = _load_json_data("labialized_dict")
+    # `sensitive` does not do any conversion to lower case before matching.
+    # TextSearch will only match on exact words added.
+    ts_replacer = TextSearch("sensitive", "object")
+    ts_replacer.add(load_dict(name))
+    # Build the automaton now, instead of on the first `replace` call
+    ts_replacer.build_automaton()
+    return ts_replacer
 
-# Load the Amharic short form expansions dictionary
-shortened_expansions_dict = _load_json_data("shortened_expansions_dict")
 
-# Update the `shortened_expansions_dict` to support both `.` and `/`` patterns like አ.አ and አ/አ
-shortened_expansions_dict.update({k.replace(".", "/"): v for k, v in shortened_expansions_dict.items()})
+# The module level dictionaries and replacers, created on first access
+_LAZY_ATTRIBUTES = {
+    "char_replacers_dict": partial(load_dict, "char_replacers_dict"),
+    "punct_replacers_dict": partial(load_dict, "punct_replacers_dict"),
+    "labialized_dict": partial(load_dict, "labialized_dict"),
+    "shortened_expansions_dict": partial(load_dict, "shortened_expansions_dict"),
+    "ts_char_replacer": partial(load_replacer, "char_replacers_dict"),
+    "ts_labialized_replacer": partial(load_replacer, "labialized_dict"),
+    "ts_expand_shortened_replacer": partial(load_replacer, "shortened_expansions_dict"),
+    "ts_punct_replacer": partial(load_replacer, "punct_replacers_dict"),
+}
 
-# `sensitive` does not do any conversion to lower case before matching.
-# TextSearch will only match on exact words added.
 
-ts_char_replacer = TextSearch("sensitive", "object") 
-ts_char_replacer.add(char_replacers_dict)
+def __getattr__(name: str):
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-ts_labialized_replacer = TextSearch("sensitive", "object") 
-ts_labialized_replacer.add(labialized_dict)
 
-ts_expand_shortened_replacer = TextSearch("sensitive", "object")
-ts_expand_shortened_replacer.add(shortened_expansions_dict)
+# With `return_alignment`, the normalizers return the normalized text and the
+# `Alignment` mapping its offsets back to `text`.
 
-ts_punct_replacer =TextSearch("sensitive", "object")
-ts_punct_replacer.add(punct_replacers_dict)
 
-def normalize_char(text: str) -> str:
+def normalize_char(text: str, return_alignment: bool = False):
     # Character Level Normalization 
     # such as ጸሀይ and ፀሐይ.
-    return _replace(text, ts_replacer=ts_char_replacer)
+    return _replace(text, ts_replacer=load_pack("tg").replacers["char_replacers_dict"],
+                    return_alignment=return_alignment, stage="tg.normalize_char")
+
 
-def normalize_punct(text: str) -> str:
+def normalize_punct(text: str, return_alignment: bool = False):
     # Punctuation Normalization 
     # such as :: to ።.
-    return _replace(text, ts_replacer=ts_punct_replacer)
+    return _replace(text, ts_replacer=load_pack("tg").replacers["punct_replacers_dict"],
+                    return_alignment=return_alignment, stage="tg.normalize_punct")
 
-def normalize_labialized(text: str) -> str:
-    # Labialized Character Normalzation 
+
+def normalize_labialized(text: str, return_alignment: bool = False):
+    #  Labialized Character Normalization
     # such as ሞልቱዋል to ሞልቷል
-    return _replace(text, ts_replacer=ts_labialized_replacer)
+    return _replace(text, ts_replacer=load_pack("tg").replacers["labialized_dict"],
+                    return_alignment=return_alignment, stage="tg.normalize_labialized")
+
 
-def normalize_shortened(text: str) -> str:
+def normalize_shortened(text: str, return_alignment: bool = False):
     # Short Form Expansion 
     # such as ጠ/ሚ to ጠቅላይ ሚኒስተር.
-    return _replace(text, ts_replacer=ts_expand_shortened_replacer)
\ No newline at end of file
+    return _replace(text, ts_replacer=load_pack("tg").replacers["shortened_expansions_dict"],
+                    return_alignment=return_alignment, stage="tg.normalize_shortened")
@@ -5,9 +5,6 @@ from __future__ import unicode_literals
 import re
 from typing import List, Optional, Union
 
-# Third party libraries
-from textsearch import TextSearch
-
 # etnltk libraries
 from .punctuation import (
     ASSCII_PUNCT,
@@ -16,50 +13,68 @@ from .punctuation import (
 )
 
 from .stop_words import STOP_WORDS
+from etnltk.common.vocab import FLAG_STOP, get_vocab
 from etnltk.common.utils import is_chinese_char, regex_replace
+from etnltk.common.instrumentation import instrumented
+from etnltk.common.alignment import Alignment
+from etnltk.common.replacer import Replacer
 from etnltk.common.ethiopic import is_ethiopic, is_ethiopic_digit, ETHIOPIC_PUNCT
 
 
-def remove_punctuation(text: str, keep_abbrev: bool = True):
-    """Remove punctuations from a text string
-    """
-    if keep_abbrev:
-        # Removes all punctuations (ethiopic and ascii) except apostrophes, period and slash
-        # those are Tigrigna abbreviation punctuation marks
-        string_punctuations = ASSCII_ETHIOPIC_PUNCTS_WITHOUT_TIGRIGNA_ABBREV_PUNCT
-    else:
-        # Removes all punctuations (ethiopic and ascii) marks
-        string_punctuations = ASSCII_PUNCT + ETHIOPIC_PUNCT + "’"
+# Removes all punctuations (ethiopic and ascii) marks
+_all_punct = ASSCII_PUNCT + ETHIOPIC_PUNCT + "’"
 
-    return _remove_punct(text, punctuations=string_punctuations)
+# Removes all punctuations (ethiopic and ascii) except apostrophes, period and slash
+# those are Tigrigna abbreviation punctuation marks
+_punct_without_abbrev = ASSCII_ETHIOPIC_PUNCTS_WITHOUT_TIGRIGNA_ABBREV_PUNCT
 
+# Whitespaces only separate the punctuation marks, they are never removed
+PUNCT_TABLE = str.maketrans('', '', "".join(_all_punct.split()))
+PUNCT_TABLE_WITHOUT_ABBREV = str.maketrans('', '', "".join(_punct_without_abbrev.split()))
 
-def _remove_punct(text: str, punctuations) -> str:
-    if not len(punctuations.strip()):
-        raise ValueError(f"{__name__}: `punctuation` can't be `empty string`")
+REGEX_PUNCT = re.compile("[{0}]+".format(re.escape("".join(_all_punct.split()))))
+REGEX_PUNCT_WITHOUT_ABBREV = re.compile("[{0}]+".format(re.escape("".join(_punct_without_abbrev.split()))))
+REGEX_APOSTROPHE = re.compile(r"'[^a-zA-Z0-9'+\r\n\s]|’[^a-zA-Z0-9’+\r\n\s]")
+
+
+def remove_punctuation(text: str, keep_abbrev: bool = True):
+    """Remove punctuations from a text string
+    """
+    table = PUNCT_TABLE_WITHOUT_ABBREV if keep_abbrev else PUNCT_TABLE
 
     # Split into words by white space
     words = text.split()
 
     # Remove punctuation from each word
-    table = str.maketrans('', '', punctuations)
-
     return " ".join([w.translate(table) for w in words])
 
 
-def replace_apostrophe(text: str) -> str:
+@instrumented("tg.remove_punctuation_and_whitespaces")
+def remove_punctuation_and_whitespaces(text: str, keep_abbrev: bool = True) -> str:
+    """Remove punctuations, extra spaces, tabs, and new lines from a text string.
+    Same as `remove_whitespaces(remove_punctuation(text))`, without splitting the text into words first.
+    """
+    pattern = REGEX_PUNCT_WITHOUT_ABBREV if keep_abbrev else REGEX_PUNCT
+    return " ".join(regex_replace(text, pattern=pattern, replace='').split())
+
+
+@instrumented("tg.replace_apostrophe")
+def replace_apostrophe(text: str, return_alignment: bool = False):
     # ደኣ'ምበር -> ደኣ እምበር
-    regex_pattern = re.compile(r"'[^a-zA-Z0-9'+\r\n\s]|’[^a-zA-Z0-9’+\r\n\s]")
-    matches = re.findall(regex_pattern, text)
+    # With `return_alignment`, returns the text and the `Alignment` mapping its offsets back to `text`.
+    # Most texts have no apostrophe, they are not scanned by the regex
+    if "'" not in text and "’" not in text:
+        return (text, Alignment()) if return_alignment else text
+    matches = REGEX_APOSTROPHE.findall(text)
     if matches:
         replacer = " እ"
         replacers = {match: f"{replacer}{match[1]}" for match in matches}
 
-        ts = TextSearch("sensitive", "object")
-        ts.add(replacers)
-
-        return ts.replace(text)
-    return text
+        if return_alignment:
+            replaced, entities = Replacer(replacers).replace(text, return_entities=True)
+            return replaced, Alignment.from_replacements(entities)
+        return Replacer(replacers).replace(text)
+    return (text, Alignment()) if return_alignment else text
 
 
 def remove_stopwords(text_or_list: Union[str, List[str]], stop_words: Optional[set] = None) -> List[str]:
@@ -73,7 +88,8 @@ def remove_stopwords(text_or_list: Union[str, List[str]], stop_words: Optional[s
         List[str]: list of words
     """
     if stop_words is None:
-        stop_words = STOP_WORDS
+        # The stop words of the language are flagged in its vocabulary
+        return _remove_stopwords_by_flag(text_or_list, get_vocab("tg"))
     if isinstance(stop_words, list):
         stop_words = set(stop_words)
 
@@ -84,3 +100,14 @@ def remove_stopwords(text_or_list: Union[str, List[str]], stop_words: Optional[s
         result_tokens = [token for token in text_or_list
                          if (token not in stop_words and token is not None and len(token) > 0)]
     return result_tokens
+
+
+def _remove_stopwords_by_flag(text_or_list: Union[str, List[str]], vocab) -> List[str]:
+    if isinstance(text_or_list, str):
+        tokens = text_or_list.split()
+    else:
+        tokens = [token for token in text_or_list if token is not None and len(token) > 0]
+    # Looked up without adding the words, an unknown word is not a stop word
+    flags = vocab.flags
+    return [token for token, word_id in zip(tokens, vocab.lookup(tokens))
+            if word_id == -1 or not flags[word_id] & FLAG_STOP]
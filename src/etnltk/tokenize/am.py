@@ -4,16 +4,25 @@ from __future__ import unicode_literals
 # Standard libraries
 import re
 import unicodedata
-from typing import List
+from functools import partial
+from itertools import chain
+from typing import Iterable, Iterator, List
 
 # etnltk libraries
 from .line import LineTokenizer
 from .regexp import RegexpTokenizer
 from .space import whitespace_tokenize
+from .stream import SentenceSegmenter
+from .wordpunct import TokenSpan, WordPunctTokenizer, ethiopic_words, expand_tokens, strip_non_ethiopic
 
-from ..common.ethiopic import remove_non_ethiopic, remove_ethiopic_punctuation
 from ..lang.am.punctuation import AMHARIC_SENT_PUNCT, ASSCII_ETHIOPIC_PUNCTS_WITHOUT_AMHARIC_ABBREV_PUNCT
 from ..lang.am.normalizer import normalize_punct, normalize_shortened
+from ..lang.pack import load_pack
+from ..common.cache import get_token_cache, tokenize_chunks
+from ..common.utf8 import as_text, iter_decode
+
+# Splits on all punctuation marks, except the Amharic abbreviation punctuation marks (`.` and `/`)
+_wordpunct_tokenizer = WordPunctTokenizer(ASSCII_ETHIOPIC_PUNCTS_WITHOUT_AMHARIC_ABBREV_PUNCT)
 
 
 class EthiopicSentenceTokenizer(object):
@@ -34,6 +43,7 @@ class EthiopicSentenceTokenizer(object):
             self.sent_end_chars_regex = AMHARIC_SENT_PUNCT  # Default sent_end_chars ("፤", "፥", "።")
 
         self.pattern = rf"(?<=[{self.sent_end_chars_regex}])\s"
+        self._regexp = re.compile(self.pattern, re.UNICODE | re.MULTILINE | re.DOTALL)
 
     def tokenize(self, text: str) -> List[str]:
         """Method for tokenizing sentences with regular expressions.
@@ -45,92 +55,166 @@ class EthiopicSentenceTokenizer(object):
         Returns:
             List[str]: tokenized sentence list
         """
+        return [sentence for sentence, _, _ in self.tokenize_with_spans(text)]
+
+    def tokenize_with_spans(self, text: str) -> List[TokenSpan]:
+        """Tokenize a text into sentences, every sentence comes with its (start, end) offsets in `text`.
+        The sentences are punctuation normalized, the offsets point at the original punctuation marks.
+
+        Args:
+            text (str): text to be tokenized into sentences
+
+        Returns:
+            List[TokenSpan]: list of (sentence, start, end)
+        """
         # punctuation normalization 
         # :: -> ። 
-        punct_norm_text = normalize_punct(text)
-
-        sentences = [
-            sent for sent in RegexpTokenizer(pattern=self.pattern, gaps=True).tokenize(punct_norm_text) if
-            len(sent.strip())
-        ]
+        punct_norm_text, alignment = normalize_punct(text, return_alignment=True)
+
+        sentences = []
+        start = 0
+        for separator in chain(self._regexp.finditer(punct_norm_text), [None]):
+            end = separator.start() if separator else len(punct_norm_text)
+            sentence = punct_norm_text[start:end]
+            if len(sentence.strip()):
+                sentences.append((sentence, *alignment.input_span(start, end)))
+            if separator:
+                start = separator.end()
         return sentences
 
+    def segmenter(self) -> SentenceSegmenter:
+        """Returns a :class:`SentenceSegmenter` splitting a text given in chunks like `tokenize`,
+        e.g. a text read from a socket.
+        """
+        return SentenceSegmenter(self._regexp, normalize_punct)
+
+
+# Used by `sent_tokenize`, its pattern is compiled once
+_sentence_tokenizer = EthiopicSentenceTokenizer()
+
 
 # Sentence tokenizer.
-def sent_tokenize(text: str) -> List[str]:
+def sent_tokenize(text: str, errors: str = "strict") -> List[str]:
     """ Return a sentence-tokenized copy of *text*
     uses an instance of EthiopicSentenceTokenizer.
 
     Args:
-        text (str): text to split into sentences
+        text (str): text to split into sentences, or its UTF-8 bytes
+        errors (str, optional): the policy for invalid UTF-8 when `text` is bytes,
+            "strict", "replace" or "skip". Defaults to "strict".
 
     Returns:
         List[str]: _description_
     """
-    sentences = EthiopicSentenceTokenizer().tokenize(text)
+    text = as_text(text, errors)
+    return [_strip_sentence(sent) for sent in _sentence_tokenizer.tokenize(text)]
 
-    stripped_sentences: List = []
-    for sent in sentences:
-        # Split into words by white space                
-        expanded_words = normalize_shortened(sent)
 
-        # Split into words by white space
-        # Remove extra spaces, tabs, and new lines
-        whitespaced_tokens = whitespace_tokenize(expanded_words)
+def sent_tokenize_with_spans(text: str, errors: str = "strict") -> List[TokenSpan]:
+    """ Tokenize a text into punctuation normalized sentences, with their (start, end) offsets in `text`.
+    Uses the shared instance of EthiopicSentenceTokenizer.
 
-        # remove_non_ethiopic and ethiopic punctuations
-        ethiopic_tokens = [
-            remove_non_ethiopic(token) for token in whitespaced_tokens if len(remove_non_ethiopic(token).strip())
-        ]
-        stripped_ethiopic_tokens = [
-            remove_ethiopic_punctuation(token) for token in ethiopic_tokens if len(remove_ethiopic_punctuation(token).strip())
-        ]
+    Args:
+        text (str): text to split into sentences, or its UTF-8 bytes
+        errors (str, optional): the policy for invalid UTF-8 when `text` is bytes,
+            "strict", "replace" or "skip". Defaults to "strict".
+
+    Returns:
+        List[TokenSpan]: list of (sentence, start, end)
+    """
+    text = as_text(text, errors)
+    return _sentence_tokenizer.tokenize_with_spans(text)
 
-        stripped_sentences.append(" ".join(stripped_ethiopic_tokens))
 
-    return stripped_sentences
+def _strip_sentence(sent: str) -> str:
+    # Split into words by white space                
+    expanded_words = normalize_shortened(sent)
 
+    # Split into words by white space
+    # Remove extra spaces, tabs, and new lines
+    whitespaced_tokens = whitespace_tokenize(expanded_words)
 
-def wordpunct_tokenize(text: str) -> List[str]:
-    # punctuation = "!\"#$%&'()*+,-:;<=>?@[\]^`{|}~።፤;፦፥፧፨፠፣"
-    punctuation = "".join(ASSCII_ETHIOPIC_PUNCTS_WITHOUT_AMHARIC_ABBREV_PUNCT)
-    sentence_out = ""
-    for character in text:
-        if character in punctuation:
-            sentence_out += " %s " % character
-        else:
-            sentence_out += character
+    # remove_non_ethiopic and ethiopic punctuations
+    stripped_ethiopic_tokens = [token for token in strip_non_ethiopic(whitespaced_tokens) if token]
 
-    return sentence_out.split()
+    return " ".join(stripped_ethiopic_tokens)
 
 
-def word_tokenize(text: str, return_expand=True, return_word=True) -> List[str]:
-    """_summary_
+def sent_tokenize_stream(chunks: Iterable[str], errors: str = "strict") -> Iterator[str]:
+    """ Like `sent_tokenize` over the concatenated `chunks`, but every sentence is yielded
+    as soon as the chunk completing it is read, e.g. for a live feed.
 
     Args:
-        text (str): _description_
-        return_expand (bool, optional): _description_. Defaults to True.
-        return_word (bool, optional): _description_. Defaults to False.
+        chunks (Iterable[str]): the text, in chunks of any size, or its UTF-8 bytes in chunks split anywhere
+        errors (str, optional): the policy for invalid UTF-8, "strict", "replace" or "skip". Defaults to "strict".
 
     Returns:
-        List[str]: _description_
+        Iterator[str]: the sentences
     """
-    word_tokens = wordpunct_tokenize(text)
+    for sentence in _sentence_tokenizer.segmenter().segment(iter_decode(chunks, errors)):
+        yield _strip_sentence(sentence)
+
+
+def wordpunct_tokenize(text: str) -> List[str]:
+    """Tokenize a text into a sequence of words and single punctuation marks,
+    the Amharic abbreviation punctuation marks (`.` and `/`) do not split words.
+    """
+    return _wordpunct_tokenizer.tokenize(text)
+
+
+def word_tokenize_with_spans(text: str, return_expand=True, return_word=True, errors: str = "strict") -> List[TokenSpan]:
+    """ Tokenize a text into words, in one scan over the text.
+    Every token comes with its (start, end) offsets in `text`,
+    the words of an expanded short form share the offsets of the short form.
+
+    Args:
+        text (str): input text, or its UTF-8 bytes
+        return_expand (bool, optional): expand short forms, e.g. ጠ/ሚ to ጠቅላይ ሚኒስተር. Defaults to True.
+        return_word (bool, optional): keep only the ethiopic characters of the words
+            and drop the punctuation marks. Defaults to True.
+        errors (str, optional): the policy for invalid UTF-8 when `text` is bytes,
+            "strict", "replace" or "skip". Defaults to "strict".
+
+    Returns:
+        List[TokenSpan]: list of (token, start, end)
+    """
+    text = as_text(text, errors)
+    cache = get_token_cache()
+    if cache is not None:
+        # Every whitespace separated chunk is tokenized once
+        return tokenize_chunks(cache, ("am", return_expand, return_word), text,
+                               partial(_word_tokenize_with_spans, return_expand=return_expand, return_word=return_word))
+    return _word_tokenize_with_spans(text, return_expand, return_word)
+
+
+def _word_tokenize_with_spans(text: str, return_expand=True, return_word=True) -> List[TokenSpan]:
+    # Punctuation marks are dropped from words, they are not even tokenized
+    tokens = _wordpunct_tokenizer.tokenize_with_spans(text, words_only=return_word)
 
     # Expands shortened characters
     if return_expand:
-        expanded_words = normalize_shortened(" ".join(word_tokens))
-        word_tokens = whitespace_tokenize(expanded_words)
+        tokens = expand_tokens(tokens, load_pack("am").replacers["shortened_expansions_dict"])
 
     if return_word:
         # text cleaning, 
         # remove_non_ethiopic and ethiopic punctuations
-        word_tokens = [
-            remove_non_ethiopic(token) for token in word_tokens if len(remove_non_ethiopic(token).strip())
-        ]
-        word_tokens = [
-            remove_ethiopic_punctuation(token) for token in word_tokens if len(remove_ethiopic_punctuation(token).strip())
-        ]
-        return word_tokens
-
-    return word_tokens
+        tokens = ethiopic_words(tokens)
+    return tokens
+
+
+def word_tokenize(text: str, return_expand=True, return_word=True, errors: str = "strict") -> List[str]:
+    """ Tokenize a text into words.
+
+    Args:
+        text (str): input text, or its UTF-8 bytes
+        return_expand (bool, optional): expand short forms, e.g. ጠ/ሚ to ጠቅላይ ሚኒስተር. Defaults to True.
+        return_word (bool, optional): keep only the ethiopic characters of the words
+            and drop the punctuation marks. Defaults to True.
+        errors (str, optional): the policy for invalid UTF-8 when `text` is bytes,
+            "strict", "replace" or "skip". Defaults to "strict".
+
+    Returns:
+        List[str]: list of words
+    """
+    text = as_text(text, errors)
+    return [token for token, _, _ in word_tokenize_with_spans(text, return_expand, return_word)]
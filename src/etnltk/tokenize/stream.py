@@ -0,0 +1,129 @@
+# coding=utf-8
+#
+# Standard libraries
+import re
+from typing import Callable, Iterable, Iterator, List, Pattern
+
+# etnltk libraries
+from .wordpunct import TokenSpan
+
+_REGEX_WHITESPACE = re.compile(r"\s")
+
+
+def _whitespace_end(text: str) -> int:
+    """Returns the offset after the last whitespace of `text`, 0 if it has none."""
+    match = _REGEX_WHITESPACE.search(text[::-1])
+    return len(text) - match.start() if match else 0
+
+
+class SentenceSegmenter(object):
+    """Splits a text given in chunks into sentences, like `EthiopicSentenceTokenizer.tokenize`
+    splits the whole text, and returns every sentence as soon as it is complete.
+
+    A sentence is complete when the whitespace after its sentence punctuation mark is seen,
+    so a ``::`` split over two chunks is still one mark. Only the incomplete sentence is kept,
+    the memory does not grow with the stream.
+
+    Example::
+
+        segmenter = EthiopicSentenceTokenizer().segmenter()
+        for chunk in stream:
+            for sentence in segmenter.feed(chunk):
+                print(sentence)
+        for sentence in segmenter.flush():
+            print(sentence)
+    """
+    def __init__(self, regexp: Pattern, normalizer: Callable):
+        """
+        Args:
+            regexp (Pattern): matches the separators between sentences in the normalized text.
+            normalizer (Callable): the punctuation normalization, e.g. `normalize_punct`.
+                Its replacements must not contain whitespace.
+        """
+        self._regexp = regexp
+        self._normalizer = normalizer
+        # The text after the last complete sentence, in chunks, and its offset in the stream.
+        # The `_scanned` chunks end with a whitespace and have no separator, the `_pending` ones have no whitespace,
+        # so a chunk is only scanned once and the text is only joined when sentences are split
+        self._scanned: List[str] = []
+        self._pending: List[str] = []
+        self._offset = 0
+
+    def __repr__(self):
+        pending = sum(map(len, self._scanned)) + sum(map(len, self._pending))
+        return f"{self.__class__.__name__}(offset={self._offset}, pending={pending})"
+
+    def feed(self, text: str) -> List[str]:
+        """ Adds a chunk of text, returns the sentences it completes.
+        """
+        return [sentence for sentence, _, _ in self.feed_with_spans(text)]
+
+    def feed_with_spans(self, text: str) -> List[TokenSpan]:
+        """ Adds a chunk of text, returns the (sentence, start, end) of the sentences it completes,
+        the offsets are in the whole stream.
+        """
+        if text is None:
+            raise ValueError("SentenceSegmenter.feed: `text` can't be `None`")
+        cut = _whitespace_end(text)
+        if not cut:
+            if text:
+                self._pending.append(text)
+            return []
+
+        # The normalization of a text ending with a whitespace does not depend on what follows it,
+        # the punctuation marks being normalized have no whitespace
+        region = "".join(self._pending) + text[:cut]
+        self._pending = [text[cut:]] if cut < len(text) else []
+        if not self._regexp.search(self._normalizer(region)):
+            self._scanned.append(region)
+            return []
+        self._scanned.append(region)
+        return self._split("".join(self._scanned), final=False)
+
+    def flush(self) -> List[str]:
+        """ Returns the last sentence, incomplete, and starts a new stream.
+        """
+        return [sentence for sentence, _, _ in self.flush_with_spans()]
+
+    def flush_with_spans(self) -> List[TokenSpan]:
+        """ Returns the (sentence, start, end) of the last sentence, incomplete, and starts a new stream.
+        """
+        sentences = self._split("".join(self._scanned + self._pending), final=True)
+        self._scanned = []
+        self._pending = []
+        self._offset = 0
+        return sentences
+
+    def _split(self, text: str, final: bool) -> List[TokenSpan]:
+        """Splits the scanned `text` into sentences, the text after the last separator is kept
+        unless it is `final`."""
+        normalized, alignment = self._normalizer(text, return_alignment=True)
+        sentences = []
+        start = 0
+        offset = self._offset
+        for separator in self._regexp.finditer(normalized):
+            sentence = normalized[start:separator.start()]
+            if len(sentence.strip()):
+                input_start, input_end = alignment.input_span(start, separator.start())
+                sentences.append((sentence, offset + input_start, offset + input_end))
+            start = separator.end()
+
+        if final:
+            sentence = normalized[start:]
+            if len(sentence.strip()):
+                input_start, input_end = alignment.input_span(start, len(normalized))
+                sentences.append((sentence, offset + input_start, offset + input_end))
+            return sentences
+
+        # A separator is a whitespace, it is never normalized
+        consumed = alignment.input_end(start)
+        self._scanned = [text[consumed:]] if consumed < len(text) else []
+        self._offset += consumed
+        return sentences
+
+    def segment(self, chunks: Iterable[str]) -> Iterator[str]:
+        """ Yields the sentences of a stream of chunks, then flushes.
+        """
+        for chunk in chunks:
+            yield from self.feed(chunk)
+        yield from self.flush()
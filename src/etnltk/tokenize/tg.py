@@ -4,18 +4,27 @@ from __future__ import unicode_literals
 # Standard libraries
 import re
 import unicodedata
-from typing import List
+from functools import partial
+from itertools import chain
+from typing import Iterable, Iterator, List, Tuple
 
 # etnltk libraries
 from .line import LineTokenizer
 from .regexp import RegexpTokenizer
 from .space import whitespace_tokenize
+from .stream import SentenceSegmenter
+from .wordpunct import TokenSpan, WordPunctTokenizer, ethiopic_words
 
 from ..lang.tg.punctuation import TIGRIGNA_SENT_PUNCT, ASSCII_ETHIOPIC_PUNCTS_WITHOUT_TIGRIGNA_ABBREV_PUNCT
 from ..lang.tg.preprocessing import replace_apostrophe
-from ..common.ethiopic import remove_non_ethiopic, remove_ethiopic_punctuation
+from ..common.alignment import Alignment, chain_alignments
+from ..common.cache import get_token_cache, tokenize_chunks
+from ..common.utf8 import as_text, iter_decode
 from ..lang.tg.normalizer import normalize_char, normalize_punct, normalize_shortened, normalize_labialized
 
+# Splits on all punctuation marks, except the Tigrigna abbreviation punctuation marks (`.`, `/` and `’`)
+_wordpunct_tokenizer = WordPunctTokenizer(ASSCII_ETHIOPIC_PUNCTS_WITHOUT_TIGRIGNA_ABBREV_PUNCT)
+
 
 class EthiopicSentenceTokenizer(object):
     def __init__(self, sent_end_chars: List[str] = None):
@@ -35,6 +44,7 @@ class EthiopicSentenceTokenizer(object):
             self.sent_end_chars_regex = TIGRIGNA_SENT_PUNCT  # Default sent_end_chars ("፤", "፥", "።")
 
         self.pattern = rf"(?<=[{self.sent_end_chars_regex}])\s"
+        self._regexp = re.compile(self.pattern, re.UNICODE | re.MULTILINE | re.DOTALL)
 
     def tokenize(self, text: str) -> List[str]:
         """Method for tokenizing sentences with regular expressions.
@@ -46,39 +56,97 @@ class EthiopicSentenceTokenizer(object):
         Returns:
             List[str]: tokenized sentence list
         """
+        return [sentence for sentence, _, _ in self.tokenize_with_spans(text)]
+
+    def tokenize_with_spans(self, text: str) -> List[TokenSpan]:
+        """Tokenize a text into sentences, every sentence comes with its (start, end) offsets in `text`.
+        The sentences are punctuation normalized, the offsets point at the original punctuation marks.
+
+        Args:
+            text (str): text to be tokenized into sentences
+
+        Returns:
+            List[TokenSpan]: list of (sentence, start, end)
+        """
         # punctuation normalization 
         # :: -> ። 
-        punct_norm_text = normalize_punct(text)
-
-        sentences = [
-            sent for sent in RegexpTokenizer(pattern=self.pattern, gaps=True).tokenize(punct_norm_text) if
-            len(sent.strip())
-        ]
+        punct_norm_text, alignment = normalize_punct(text, return_alignment=True)
+
+        sentences = []
+        start = 0
+        for separator in chain(self._regexp.finditer(punct_norm_text), [None]):
+            end = separator.start() if separator else len(punct_norm_text)
+            sentence = punct_norm_text[start:end]
+            if len(sentence.strip()):
+                sentences.append((sentence, *alignment.input_span(start, end)))
+            if separator:
+                start = separator.end()
         return sentences
 
+    def segmenter(self) -> SentenceSegmenter:
+        """Returns a :class:`SentenceSegmenter` splitting a text given in chunks like `tokenize`,
+        e.g. a text read from a socket.
+        """
+        return SentenceSegmenter(self._regexp, normalize_punct)
+
+
+# Used by `sent_tokenize`, its pattern is compiled once
+_sentence_tokenizer = EthiopicSentenceTokenizer()
+
 
 # Sentence tokenizer.
-def sent_tokenize(text: str) -> List[str]:
+def sent_tokenize(text: str, errors: str = "strict") -> List[str]:
     """ Return a sentence-tokenized copy of *text*
     uses an instance of EthiopicSentenceTokenizer.
 
     Args:
-        text (str): text to split into sentences
+        text (str): text to split into sentences, or its UTF-8 bytes
+        errors (str, optional): the policy for invalid UTF-8 when `text` is bytes,
+            "strict", "replace" or "skip". Defaults to "strict".
 
     Returns:
         List[str]: _description_
     """
-    sentences = EthiopicSentenceTokenizer().tokenize(text)
+    text = as_text(text, errors)
+    return [_strip_sentence(sentence) for sentence in _sentence_tokenizer.tokenize(text)]
+
+
+def sent_tokenize_with_spans(text: str, errors: str = "strict") -> List[TokenSpan]:
+    """ Tokenize a text into punctuation normalized sentences, with their (start, end) offsets in `text`.
+    Uses the shared instance of EthiopicSentenceTokenizer.
+
+    Args:
+        text (str): text to split into sentences, or its UTF-8 bytes
+        errors (str, optional): the policy for invalid UTF-8 when `text` is bytes,
+            "strict", "replace" or "skip". Defaults to "strict".
+
+    Returns:
+        List[TokenSpan]: list of (sentence, start, end)
+    """
+    text = as_text(text, errors)
+    return _sentence_tokenizer.tokenize_with_spans(text)
+
 
-    stripped_sentences: List = []
-    for sentence in sentences:
-        # Split sentence into word tokens 
-        word_tokens = word_tokenize(sentence)
-        # Join word tokens into a single sentence 
-        stripped_sentence = " ".join(word_tokens)
-        stripped_sentences.append(stripped_sentence)
+def _strip_sentence(sentence: str) -> str:
+    # Split sentence into word tokens 
+    word_tokens = word_tokenize(sentence)
+    # Join word tokens into a single sentence 
+    return " ".join(word_tokens)
 
-    return stripped_sentences
+
+def sent_tokenize_stream(chunks: Iterable[str], errors: str = "strict") -> Iterator[str]:
+    """ Like `sent_tokenize` over the concatenated `chunks`, but every sentence is yielded
+    as soon as the chunk completing it is read, e.g. for a live feed.
+
+    Args:
+        chunks (Iterable[str]): the text, in chunks of any size, or its UTF-8 bytes in chunks split anywhere
+        errors (str, optional): the policy for invalid UTF-8, "strict", "replace" or "skip". Defaults to "strict".
+
+    Returns:
+        Iterator[str]: the sentences
+    """
+    for sentence in _sentence_tokenizer.segmenter().segment(iter_decode(chunks, errors)):
+        yield _strip_sentence(sentence)
 
 
 def wordpunct_tokenize(text: str) -> List[str]:
@@ -86,45 +154,90 @@ def wordpunct_tokenize(text: str) -> List[str]:
     non-alphabetic characters, using the punctuation
     punctuation = "!\"#$%&'()*+,-:;<=>?@[\]^`{|}~።፤;፦፥፧፨፠፣"
     """
+    return _wordpunct_tokenizer.tokenize(text)
 
-    punctuation = "".join(ASSCII_ETHIOPIC_PUNCTS_WITHOUT_TIGRIGNA_ABBREV_PUNCT)
-    sentence_out = ""
-    for character in text:
-        if character in punctuation:
-            sentence_out += " %s " % character
-        else:
-            sentence_out += character
 
-    return sentence_out.split()
+_NORMALIZERS = (normalize_shortened, normalize_punct, replace_apostrophe, normalize_char)
 
 
-def word_tokenize(text: str, return_word=True) -> List[str]:
-    """_summary_
+def _normalize(text: str, return_alignment: bool = True):
+    """ The normalization applied before word tokenization:
+    short form expansion, punctuation, apostrophe and character normalization.
+    Returns the normalized text, and with `return_alignment` its alignment to `text`.
+    """
+    if not return_alignment:
+        for normalizer in _NORMALIZERS:
+            text = normalizer(text)
+        return text
+    alignments = []
+    for normalizer in _NORMALIZERS:
+        text, alignment = normalizer(text, return_alignment=True)
+        alignments.append(alignment)
+    return text, chain_alignments(alignments)
+
+
+def word_tokenize_with_spans(text: str, return_word=True, errors: str = "strict") -> List[TokenSpan]:
+    """ Tokenize a text into words, in one scan over the normalized text.
+    Every token comes with its (start, end) offsets in `text`,
+    the words of an expanded short form share the offsets of the short form.
 
     Args:
-        text (str): _description_
+        text (str): input text, or its UTF-8 bytes
+        return_word (bool, optional): keep only the ethiopic characters of the words
+            and drop the punctuation marks. Defaults to True.
+        errors (str, optional): the policy for invalid UTF-8 when `text` is bytes,
+            "strict", "replace" or "skip". Defaults to "strict".
 
     Returns:
-        List[str]: Tokenize a text into a sequence of words.
+        List[TokenSpan]: list of (token, start, end)
     """
+    text = as_text(text, errors)
+    cache = get_token_cache()
+    if cache is not None:
+        # Every whitespace separated chunk is normalized and tokenized once
+        return tokenize_chunks(cache, ("tg", return_word), text,
+                               partial(_word_tokenize_with_spans, return_word=return_word))
+    return _word_tokenize_with_spans(text, return_word)
+
 
+def _word_tokenize_with_spans(text: str, return_word=True) -> List[TokenSpan]:
     # Normalization
-    text = normalize_shortened(text)
-    text = normalize_punct(text)
-    text = replace_apostrophe(text)
-    normalized = normalize_char(text)
+    normalized, alignment = _normalize(text)
+    tokens = _normalized_tokens(normalized, return_word)
 
-    # wordpunct tokenize
-    word_tokens = wordpunct_tokenize(normalized)
+    # Offsets in `normalized` to offsets in `text`, in one pass over the sorted tokens
+    if not alignment.is_identity:
+        spans = alignment.input_spans([(start, end) for _, start, end in tokens])
+        tokens = [(token, start, end) for (token, _, _), (start, end) in zip(tokens, spans)]
+    return tokens
+
+
+def _normalized_tokens(normalized: str, return_word=True) -> List[TokenSpan]:
+    # wordpunct tokenize, punctuation marks are dropped from words, they are not even tokenized
+    tokens = _wordpunct_tokenizer.tokenize_with_spans(normalized, words_only=return_word)
 
     if return_word:
         # text cleaning, 
         # remove_non_ethiopic and ethiopic punctuations
-        word_tokens = [
-            remove_non_ethiopic(token) for token in word_tokens if len(remove_non_ethiopic(token).strip())
-        ]
-        word_tokens = [
-            remove_ethiopic_punctuation(token) for token in word_tokens if len(remove_ethiopic_punctuation(token).strip())
-        ]
-
-    return word_tokens
+        tokens = ethiopic_words(tokens)
+    return tokens
+
+
+def word_tokenize(text: str, return_word=True, errors: str = "strict") -> List[str]:
+    """ Tokenize a text into words.
+
+    Args:
+        text (str): input text, or its UTF-8 bytes
+        return_word (bool, optional): keep only the ethiopic characters of the words
+            and drop the punctuation marks. Defaults to True.
+        errors (str, optional): the policy for invalid UTF-8 when `text` is bytes,
+            "strict", "replace" or "skip". Defaults to "strict".
+
+    Returns:
+        List[str]: Tokenize a text into a sequence of words.
+    """
+    text = as_text(text, errors)
+    if get_token_cache() is not None:
+        return [token for token, _, _ in word_tokenize_with_spans(text, return_word)]
+    # The offsets are not needed, the text is normalized without alignments
+    return [token for token, _, _ in _normalized_tokens(_normalize(text, return_alignment=False), return_word)]
@@ -0,0 +1,135 @@
+# coding=utf-8
+#
+# Standard libraries
+import re
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Iterator, List, Tuple
+
+# etnltk libraries
+
+# A token and its (start, end) offsets in the tokenized text
+TokenSpan = Tuple[str, int, int]
+
+# Ethiopic characters that are not punctuation marks, the characters kept in a word
+# by `remove_non_ethiopic` followed by `remove_ethiopic_punctuation`.
+# The space is kept, so tokens joined by spaces can be filtered in one pass.
+_REGEX_NON_ETHIOPIC_WORD_CHARS = re.compile(r"[^\u1200-\u135F\u1369-\u137F ]+")
+
+
+class WordPunctTokenizer(object):
+    """Tokenizes a text into single punctuation marks and the runs of characters between
+    punctuation marks and whitespaces, in one scan over the text.
+
+    The tokens are the same as surrounding every punctuation mark with spaces and splitting on whitespace.
+    """
+    def __init__(self, punctuation: str):
+        """
+        Args:
+            punctuation (str): the punctuation marks, whitespaces in it are ignored.
+        """
+        punct_chars = re.escape("".join(sorted({char for char in punctuation if not char.isspace()})))
+        self._regexp = re.compile(rf"[{punct_chars}]|[^{punct_chars}\s]+")
+        # Only the runs between punctuation marks
+        self._word_regexp = re.compile(rf"[^{punct_chars}\s]+")
+
+    def tokenize(self, text: str) -> List[str]:
+        return self._regexp.findall(text)
+
+    def span_tokenize(self, text: str, words_only: bool = False) -> Iterator[Tuple[int, int]]:
+        """ Yields the (start, end) offsets of the tokens in `text`.
+        With `words_only`, the punctuation marks are skipped.
+        """
+        regexp = self._word_regexp if words_only else self._regexp
+        for match in regexp.finditer(text):
+            yield match.span()
+
+    def tokenize_with_spans(self, text: str, words_only: bool = False) -> List[TokenSpan]:
+        regexp = self._word_regexp if words_only else self._regexp
+        return [(match[0], match.start(), match.end()) for match in regexp.finditer(text)]
+
+
+def expand_tokens(tokens: List[TokenSpan], replacer) -> List[TokenSpan]:
+    """ Replaces the known words inside every token, a token whose replacement has spaces is split.
+    The new tokens keep the offsets of the token they come from.
+
+    Same as ``whitespace_tokenize(replacer.replace(" ".join(tokens)))`` when no key of `replacer` has whitespace.
+    """
+    if not tokens:
+        return tokens
+
+    joined = " ".join([token for token, _, _ in tokens])
+    _, entities = replacer.replace(joined, return_entities=True)
+    if not entities:
+        return tokens
+
+    # Offsets of the tokens in `joined`
+    token_starts = list(accumulate([len(token) + 1 for token, _, _ in tokens], initial=0))
+
+    # (start, end, replacement) of the matches in every token, relative to the token
+    replacements = {}
+    for start, end, _, replacement in entities:
+        index = bisect_right(token_starts, start) - 1
+        token_start = token_starts[index]
+        replacements.setdefault(index, []).append((start - token_start, end - token_start, replacement))
+
+    expanded = []
+    previous_index = 0
+    for index, matches in replacements.items():
+        # The tokens without matches are copied as they are
+        expanded.extend(tokens[previous_index:index])
+        token, start, end = tokens[index]
+        pieces = []
+        previous_end = 0
+        for match_start, match_end, replacement in matches:
+            pieces.append(token[previous_end:match_start])
+            pieces.append(replacement)
+            previous_end = match_end
+        pieces.append(token[previous_end:])
+        expanded.extend((piece, start, end) for piece in "".join(pieces).split())
+        previous_index = index + 1
+    expanded.extend(tokens[previous_index:])
+    return expanded
+
+
+def strip_non_ethiopic(tokens: List[str]) -> List[str]:
+    """ Removes the non ethiopic characters and the ethiopic punctuation marks from every token,
+    in one pass over all tokens. The result is aligned with `tokens`, it has empty strings for tokens
+    without ethiopic letters.
+
+    Same as ``remove_ethiopic_punctuation(remove_non_ethiopic(token))`` for tokens without whitespace.
+    """
+    if not tokens:
+        return []
+    return _REGEX_NON_ETHIOPIC_WORD_CHARS.sub("", " ".join(tokens)).split(" ")
+
+
+def ethiopic_words(tokens: List[TokenSpan]) -> List[TokenSpan]:
+    """ Applies :func:`strip_non_ethiopic` to tokens with offsets, tokens left empty are dropped.
+    """
+    words = strip_non_ethiopic([token for token, _, _ in tokens])
+    return [
+        (word, start, end) for word, (_, start, end) in zip(words, tokens) if word
+    ]
+
+
+def whitespace_words(tokens: List[TokenSpan]) -> List[str]:
+    """ Joins back the tokens that are not separated by whitespace in the tokenized text,
+    the tokens of an expansion (same offsets) are joined with a space and split again.
+
+    Same as ``whitespace_tokenize`` of the text the tokens come from, with the expansions applied.
+    """
+    words = []
+    pieces = []
+    previous_start = previous_end = None
+    for token, start, end in tokens:
+        if start == previous_start and end == previous_end:
+            # Another word of the same expansion
+            pieces.append(" ")
+        elif start != previous_end and pieces:
+            words.extend("".join(pieces).split())
+            pieces = []
+        pieces.append(token)
+        previous_start, previous_end = start, end
+    words.extend("".join(pieces).split())
+    return words